@@ -1,9 +1,48 @@
-from fastapi import APIRouter
-from app.api.endpoints import auth, users, courses, exams, bookings
+from fastapi import APIRouter, Depends
+from app.api.deps import get_bookings_reader, get_current_user_async
+from app.api.endpoints import auth, users, courses, exams, bookings, exports, availability, metrics, sessions, history
+from app.core.conditional import conditional_get, conditional_get_async, count_upcoming
+from app.core.database_async import ASYNC_DB_ENABLED
+from app.core.rate_limit import availability_limiter, bookings_limiter, limit_by_user
+from app.models.booking import Booking
+from app.models.course import Course
+from app.models.exam import Exam
 
 api_router = APIRouter()
+
+# ETag sulle letture di catalogo e prenotazioni (304 se nulla è cambiato).
+# Le prenotazioni applicano le regole di accesso della route prima di
+# qualsiasi ETag o 304
+courses_conditional = [Depends(conditional_get("courses", Course))]
+exams_conditional = [Depends(conditional_get("exams", Exam, extra=count_upcoming(Exam.date)))]
+bookings_conditional = [Depends(conditional_get("bookings", Booking, principal=get_bookings_reader))]
+
+# Token bucket per utente su prenotazioni e cancellazioni e sui controlli dei posti
+bookings_dependencies = bookings_conditional + [Depends(limit_by_user(bookings_limiter, methods=("POST", "DELETE")))]
+availability_dependencies = [Depends(limit_by_user(availability_limiter))]
+
+# Con ASYNC_DB=1 le route asincrone di catalogo e prenotazioni vengono
+# registrate per prime e hanno la precedenza su quelle sincrone
+if ASYNC_DB_ENABLED:
+    from app.api.endpoints.aio import bookings as async_bookings, catalog as async_catalog
+    # Tutto sulla sessione asincrona; l'ETag delle prenotazioni è sulle
+    # singole route, dopo i rispettivi controlli di accesso
+    async_bookings_dependencies = [
+        Depends(limit_by_user(bookings_limiter, methods=("POST", "DELETE"), principal=get_current_user_async))
+    ]
+    async_courses_conditional = [Depends(conditional_get_async("courses", Course))]
+    async_exams_conditional = [Depends(conditional_get_async("exams", Exam, extra=count_upcoming(Exam.date)))]
+    api_router.include_router(async_catalog.courses_router, prefix="/courses", tags=["courses"], dependencies=async_courses_conditional)
+    api_router.include_router(async_catalog.exams_router, prefix="/exams", tags=["exams"], dependencies=async_exams_conditional)
+    api_router.include_router(async_bookings.router, prefix="/bookings", tags=["bookings"], dependencies=async_bookings_dependencies)
+
 api_router.include_router(auth.router, prefix="/auth", tags=["authentication"])
 api_router.include_router(users.router, prefix="/users", tags=["users"])
-api_router.include_router(courses.router, prefix="/courses", tags=["courses"])
-api_router.include_router(exams.router, prefix="/exams", tags=["exams"])
-api_router.include_router(bookings.router, prefix="/bookings", tags=["bookings"])
\ No newline at end of file
+api_router.include_router(courses.router, prefix="/courses", tags=["courses"], dependencies=courses_conditional)
+api_router.include_router(exams.router, prefix="/exams", tags=["exams"], dependencies=exams_conditional)
+api_router.include_router(bookings.router, prefix="/bookings", tags=["bookings"], dependencies=bookings_dependencies)
+api_router.include_router(exports.router, prefix="/exports", tags=["exports"])
+api_router.include_router(availability.router, prefix="/availability", tags=["availability"], dependencies=availability_dependencies)
+api_router.include_router(sessions.router, prefix="/sessions", tags=["sessions"])
+api_router.include_router(history.router, prefix="/history", tags=["history"])
+api_router.include_router(metrics.router, prefix="/metrics", tags=["metrics"])
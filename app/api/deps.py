@@ -1,24 +1,39 @@
-from typing import Generator
-from fastapi import Depends, HTTPException, status
+from typing import Any, Dict, Generator
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import jwt, JWTError
 from pydantic import ValidationError
-from sqlalchemy.orm import Session
+from sqlalchemy import inspect
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, make_transient_to_detached
 
 from app.core.config import settings
+from app.core.metrics import span
 from app.core.database import get_db
+from app.core.database_async import get_async_db
+from app.core.principal_cache import principal_cache
+from app.core.routing import bind_user
 from app.repositories.user import user_repository
+from app.repositories.aio.user import async_user_repository
 from app.models.user import User, UserRole
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login")
 
-def get_current_user(
-    db: Session = Depends(get_db), token: str = Depends(oauth2_scheme)
-) -> User:
+def _snapshot_user(user: User) -> Dict[str, Any]:
+    return {attr.key: getattr(user, attr.key) for attr in inspect(User).column_attrs}
+
+def _cached_user(data: Dict[str, Any]) -> User:
+    # Utente in cache, da riagganciare alla sessione senza eseguire SELECT
+    user = User(**data)
+    make_transient_to_detached(user)
+    return user
+
+def _decode_token(token: str) -> Dict[str, Any]:
     try:
-        payload = jwt.decode(
-            token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
-        )
+        with span("jwt_decode"):
+            payload = jwt.decode(
+                token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
+            )
         user_id: int = int(payload.get("sub"))
         if user_id is None:
             raise HTTPException(
@@ -32,8 +47,9 @@ def get_current_user(
             detail="Credenziali non valide",
             headers={"WWW-Authenticate": "Bearer"},
         )
-    
-    user = user_repository.get(db, id=user_id)
+    return payload
+
+def _check_found(user: User) -> User:
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -42,7 +58,34 @@ def get_current_user(
         )
     return user
 
-def get_current_admin(current_user: User = Depends(get_current_user)) -> User:
+def get_current_user(
+    db: Session = Depends(get_db), token: str = Depends(oauth2_scheme)
+) -> User:
+    cached = principal_cache.get(token)
+    if cached is not None:
+        bind_user(db, cached["id"])
+        return db.merge(_cached_user(cached), load=False)
+
+    payload = _decode_token(token)
+    user = _check_found(user_repository.get(db, id=int(payload["sub"])))
+    principal_cache.set(token, user.id, _snapshot_user(user), expires_at=payload.get("exp"))
+    bind_user(db, user.id)
+    return user
+
+async def get_current_user_async(
+    db: AsyncSession = Depends(get_async_db), token: str = Depends(oauth2_scheme)
+) -> User:
+    # Come get_current_user, sulla sessione asincrona delle route async
+    cached = principal_cache.get(token)
+    if cached is not None:
+        return await db.merge(_cached_user(cached), load=False)
+
+    payload = _decode_token(token)
+    user = _check_found(await async_user_repository.get(db, id=int(payload["sub"])))
+    principal_cache.set(token, user.id, _snapshot_user(user), expires_at=payload.get("exp"))
+    return user
+
+def _check_admin(current_user: User) -> User:
     if current_user.role != UserRole.ADMIN:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
@@ -50,10 +93,39 @@ def get_current_admin(current_user: User = Depends(get_current_user)) -> User:
         )
     return current_user
 
-def get_current_professor(current_user: User = Depends(get_current_user)) -> User:
+def _check_professor(current_user: User) -> User:
     if current_user.role != UserRole.PROFESSOR and current_user.role != UserRole.ADMIN:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Permessi insufficienti",
         )
-    return current_user
\ No newline at end of file
+    return current_user
+
+def get_current_admin(current_user: User = Depends(get_current_user)) -> User:
+    return _check_admin(current_user)
+
+def get_current_professor(current_user: User = Depends(get_current_user)) -> User:
+    return _check_professor(current_user)
+
+async def get_current_professor_async(current_user: User = Depends(get_current_user_async)) -> User:
+    return _check_professor(current_user)
+
+def get_bookings_reader(request: Request, current_user: User = Depends(get_current_user)) -> User:
+    """
+    Regole di lettura delle route di prenotazione, per le dipendenze a
+    livello di router che vengono risolte prima della route (ad es. l'ETag):
+    l'elenco di un esame è riservato ai professori, gli studenti vedono solo
+    le proprie prenotazioni
+    """
+    route = request.scope.get("route")
+    path = getattr(route, "path_format", "")
+    if path.endswith("/exam/{exam_id}"):
+        return _check_professor(current_user)
+    if path.endswith("/student/{student_id}"):
+        student_id = request.path_params.get("student_id")
+        if current_user.role == UserRole.STUDENT and str(current_user.id) != student_id:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Permessi insufficienti",
+            )
+    return current_user
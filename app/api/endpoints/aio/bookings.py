@@ -0,0 +1,111 @@
+from typing import Any, List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.conditional import conditional_get_async
+from app.core.database_async import get_async_db
+from app.core.pagination import set_next_cursor
+from app.core.serialization import RowSerializer
+from app.api.deps import get_current_user_async, get_current_professor_async
+from app.repositories.aio.booking import async_booking_repository
+from app.services.aio.booking_service import async_booking_service
+from app.schemas.booking import Booking, BookingCreate
+from app.models.booking import Booking as BookingModel
+from app.models.user import User as UserModel, UserRole
+
+router = APIRouter()
+
+booking_serializer = RowSerializer(Booking, BookingModel)
+
+def _check_student_access(current_user: UserModel, student_id: int) -> None:
+    # Gli studenti possono operare solo sulle proprie prenotazioni
+    if current_user.role == UserRole.STUDENT and current_user.id != student_id:
+        raise HTTPException(status_code=403, detail="Permessi insufficienti")
+
+async def get_student_bookings_reader(
+    student_id: int, current_user: UserModel = Depends(get_current_user_async)
+) -> UserModel:
+    _check_student_access(current_user, student_id)
+    return current_user
+
+def _conditional(principal) -> list:
+    # ETag calcolato dopo il controllo di accesso della route
+    return [Depends(conditional_get_async("bookings", BookingModel, principal=principal))]
+
+@router.post("/", response_model=Booking)
+async def create_booking(
+    *,
+    db: AsyncSession = Depends(get_async_db),
+    booking_in: BookingCreate,
+    current_user: UserModel = Depends(get_current_user_async),
+) -> Any:
+    """
+    Book an exam.
+    """
+    _check_student_access(current_user, booking_in.student_id)
+    return await async_booking_service.create_booking(db, booking_in=booking_in)
+
+@router.get("/student/{student_id}", response_model=List[Booking], dependencies=_conditional(get_student_bookings_reader))
+async def read_bookings_by_student(
+    student_id: int,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    current_user: UserModel = Depends(get_student_bookings_reader),
+) -> Any:
+    """
+    Retrieve the bookings of a student.
+    """
+    bookings = await async_booking_service.get_bookings_by_student(db, student_id, skip=skip, limit=limit, cursor=cursor)
+    set_next_cursor(response, async_booking_repository.next_cursor(bookings, limit=limit))
+    return bookings
+
+@router.get("/exam/{exam_id}", response_model=List[Booking], dependencies=_conditional(get_current_professor_async))
+async def read_bookings_by_exam(
+    exam_id: int,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    fast: bool = False,
+    current_user: UserModel = Depends(get_current_professor_async),
+) -> Any:
+    """
+    Retrieve the bookings of an exam. Only professors and admins can access this endpoint.
+    With `fast=true` the rows are read as column tuples and serialized directly.
+    """
+    if fast:
+        rows = await async_booking_service.get_booking_rows_by_exam(db, exam_id, columns=booking_serializer.columns, skip=skip, limit=limit, cursor=cursor)
+        set_next_cursor(response, async_booking_repository.next_cursor(rows, limit=limit))
+        return booking_serializer.response(rows, headers=response.headers)
+    bookings = await async_booking_service.get_bookings_by_exam(db, exam_id, skip=skip, limit=limit, cursor=cursor)
+    set_next_cursor(response, async_booking_repository.next_cursor(bookings, limit=limit))
+    return bookings
+
+@router.get("/exam/{exam_id}/count", response_model=int, dependencies=_conditional(get_current_user_async))
+async def count_bookings_by_exam(
+    exam_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserModel = Depends(get_current_user_async),
+) -> Any:
+    """
+    Count the confirmed bookings of an exam.
+    """
+    return await async_booking_service.count_bookings_by_exam(db, exam_id)
+
+@router.delete("/student/{student_id}/exam/{exam_id}", status_code=204)
+async def cancel_booking(
+    student_id: int,
+    exam_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserModel = Depends(get_current_user_async),
+) -> None:
+    """
+    Cancel the booking of a student for an exam.
+    """
+    _check_student_access(current_user, student_id)
+    await async_booking_service.cancel_booking(db, student_id, exam_id)
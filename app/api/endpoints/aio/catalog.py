@@ -0,0 +1,116 @@
+from typing import Any, List, Optional
+
+from fastapi import APIRouter, Depends, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database_async import get_async_db
+from app.core.pagination import set_next_cursor
+from app.core.serialization import RowSerializer
+from app.repositories.aio.course import async_course_repository
+from app.repositories.aio.exam import async_exam_repository
+from app.services.aio.catalog_service import async_catalog_service
+from app.schemas.course import Course
+from app.schemas.exam import Exam
+from app.models.exam import Exam as ExamModel
+
+courses_router = APIRouter()
+exams_router = APIRouter()
+
+exam_serializer = RowSerializer(Exam, ExamModel)
+
+@courses_router.get("/", response_model=List[Course])
+async def read_courses(
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+) -> Any:
+    """
+    Retrieve courses.
+    """
+    courses = await async_catalog_service.get_courses(db, skip=skip, limit=limit, cursor=cursor)
+    set_next_cursor(response, async_course_repository.next_cursor(courses, limit=limit))
+    return courses
+
+@courses_router.get("/{course_id}", response_model=Course)
+async def read_course(course_id: int, db: AsyncSession = Depends(get_async_db)) -> Any:
+    """
+    Get a specific course by id.
+    """
+    return await async_catalog_service.get_course(db, course_id)
+
+@exams_router.get("/", response_model=List[Exam])
+async def read_exams(
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    fast: bool = False,
+) -> Any:
+    """
+    Retrieve exams.
+    With `fast=true` the rows are read as column tuples and serialized directly.
+    """
+    if fast:
+        rows = await async_catalog_service.get_exam_rows(db, columns=exam_serializer.columns, skip=skip, limit=limit, cursor=cursor)
+        set_next_cursor(response, async_exam_repository.next_cursor(rows, limit=limit))
+        return exam_serializer.response(rows, headers=response.headers)
+    exams = await async_catalog_service.get_exams(db, skip=skip, limit=limit, cursor=cursor)
+    set_next_cursor(response, async_exam_repository.next_cursor(exams, limit=limit))
+    return exams
+
+@exams_router.get("/active", response_model=List[Exam])
+async def read_active_exams(
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+) -> Any:
+    """
+    Retrieve active upcoming exams.
+    """
+    exams = await async_catalog_service.get_active_exams(db, skip=skip, limit=limit, cursor=cursor)
+    set_next_cursor(response, async_exam_repository.next_cursor(exams, limit=limit))
+    return exams
+
+@exams_router.get("/course/{course_id}", response_model=List[Exam])
+async def read_exams_by_course(
+    course_id: int,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+) -> Any:
+    """
+    Retrieve the exams of a course.
+    """
+    exams = await async_catalog_service.get_exams_by_course(db, course_id, skip=skip, limit=limit, cursor=cursor)
+    set_next_cursor(response, async_exam_repository.next_cursor(exams, limit=limit))
+    return exams
+
+@exams_router.get("/course/{course_id}/upcoming", response_model=List[Exam])
+async def read_upcoming_exams_by_course(
+    course_id: int,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+) -> Any:
+    """
+    Retrieve the active upcoming exams of a course.
+    """
+    exams = await async_catalog_service.get_upcoming_exams_by_course(db, course_id, skip=skip, limit=limit, cursor=cursor)
+    set_next_cursor(response, async_exam_repository.next_cursor(exams, limit=limit))
+    return exams
+
+@exams_router.get("/{exam_id}", response_model=Exam)
+async def read_exam(exam_id: int, db: AsyncSession = Depends(get_async_db)) -> Any:
+    """
+    Get a specific exam by id.
+    """
+    return await async_catalog_service.get_exam(db, exam_id)
@@ -5,24 +5,29 @@ from fastapi import APIRouter, Depends, HTTPException
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.orm import Session
 
+from app.core.admission import login_gate
 from app.core.config import settings
 from app.core.database import get_db
+from app.core.rate_limit import limit_by_ip, login_limiter
 from app.core.security import create_access_token
 from app.services.user_service import user_service
 from app.schemas.user import User, UserCreate
 
 router = APIRouter()
 
-@router.post("/login")
-def login(
+@router.post("/login", dependencies=[Depends(limit_by_ip(login_limiter))])
+async def login(
     db: Session = Depends(get_db), form_data: OAuth2PasswordRequestForm = Depends()
 ) -> Any:
     """
-    OAuth2 compatible token login, get an access token for future requests
+    OAuth2 compatible token login, get an access token for future requests.
+    Answers 503 with Retry-After when too many logins are already queued,
+    and 429 with Retry-After when a client address logs in too often.
     """
-    user = user_service.authenticate_user(
-        db, email=form_data.username, password=form_data.password
-    )
+    async with login_gate.admit():
+        user = await user_service.authenticate_user_async(
+            db, email=form_data.username, password=form_data.password
+        )
     access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     return {
         "access_token": create_access_token(
@@ -0,0 +1,83 @@
+import os
+from typing import Any, AsyncIterator, List, Optional
+
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from app.core.database import get_db
+from app.core.routing import use_primary
+from app.api.deps import get_current_user
+from app.services.booking_service import availability_updates, booking_service
+from app.schemas.booking import SeatAvailability
+from app.models.user import User as UserModel
+
+router = APIRouter()
+
+# Commento inviato sugli stream inattivi, per proxy e client che chiudono le connessioni mute
+SSE_KEEPALIVE_SECONDS = float(os.getenv("SSE_KEEPALIVE_SECONDS", "15"))
+
+@router.get("/", response_model=List[SeatAvailability])
+def read_availability(
+    db: Session = Depends(get_db),
+    exam_ids: Optional[List[int]] = Query(None),
+    course_id: Optional[int] = None,
+    current_user: UserModel = Depends(get_current_user),
+) -> Any:
+    """
+    Seats left for a set of exams (repeat `exam_ids`) or for every exam of a course.
+    """
+    return booking_service.get_availability(db, exam_ids=exam_ids, course_id=course_id)
+
+def _event(availability: SeatAvailability) -> str:
+    return f"event: availability\ndata: {availability.model_dump_json()}\n\n"
+
+def _read_initial(db: Session, exam_ids: List[int]) -> List[SeatAvailability]:
+    # Dal primario, come gli aggiornamenti: una replica in ritardo potrebbe
+    # perdere una prenotazione che nessuno pubblicherà più
+    with use_primary():
+        return booking_service.get_availability(db, exam_ids=exam_ids)
+
+@router.get("/stream")
+async def stream_availability(
+    exam_ids: List[int] = Query(...),
+    db: Session = Depends(get_db),
+    current_user: UserModel = Depends(get_current_user),
+) -> StreamingResponse:
+    """
+    Server-Sent Events with the seats left for `exam_ids` (repeat the parameter).
+    The first events are the current state, then an `availability` event is sent
+    whenever bookings change the seats of an exam, at most one per exam per interval.
+    """
+    # Iscrizione prima della lettura: le prenotazioni concluse nel frattempo
+    # arrivano come aggiornamenti invece di andare perse
+    subscription = availability_updates.subscribe(exam_ids)
+    try:
+        initial = await run_in_threadpool(_read_initial, db, exam_ids)
+    except Exception:
+        availability_updates.unsubscribe(subscription)
+        raise
+    finally:
+        # Lo stream può restare aperto a lungo: la sessione non serve più
+        db.close()
+    subscription.seed({availability.exam_id: availability for availability in initial})
+
+    async def events() -> AsyncIterator[str]:
+        try:
+            for availability in initial:
+                yield _event(availability)
+            while True:
+                updates = await subscription.next(SSE_KEEPALIVE_SECONDS)
+                if not updates:
+                    yield ": keepalive\n\n"
+                for availability in updates:
+                    yield _event(availability)
+        finally:
+            availability_updates.unsubscribe(subscription)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
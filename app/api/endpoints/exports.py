@@ -0,0 +1,45 @@
+from typing import Any
+
+from fastapi import APIRouter, Depends
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+
+from app.core.database import get_db
+from app.api.deps import get_current_admin, get_current_professor
+from app.services.export_service import export_service, ExportFormat, MEDIA_TYPES
+from app.models.user import User as UserModel
+
+router = APIRouter()
+
+def _streaming_response(rows: Any, export_format: ExportFormat, filename: str) -> StreamingResponse:
+    # La sessione del database resta aperta finché lo streaming non è terminato
+    return StreamingResponse(
+        rows,
+        media_type=MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}.{export_format.value}"'},
+    )
+
+@router.get("/exams/{exam_id}/bookings")
+def export_exam_roster(
+    exam_id: int,
+    format: ExportFormat = ExportFormat.CSV,
+    db: Session = Depends(get_db),
+    current_user: UserModel = Depends(get_current_professor),
+) -> Any:
+    """
+    Stream the roster of an exam as CSV or NDJSON. Only professors and admins can access this endpoint.
+    """
+    rows = export_service.export_exam_roster(db, exam_id=exam_id, export_format=format)
+    return _streaming_response(rows, format, f"exam-{exam_id}-bookings")
+
+@router.get("/bookings")
+def export_bookings(
+    format: ExportFormat = ExportFormat.CSV,
+    db: Session = Depends(get_db),
+    current_user: UserModel = Depends(get_current_admin),
+) -> Any:
+    """
+    Stream every booking as CSV or NDJSON. Only admin can access this endpoint.
+    """
+    rows = export_service.export_bookings(db, export_format=format)
+    return _streaming_response(rows, format, "bookings")
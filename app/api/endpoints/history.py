@@ -0,0 +1,69 @@
+from typing import Any, List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Response
+from sqlalchemy.orm import Session
+
+from app.core.database import get_db
+from app.core.pagination import set_next_cursor
+from app.api.deps import get_current_user, get_current_professor
+from app.repositories.archive import booking_archive_repository, exam_archive_repository
+from app.services.archive_service import archive_service
+from app.schemas.archive import ArchivedBooking, ArchivedExam
+from app.models.user import User as UserModel, UserRole
+
+router = APIRouter()
+
+@router.get("/courses/{course_id}/exams", response_model=List[ArchivedExam])
+def read_archived_exams_by_course(
+    course_id: int,
+    response: Response,
+    db: Session = Depends(get_db),
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    current_user: UserModel = Depends(get_current_user),
+) -> Any:
+    """
+    Retrieve the archived exams of a course, oldest first.
+    """
+    exams = archive_service.get_archived_exams_by_course(db, course_id, skip=skip, limit=limit, cursor=cursor)
+    set_next_cursor(response, exam_archive_repository.next_cursor(exams, limit=limit))
+    return exams
+
+@router.get("/exams/{exam_id}/bookings", response_model=List[ArchivedBooking])
+def read_archived_bookings_by_exam(
+    exam_id: int,
+    response: Response,
+    db: Session = Depends(get_db),
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    current_user: UserModel = Depends(get_current_professor),
+) -> Any:
+    """
+    Retrieve the bookings of an archived exam.
+    Only professors and admins can access this endpoint.
+    """
+    bookings = archive_service.get_archived_bookings_by_exam(db, exam_id, skip=skip, limit=limit, cursor=cursor)
+    set_next_cursor(response, booking_archive_repository.next_cursor(bookings, limit=limit))
+    return bookings
+
+@router.get("/students/{student_id}/bookings", response_model=List[ArchivedBooking])
+def read_archived_bookings_by_student(
+    student_id: int,
+    response: Response,
+    db: Session = Depends(get_db),
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    current_user: UserModel = Depends(get_current_user),
+) -> Any:
+    """
+    Retrieve the archived bookings of a student.
+    Students can only read their own bookings.
+    """
+    if current_user.role == UserRole.STUDENT and current_user.id != student_id:
+        raise HTTPException(status_code=403, detail="Permessi insufficienti")
+    bookings = archive_service.get_archived_bookings_by_student(db, student_id, skip=skip, limit=limit, cursor=cursor)
+    set_next_cursor(response, booking_archive_repository.next_cursor(bookings, limit=limit))
+    return bookings
@@ -0,0 +1,41 @@
+from typing import Dict
+
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from app.core.admission import login_gate
+from app.core.metrics import metrics
+from app.core.principal_cache import principal_cache
+from app.core.rate_limit import rate_limiters
+from app.services.booking_service import availability_updates
+
+router = APIRouter()
+
+PROMETHEUS_MEDIA_TYPE = "text/plain; version=0.0.4"
+
+def _app_gauges() -> Dict[str, float]:
+    cache = principal_cache.stats()
+    gauges = {
+        "principal_cache_size": cache["size"],
+        "principal_cache_hits": cache["hits"],
+        "principal_cache_misses": cache["misses"],
+        "principal_cache_hit_ratio": cache["hit_ratio"],
+        "login_gate_rejected": login_gate.rejected,
+    }
+    gauges["availability_stream_subscriptions"] = availability_updates.subscriptions
+    gauges["availability_updates_published"] = availability_updates.published
+    gauges["availability_updates_delivered"] = availability_updates.delivered
+    for limiter in rate_limiters:
+        limits = limiter.stats()
+        gauges[f"rate_limit_{limiter.name}_keys"] = limits["keys"]
+        gauges[f"rate_limit_{limiter.name}_rejected"] = limits["rejected"]
+    return gauges
+
+metrics.add_collector(_app_gauges)
+
+@router.get("/", response_class=PlainTextResponse)
+def read_metrics() -> PlainTextResponse:
+    """
+    Request latency, query counts and timing spans in Prometheus text format.
+    """
+    return PlainTextResponse(metrics.render(), media_type=PROMETHEUS_MEDIA_TYPE)
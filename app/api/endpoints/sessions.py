@@ -0,0 +1,63 @@
+from typing import Any
+
+from fastapi import APIRouter, Depends, Response, status
+from sqlalchemy.orm import Session
+
+from app.core.database import get_db
+from app.api.deps import get_current_professor
+from app.services.scheduling import exam_scheduler
+from app.services.session_service import session_service
+from app.schemas.session import CalendarValidation, SessionCalendar, SessionResult, SessionUpdate
+from app.models.user import User as UserModel
+
+router = APIRouter()
+
+def _with_status(response: Response, result: SessionResult) -> SessionResult:
+    # Con errori non viene salvato nulla: 400 con gli errori di ogni riga
+    if result.issues:
+        response.status_code = status.HTTP_400_BAD_REQUEST
+    return result
+
+@router.post("/", response_model=SessionResult)
+def create_session(
+    *,
+    db: Session = Depends(get_db),
+    calendar_in: SessionCalendar,
+    response: Response,
+    current_user: UserModel = Depends(get_current_professor),
+) -> Any:
+    """
+    Create every exam of a session in a single transaction, or none of them:
+    when a row is invalid the response is 400 with the issues of each row.
+    Only professors and admins can access this endpoint.
+    """
+    return _with_status(response, session_service.create_session(db, calendar_in))
+
+@router.patch("/", response_model=SessionResult)
+def update_session(
+    *,
+    db: Session = Depends(get_db),
+    session_in: SessionUpdate,
+    response: Response,
+    current_user: UserModel = Depends(get_current_professor),
+) -> Any:
+    """
+    Activate or deactivate and/or shift by `shift_minutes` a set of exams,
+    all or none of them. Issues refer to positions in `exam_ids`.
+    Only professors and admins can access this endpoint.
+    """
+    return _with_status(response, session_service.update_session(db, session_in))
+
+@router.post("/validate", response_model=CalendarValidation)
+def validate_calendar(
+    *,
+    db: Session = Depends(get_db),
+    calendar_in: SessionCalendar,
+    current_user: UserModel = Depends(get_current_professor),
+) -> Any:
+    """
+    Check a proposed exam session for room and professor conflicts, against the
+    scheduled exams and within the calendar itself. Nothing is saved.
+    Only professors and admins can access this endpoint.
+    """
+    return exam_scheduler.validate_calendar(db, calendar_in.exams)
@@ -1,27 +1,49 @@
-from typing import Any, List
+import os
+import tempfile
+from typing import Any, List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 
 from app.core.database import get_db
+from app.core.pagination import set_next_cursor
+from app.core.serialization import RowSerializer
 from app.api.deps import get_current_user, get_current_admin
 from app.services.user_service import user_service
+from app.services.booking_service import booking_service
+from app.services.student_import_service import student_import_service
+from app.repositories.user import user_repository
 from app.schemas.user import User, UserCreate, UserUpdate
+from app.schemas.dashboard import StudentDashboard
+from app.schemas.student_import import StudentImportRun
 from app.models.user import User as UserModel
 
 router = APIRouter()
 
+user_serializer = RowSerializer(User, UserModel)
+
 @router.get("/", response_model=List[User])
 def read_users(
+    response: Response,
     db: Session = Depends(get_db),
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
+    fast: bool = False,
     current_user: UserModel = Depends(get_current_admin),
 ) -> Any:
     """
     Retrieve users. Only admin can access this endpoint.
+    Pass the X-Next-Cursor response header back as `cursor` to get the next page.
+    With `fast=true` the rows are read as column tuples and serialized directly.
     """
-    users = user_service.get_users(db, skip=skip, limit=limit)
+    if fast:
+        rows = user_service.get_user_rows(db, columns=user_serializer.columns, skip=skip, limit=limit, cursor=cursor)
+        set_next_cursor(response, user_repository.next_cursor(rows, limit=limit))
+        return user_serializer.response(rows, headers=response.headers)
+    users = user_service.get_users(db, skip=skip, limit=limit, cursor=cursor)
+    set_next_cursor(response, user_repository.next_cursor(users, limit=limit))
     return users
 
 @router.get("/me", response_model=User)
@@ -33,6 +55,16 @@ def read_user_me(
     """
     return current_user
 
+@router.get("/me/dashboard", response_model=StudentDashboard)
+def read_user_me_dashboard(
+    db: Session = Depends(get_db),
+    current_user: UserModel = Depends(get_current_user),
+) -> Any:
+    """
+    Get the bookings of the current user with their exam, course and professor.
+    """
+    return booking_service.get_student_dashboard(db, student=current_user)
+
 @router.put("/me", response_model=User)
 def update_user_me(
     *,
@@ -46,6 +78,42 @@ def update_user_me(
     user = user_service.update_user(db, user_id=current_user.id, user_in=user_in)
     return user
 
+@router.post("/import", response_model=StudentImportRun, status_code=202)
+async def import_students(
+    request: Request,
+    start_line: int = 2,
+    current_user: UserModel = Depends(get_current_admin),
+) -> Any:
+    """
+    Start a bulk import of students. The request body is a CSV file with the
+    columns email, first_name, last_name, student_id and password.
+    Only admin can access this endpoint.
+    Poll GET /users/import/{job_id} for progress and rejected rows; after a
+    failure, send the file again with `start_line` = `last_line` + 1.
+    """
+    if start_line < 2:
+        raise HTTPException(status_code=400, detail="Le righe dei dati partono dalla 2")
+    # Il corpo va su disco a blocchi, senza tenere il file in memoria
+    fd, path = tempfile.mkstemp(suffix=".csv", prefix="student-import-")
+    try:
+        with os.fdopen(fd, "wb") as target:
+            async for chunk in request.stream():
+                await run_in_threadpool(target.write, chunk)
+    except BaseException:
+        os.unlink(path)
+        raise
+    return student_import_service.start_job(path, start_line=start_line)
+
+@router.get("/import/{job_id}", response_model=StudentImportRun)
+def read_student_import(
+    job_id: str,
+    current_user: UserModel = Depends(get_current_admin),
+) -> Any:
+    """
+    Get the progress of a bulk student import. Only admin can access this endpoint.
+    """
+    return student_import_service.get_job(job_id)
+
 @router.get("/{user_id}", response_model=User)
 def read_user_by_id(
     user_id: int,
@@ -0,0 +1,88 @@
+"""
+Comandi di amministrazione.
+
+    python -m app.cli init-db
+    python -m app.cli archive --retention-days 365 --batch-size 200
+    python -m app.cli import-students matricole.csv --start-line 2
+"""
+import argparse
+from typing import List, Optional
+
+def init_db_command(args: argparse.Namespace) -> None:
+    # Gli import restano nei comandi: la CLI non carica l'app intera
+    from app.core.database import engine
+    from app.core.schema import init_db
+
+    init_db(engine)
+    print(f"Schema creato su {engine.url.render_as_string(hide_password=True)}")
+
+def archive_command(args: argparse.Namespace) -> None:
+    from app.core.database import SessionLocal
+    from app.services.archive_service import archive_service
+
+    def report(run) -> None:
+        print(f"lotto {run.batches}: {run.exams} esami, {run.bookings} prenotazioni archiviati")
+
+    options = {
+        name: value
+        for name, value in (("retention_days", args.retention_days), ("batch_size", args.batch_size))
+        if value is not None
+    }
+    db = SessionLocal()
+    try:
+        run = archive_service.archive_expired(db, max_batches=args.max_batches, on_batch=report, **options)
+    finally:
+        db.close()
+    state = "completata" if run.completed else "interrotta a --max-batches, rilanciare per continuare"
+    print(f"Archiviazione prima del {run.horizon:%Y-%m-%d %H:%M} {state}")
+
+def import_students_command(args: argparse.Namespace) -> None:
+    from app.core.database import SessionLocal
+    from app.schemas.student_import import StudentImportRun
+    from app.services.student_import_service import student_import_service
+
+    def report(run) -> None:
+        print(f"riga {run.last_line}: {run.created} creati, {run.duplicates} duplicati, {run.invalid} non validi")
+
+    run = StudentImportRun(start_line=args.start_line, last_line=args.start_line - 1)
+    options = {"batch_size": args.batch_size} if args.batch_size is not None else {}
+    db = SessionLocal()
+    try:
+        with open(args.file, newline="", encoding="utf-8-sig") as source:
+            student_import_service.import_csv(
+                db, source, start_line=args.start_line, run=run, on_batch=report, **options
+            )
+    except BaseException:
+        print(f"Importazione interrotta: rilanciare con --start-line {run.last_line + 1}")
+        raise
+    finally:
+        db.close()
+        student_import_service.shutdown()
+    for error in run.errors:
+        print(f"riga {error.line}: {error.detail}")
+    print(f"Importazione completata: {run.created} studenti creati")
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m app.cli", description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    init_db = commands.add_parser("init-db", help="crea tabelle e indici mancanti")
+    init_db.set_defaults(func=init_db_command)
+
+    archive = commands.add_parser("archive", help="sposta esami passati e prenotazioni nelle tabelle di archivio")
+    archive.add_argument("--retention-days", type=int, help="default: ARCHIVE_RETENTION_DAYS")
+    archive.add_argument("--batch-size", type=int, help="esami per transazione, default: ARCHIVE_BATCH_SIZE")
+    archive.add_argument("--max-batches", type=int, default=None, help="ferma dopo questi lotti (si riprende rilanciando)")
+    archive.set_defaults(func=archive_command)
+
+    import_students = commands.add_parser("import-students", help="registra gli studenti di un file CSV")
+    import_students.add_argument("file", help="CSV con colonne email, first_name, last_name, student_id, password")
+    import_students.add_argument("--start-line", type=int, default=2, help="prima riga da importare (1 è l'intestazione)")
+    import_students.add_argument("--batch-size", type=int, help="righe per transazione, default: STUDENT_IMPORT_BATCH_SIZE")
+    import_students.set_defaults(func=import_students_command)
+
+    args = parser.parse_args(argv)
+    args.func(args)
+
+if __name__ == "__main__":
+    main()
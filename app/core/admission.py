@@ -0,0 +1,45 @@
+import asyncio
+import os
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+from fastapi import HTTPException, status
+from app.core.hashing import PASSWORD_HASH_WORKERS
+
+# Login contemporanei ammessi e login in attesa prima di rispondere 503
+LOGIN_MAX_CONCURRENCY = int(os.getenv("LOGIN_MAX_CONCURRENCY", str(max(PASSWORD_HASH_WORKERS, 1) * 2)))
+LOGIN_MAX_QUEUE = int(os.getenv("LOGIN_MAX_QUEUE", "64"))
+LOGIN_RETRY_AFTER_SECONDS = int(os.getenv("LOGIN_RETRY_AFTER_SECONDS", "2"))
+
+class AdmissionGate:
+    def __init__(self, max_concurrency: int, max_queue: int, retry_after: int):
+        """
+        Limita le operazioni contemporanee con una coda limitata: oltre la coda
+        le richieste vengono rifiutate subito con 503 e Retry-After
+        """
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.retry_after = retry_after
+        self.rejected = 0
+        self._waiting = 0
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+
+    @asynccontextmanager
+    async def admit(self) -> AsyncIterator[None]:
+        if self._semaphore.locked() and self._waiting >= self.max_queue:
+            self.rejected += 1
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Troppe richieste di accesso, riprovare più tardi",
+                headers={"Retry-After": str(self.retry_after)},
+            )
+        self._waiting += 1
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self._waiting -= 1
+        try:
+            yield
+        finally:
+            self._semaphore.release()
+
+login_gate = AdmissionGate(LOGIN_MAX_CONCURRENCY, LOGIN_MAX_QUEUE, LOGIN_RETRY_AFTER_SECONDS)
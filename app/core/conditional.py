@@ -0,0 +1,152 @@
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple, Type
+from fastapi import Depends, HTTPException, Request, Response, status
+from sqlalchemy import Select, case, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.database import get_db
+from app.core.database_async import get_async_db
+from app.core.routing import reads_from_replica
+from app.models.base import Base
+
+def version_statement(model: Type[Base], criteria: List[Any], extra: List[Any]) -> Select:
+    """
+    Versione di una collezione: max(updated_at) e numero di righe (che cambia
+    anche con le cancellazioni), più eventuali aggregati aggiuntivi
+    """
+    stmt = select(func.max(model.updated_at), func.count(model.id), *extra)
+    if criteria:
+        stmt = stmt.where(*criteria)
+    return stmt
+
+def make_etag(name: str, version: Tuple) -> str:
+    digest = hashlib.sha1(repr((name,) + version).encode()).hexdigest()[:20]
+    return f'W/"{digest}"'
+
+def _etag_matches(header: str, etag: str) -> bool:
+    if header.strip() == "*":
+        return True
+    return etag in (tag.strip() for tag in header.split(","))
+
+def count_upcoming(date_column: Any) -> Callable[[], List[Any]]:
+    # Per le collezioni filtrate su date >= now: cambia quando un esame passa
+    return lambda: [func.sum(case((date_column >= datetime.now(), 1), else_=0))]
+
+class _Conditional:
+    def __init__(self, name: str, model: Type[Base], extra: Optional[Callable[[], List[Any]]]):
+        """
+        Parte comune delle dipendenze sincrona e asincrona: criteri dai
+        parametri di percorso, intestazioni e risposta 304
+        """
+        self.name = name
+        self.model = model
+        self.extra = extra
+        self.columns = {column.key: column for column in model.__table__.columns}
+
+    def criteria(self, request: Request) -> Optional[List[Any]]:
+        # None se la richiesta non va gestita qui
+        if request.method not in ("GET", "HEAD"):
+            return None
+        criteria = []
+        for key, value in request.path_params.items():
+            if key not in self.columns:
+                continue
+            try:
+                value = self.columns[key].type.python_type(value)
+            except (ValueError, TypeError, NotImplementedError):
+                # Parametro non valido: la route risponderà 422
+                return None
+            criteria.append(getattr(self.model, key) == value)
+        return criteria
+
+    def statement(self, criteria: List[Any]) -> Select:
+        return version_statement(self.model, criteria, self.extra() if self.extra else [])
+
+    def respond(self, request: Request, response: Response, version: Tuple) -> None:
+        etag = make_etag(f"{self.name}:{request.url.path}?{request.url.query}", version)
+        headers: Dict[str, str] = {
+            "ETag": etag,
+            "Cache-Control": "private, no-cache",
+            "Vary": "Authorization",
+        }
+        last_modified = version[0]
+        if isinstance(last_modified, datetime):
+            if last_modified.tzinfo is None:
+                last_modified = last_modified.replace(tzinfo=timezone.utc)
+            headers["Last-Modified"] = format_datetime(last_modified.astimezone(timezone.utc), usegmt=True)
+
+        # Solo l'ETag decide il 304: If-Modified-Since non vede le cancellazioni
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match and _etag_matches(if_none_match, etag):
+            raise HTTPException(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+        response.headers.update(headers)
+
+@reads_from_replica
+def _read_version(db: Session, statement: Select) -> Tuple:
+    # Stesso instradamento dei metodi di servizio che leggono le collezioni:
+    # con una replica in ritardo l'ETag non è mai più nuovo del corpo
+    return tuple(db.execute(statement).one())
+
+async def _no_principal() -> None:
+    # Collezioni pubbliche: nessuna autenticazione richiesta
+    return None
+
+def conditional_get(
+    name: str,
+    model: Type[Base],
+    extra: Optional[Callable[[], List[Any]]] = None,
+    principal: Callable[..., Any] = _no_principal,
+) -> Callable[..., None]:
+    """
+    Dipendenza per i router di lettura: calcola l'ETag della collezione con
+    una sola query aggregata e risponde 304 Not Modified se il client ha già
+    la versione corrente, senza caricare né serializzare righe.
+
+    I parametri di percorso che corrispondono a colonne del modello (ad es.
+    exam_id sulle prenotazioni) restringono la versione a quelle righe.
+    `extra` aggiunge aggregati per le collezioni che cambiano col tempo.
+    Per le collezioni protette `principal` è la dipendenza di autenticazione
+    (o di autorizzazione) delle route: viene risolta prima, quindi un client
+    senza accesso riceve 401/403 e mai ETag o 304.
+    """
+    conditional = _Conditional(name, model, extra)
+
+    def dependency(
+        request: Request,
+        response: Response,
+        db: Session = Depends(get_db),
+        current_user: Any = Depends(principal),
+    ) -> None:
+        criteria = conditional.criteria(request)
+        if criteria is None:
+            return
+        version = _read_version(db, conditional.statement(criteria))
+        conditional.respond(request, response, version)
+
+    return dependency
+
+def conditional_get_async(
+    name: str,
+    model: Type[Base],
+    extra: Optional[Callable[[], List[Any]]] = None,
+    principal: Callable[..., Any] = _no_principal,
+) -> Callable[..., Any]:
+    # Come conditional_get, con la query sulla sessione asincrona
+    conditional = _Conditional(name, model, extra)
+
+    async def dependency(
+        request: Request,
+        response: Response,
+        db: AsyncSession = Depends(get_async_db),
+        current_user: Any = Depends(principal),
+    ) -> None:
+        criteria = conditional.criteria(request)
+        if criteria is None:
+            return
+        version = tuple((await db.execute(conditional.statement(criteria))).one())
+        conditional.respond(request, response, version)
+
+    return dependency
@@ -0,0 +1,39 @@
+import os
+from functools import lru_cache
+from typing import AsyncGenerator
+from sqlalchemy.engine import URL
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+
+from app.core.database import engine
+from app.core.metrics import instrument_engine
+
+# Endpoint di prenotazione e catalogo sul percorso asincrono
+ASYNC_DB_ENABLED = os.getenv("ASYNC_DB", "0") == "1"
+
+# Driver asincrono corrispondente a quello dell'engine sincrono
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+    "mysql": "mysql+aiomysql",
+}
+
+def async_url(url: URL) -> URL:
+    backend = url.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise RuntimeError(f"Nessun driver asincrono configurato per {backend}")
+    return url.set(drivername=ASYNC_DRIVERS[backend])
+
+@lru_cache()
+def get_async_engine() -> AsyncEngine:
+    # Creato alla prima richiesta: il driver asincrono serve solo se usato
+    async_engine = create_async_engine(async_url(engine.url))
+    instrument_engine(async_engine.sync_engine)
+    return async_engine
+
+@lru_cache()
+def get_async_sessionmaker() -> async_sessionmaker:
+    return async_sessionmaker(get_async_engine(), expire_on_commit=False)
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    async with get_async_sessionmaker()() as db:
+        yield db
@@ -0,0 +1,77 @@
+import asyncio
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import List, Optional, Sequence
+from app.core.metrics import span
+from app.core.security import get_password_hash, verify_password
+
+# Processi dedicati a bcrypt; 0 esegue hash e verifica nel thread chiamante
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", str(os.cpu_count() or 1)))
+
+class PasswordHasher:
+    def __init__(self, workers: int = PASSWORD_HASH_WORKERS):
+        """
+        Esegue hash e verifica bcrypt in un pool di processi, così il lavoro
+        CPU non occupa i worker che servono le richieste
+        """
+        self.workers = workers
+        self._pool: Optional[Executor] = None
+        self._lock = threading.Lock()
+
+    def _executor(self) -> Optional[Executor]:
+        if self.workers <= 0:
+            return None
+        if self._pool is None:
+            with self._lock:
+                if self._pool is None:
+                    self._pool = ProcessPoolExecutor(
+                        max_workers=self.workers,
+                        mp_context=multiprocessing.get_context("spawn"),
+                    )
+        return self._pool
+
+    def hash(self, password: str) -> str:
+        pool = self._executor()
+        if pool is None:
+            return get_password_hash(password)
+        return pool.submit(get_password_hash, password).result()
+
+    def hash_many(self, passwords: Sequence[str]) -> List[str]:
+        """
+        Hash di più password distribuiti su tutti i processi del pool, a
+        blocchi per ridurre i passaggi tra processi. Stesso ordine dell'input.
+        """
+        pool = self._executor()
+        if pool is None:
+            return [get_password_hash(password) for password in passwords]
+        chunksize = max(1, len(passwords) // (self.workers * 4))
+        return list(pool.map(get_password_hash, passwords, chunksize=chunksize))
+
+    def verify(self, plain_password: str, hashed_password: str) -> bool:
+        pool = self._executor()
+        with span("verify_password"):
+            if pool is None:
+                return verify_password(plain_password, hashed_password)
+            return pool.submit(verify_password, plain_password, hashed_password).result()
+
+    async def hash_async(self, password: str) -> str:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor(), get_password_hash, password)
+
+    async def verify_async(self, plain_password: str, hashed_password: str) -> bool:
+        loop = asyncio.get_running_loop()
+        # Lo span include l'attesa di un processo libero nel pool
+        with span("verify_password"):
+            return await loop.run_in_executor(
+                self._executor(), verify_password, plain_password, hashed_password
+            )
+
+    def shutdown(self) -> None:
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown()
+                self._pool = None
+
+password_hasher = PasswordHasher()
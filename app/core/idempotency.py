@@ -0,0 +1,205 @@
+import asyncio
+import hashlib
+import json
+import os
+import re
+import time
+from collections import OrderedDict
+from typing import Iterable, List, Optional, Pattern, Tuple
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+IDEMPOTENCY_HEADER = "idempotency-key"
+REPLAYED_HEADER = b"idempotent-replayed"
+
+IDEMPOTENCY_TTL_SECONDS = float(os.getenv("IDEMPOTENCY_TTL_SECONDS", "3600"))
+IDEMPOTENCY_MAX_KEYS = int(os.getenv("IDEMPOTENCY_MAX_KEYS", "50000"))
+# Attesa massima di una richiesta con la stessa chiave ancora in corso
+IDEMPOTENCY_WAIT_SECONDS = float(os.getenv("IDEMPOTENCY_WAIT_SECONDS", "10"))
+MAX_KEY_LENGTH = 255
+
+# Header della risposta originale che vengono restituiti anche nei replay
+_REPLAYED_HEADERS = {b"content-type", b"content-length", b"location", b"etag", b"retry-after"}
+# Esiti temporanei (conflitto, limite di richieste, servizio non disponibile):
+# come per i 5xx la chiave viene liberata e un nuovo tentativo viene eseguito
+_RETRYABLE_STATUSES = {409, 429, 503}
+
+class _Entry:
+    def __init__(self, fingerprint: str, expires_at: float):
+        self.fingerprint = fingerprint
+        self.expires_at = expires_at
+        self.done = asyncio.Event()
+        self.status: Optional[int] = None
+        self.headers: List[Tuple[bytes, bytes]] = []
+        self.body = b""
+
+class IdempotencyStore:
+    def __init__(self, max_keys: int = IDEMPOTENCY_MAX_KEYS, ttl: float = IDEMPOTENCY_TTL_SECONDS):
+        """
+        Risposte già inviate per chiave di idempotenza, con scadenza e numero
+        massimo di chiavi (le più vecchie vengono scartate). Locale al processo
+        e usata solo dal loop degli eventi, quindi senza lock.
+        """
+        self.max_keys = max_keys
+        self.ttl = ttl
+        self.replays = 0
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+
+    def get(self, key: str) -> Optional[_Entry]:
+        entry = self._entries.get(key)
+        if entry is not None and entry.expires_at <= time.time():
+            del self._entries[key]
+            return None
+        return entry
+
+    def reserve(self, key: str, fingerprint: str) -> _Entry:
+        entry = _Entry(fingerprint, time.time() + self.ttl)
+        self._entries[key] = entry
+        while len(self._entries) > self.max_keys:
+            self._entries.popitem(last=False)
+        return entry
+
+    def complete(self, key: str, entry: _Entry, status: int, headers: List[Tuple[bytes, bytes]], body: bytes) -> None:
+        entry.status = status
+        entry.headers = [(name, value) for name, value in headers if name.lower() in _REPLAYED_HEADERS]
+        entry.body = body
+        entry.done.set()
+
+    def release(self, key: str, entry: _Entry) -> None:
+        # Nessuna risposta da conservare (5xx o esito temporaneo): un nuovo tentativo viene eseguito
+        if self._entries.get(key) is entry:
+            del self._entries[key]
+        entry.done.set()
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+idempotency_store = IdempotencyStore()
+
+class IdempotencyMiddleware:
+    def __init__(
+        self,
+        app: ASGIApp,
+        routes: Iterable[Tuple[str, str]],
+        store: IdempotencyStore = idempotency_store,
+        wait_seconds: float = IDEMPOTENCY_WAIT_SECONDS,
+    ):
+        """
+        Supporto all'header Idempotency-Key per le route indicate (metodo e
+        regex del percorso). La prima richiesta con una chiave viene eseguita
+        e la sua risposta conservata; le ripetizioni ricevono la stessa
+        risposta senza toccare il database, e quelle che arrivano mentre la
+        prima è in corso la attendono invece di eseguirla in parallelo.
+        La chiave vale per chiamante (header Authorization), metodo e percorso;
+        riusarla con un corpo diverso restituisce 422.
+        """
+        self.app = app
+        self.routes: List[Tuple[str, Pattern]] = [(method, re.compile(pattern)) for method, pattern in routes]
+        self.store = store
+        self.wait_seconds = wait_seconds
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not self._matches(scope):
+            await self.app(scope, receive, send)
+            return
+        headers = dict(scope["headers"])
+        idempotency_key = headers.get(IDEMPOTENCY_HEADER.encode())
+        if idempotency_key is None:
+            await self.app(scope, receive, send)
+            return
+        if not idempotency_key or len(idempotency_key) > MAX_KEY_LENGTH:
+            await _send_error(send, 400, "Idempotency-Key non valida")
+            return
+
+        body = await _read_body(receive)
+        fingerprint = hashlib.sha256(body).hexdigest()
+        caller = hashlib.sha256(headers.get(b"authorization", b"")).hexdigest()
+        key = f"{caller}:{scope['method']}:{scope['path']}:{idempotency_key.decode('latin-1')}"
+
+        entry = self.store.get(key)
+        while entry is not None and not entry.done.is_set():
+            try:
+                await asyncio.wait_for(entry.done.wait(), self.wait_seconds)
+            except asyncio.TimeoutError:
+                await _send_error(send, 409, "Una richiesta con la stessa Idempotency-Key è ancora in corso")
+                return
+            # Se la prima richiesta è fallita la chiave è stata liberata
+            entry = self.store.get(key)
+
+        if entry is not None:
+            if entry.fingerprint != fingerprint:
+                await _send_error(send, 422, "Idempotency-Key già usata con una richiesta diversa")
+                return
+            self.store.replays += 1
+            await _send_stored(send, entry)
+            return
+
+        entry = self.store.reserve(key, fingerprint)
+        status = 500
+        response_headers: List[Tuple[bytes, bytes]] = []
+        chunks: List[bytes] = []
+
+        async def capture(message: Message) -> None:
+            nonlocal status, response_headers
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                response_headers = list(message.get("headers", []))
+            elif message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, _replay_body(body), capture)
+        finally:
+            if status < 500 and status not in _RETRYABLE_STATUSES:
+                self.store.complete(key, entry, status, response_headers, b"".join(chunks))
+            else:
+                self.store.release(key, entry)
+
+    def _matches(self, scope: Scope) -> bool:
+        return any(
+            scope["method"] == method and pattern.match(scope["path"])
+            for method, pattern in self.routes
+        )
+
+async def _read_body(receive: Receive) -> bytes:
+    chunks = []
+    while True:
+        message = await receive()
+        if message["type"] != "http.request":
+            break
+        chunks.append(message.get("body", b""))
+        if not message.get("more_body", False):
+            break
+    return b"".join(chunks)
+
+def _replay_body(body: bytes) -> Receive:
+    sent = False
+
+    async def receive() -> Message:
+        nonlocal sent
+        if not sent:
+            sent = True
+            return {"type": "http.request", "body": body, "more_body": False}
+        # Corpo già consumato: resta in attesa come farebbe il server
+        await asyncio.Event().wait()
+        return {"type": "http.disconnect"}
+
+    return receive
+
+async def _send_stored(send: Send, entry: _Entry) -> None:
+    await send({
+        "type": "http.response.start",
+        "status": entry.status,
+        "headers": entry.headers + [(REPLAYED_HEADER, b"true")],
+    })
+    await send({"type": "http.response.body", "body": entry.body})
+
+async def _send_error(send: Send, status: int, detail: str) -> None:
+    body = json.dumps({"detail": detail}, ensure_ascii=False).encode("utf-8")
+    await send({
+        "type": "http.response.start",
+        "status": status,
+        "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())],
+    })
+    await send({"type": "http.response.body", "body": body})
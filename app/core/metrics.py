@@ -0,0 +1,176 @@
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+from fastapi import Request, Response
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# Aggiunge alle risposte l'header Server-Timing con i tempi della richiesta
+SERVER_TIMING_ENABLED = os.getenv("METRICS_SERVER_TIMING", "0") == "1"
+
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+Labels = Tuple[Tuple[str, str], ...]
+
+class Histogram:
+    def __init__(self, name: str, help: str, buckets: Sequence[float] = LATENCY_BUCKETS):
+        """
+        Istogramma cumulativo in stile Prometheus, una serie per combinazione di etichette
+        """
+        self.name = name
+        self.help = help
+        self.buckets = tuple(buckets)
+        self._series: Dict[Labels, List[float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = tuple(sorted(labels.items()))
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            # Conteggi per bucket, poi somma e numero di osservazioni
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [0] * (len(self.buckets) + 2)
+            if index < len(self.buckets):
+                series[index] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            series = {key: list(values) for key, values in self._series.items()}
+        for key, values in sorted(series.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets, values):
+                cumulative += count
+                lines.append(f"{self.name}_bucket{_labels(key + (('le', _number(bound)),))} {cumulative}")
+            lines.append(f"{self.name}_bucket{_labels(key + (('le', '+Inf'),))} {values[-1]}")
+            lines.append(f"{self.name}_sum{_labels(key)} {values[-2]}")
+            lines.append(f"{self.name}_count{_labels(key)} {values[-1]}")
+        return lines
+
+def _number(value: float) -> str:
+    return repr(float(value))
+
+def _labels(labels: Labels) -> str:
+    if not labels:
+        return ""
+    escaped = (
+        key + '="' + value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") + '"'
+        for key, value in labels
+    )
+    return "{" + ",".join(escaped) + "}"
+
+class RequestStats:
+    """
+    Tempi accumulati durante una richiesta: query e span nominati
+    """
+    def __init__(self):
+        self.queries = 0
+        self.db_time = 0.0
+        self.spans: Dict[str, float] = {}
+
+_request_stats: ContextVar[Optional[RequestStats]] = ContextVar("request_stats", default=None)
+
+class MetricsRegistry:
+    def __init__(self):
+        """
+        Metriche del processo esposte su /api/metrics. Le sorgenti esterne
+        (cache, code) si registrano come collector che restituiscono gauge.
+        """
+        self.request_duration = Histogram(
+            "http_request_duration_seconds", "Durata delle richieste HTTP per route"
+        )
+        self.request_queries = Histogram(
+            "http_request_db_queries", "Query SQL eseguite per richiesta", QUERY_COUNT_BUCKETS
+        )
+        self.query_duration = Histogram(
+            "db_query_duration_seconds", "Durata delle singole query SQL"
+        )
+        self.span_duration = Histogram(
+            "span_duration_seconds", "Durata delle operazioni instrumentate (bcrypt, JWT, ...)"
+        )
+        self._collectors: List[Callable[[], Dict[str, float]]] = []
+
+    def add_collector(self, collector: Callable[[], Dict[str, float]]) -> None:
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for histogram in (self.request_duration, self.request_queries, self.query_duration, self.span_duration):
+            lines.extend(histogram.render())
+        for collector in self._collectors:
+            for name, value in collector().items():
+                lines.append(f"# TYPE {name} gauge")
+                lines.append(f"{name} {_number(value)}")
+        return "\n".join(lines) + "\n"
+
+metrics = MetricsRegistry()
+
+@contextmanager
+def span(name: str) -> Iterator[None]:
+    """
+    Misura un blocco di codice e lo attribuisce alla richiesta corrente
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        metrics.span_duration.observe(elapsed, span=name)
+        stats = _request_stats.get()
+        if stats is not None:
+            stats.spans[name] = stats.spans.get(name, 0.0) + elapsed
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    # Una connessione esegue un solo statement alla volta
+    conn.info["query_start"] = time.perf_counter()
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info.pop("query_start", time.perf_counter())
+    metrics.query_duration.observe(elapsed)
+    stats = _request_stats.get()
+    if stats is not None:
+        stats.queries += 1
+        stats.db_time += elapsed
+
+def instrument_engine(engine: Engine) -> None:
+    # Per un AsyncEngine passare engine.sync_engine
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+def _server_timing(stats: RequestStats, total: float) -> str:
+    entries = [f'db;dur={stats.db_time * 1000:.2f};desc="{stats.queries} queries"']
+    entries.extend(f"{name};dur={elapsed * 1000:.2f}" for name, elapsed in stats.spans.items())
+    entries.append(f"total;dur={total * 1000:.2f}")
+    return ", ".join(entries)
+
+async def metrics_middleware(request: Request, call_next: Callable) -> Response:
+    """
+    Latenza e numero di query per route. La route è il modello del percorso
+    (/api/bookings/exam/{exam_id}), così le serie non crescono con gli id.
+    """
+    stats = RequestStats()
+    token = _request_stats.set(stats)
+    start = time.perf_counter()
+    try:
+        response = await call_next(request)
+    finally:
+        _request_stats.reset(token)
+    elapsed = time.perf_counter() - start
+
+    route = request.scope.get("route")
+    path = getattr(route, "path", "unmatched")
+    labels = {"method": request.method, "route": path, "status": str(response.status_code)}
+    metrics.request_duration.observe(elapsed, **labels)
+    metrics.request_queries.observe(stats.queries, method=request.method, route=path)
+    if SERVER_TIMING_ENABLED:
+        response.headers["Server-Timing"] = _server_timing(stats, elapsed)
+    return response
@@ -0,0 +1,64 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any, List, Optional, TypeVar
+from fastapi import HTTPException, Response
+from sqlalchemy import Select, and_, or_
+from sqlalchemy.orm import Query
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+QueryType = TypeVar("QueryType", Query, Select)
+
+def encode_cursor(*values: Any) -> str:
+    payload = json.dumps(
+        [value.isoformat() if isinstance(value, datetime) else value for value in values],
+        separators=(",", ":"),
+    )
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+def decode_cursor(cursor: str) -> List[Any]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, TypeError):
+        values = None
+    if not isinstance(values, list) or not values:
+        raise HTTPException(status_code=400, detail="Cursore di paginazione non valido")
+    return values
+
+def keyset(query: QueryType, *, id_column, sort_column=None, cursor: Optional[str] = None) -> QueryType:
+    """
+    Ordina la query per (sort_column, id) e, se c'è un cursore, riparte
+    dalla riga successiva all'ultima restituita
+    """
+    if sort_column is None:
+        query = query.order_by(id_column)
+    else:
+        query = query.order_by(sort_column, id_column)
+    if cursor is None:
+        return query
+
+    values = decode_cursor(cursor)
+    try:
+        if sort_column is None:
+            (last_id,) = values
+            return query.filter(id_column > int(last_id))
+        last_sort, last_id = values
+        if isinstance(sort_column.type.python_type, type) and issubclass(
+            sort_column.type.python_type, datetime
+        ):
+            last_sort = datetime.fromisoformat(last_sort)
+        last_id = int(last_id)
+    except (ValueError, TypeError, NotImplementedError):
+        raise HTTPException(status_code=400, detail="Cursore di paginazione non valido")
+    return query.filter(
+        or_(
+            sort_column > last_sort,
+            and_(sort_column == last_sort, id_column > last_id),
+        )
+    )
+
+def set_next_cursor(response: Response, next_cursor: Optional[str]) -> None:
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
\ No newline at end of file
@@ -0,0 +1,128 @@
+import asyncio
+import logging
+import os
+import threading
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional, Set
+
+from starlette.concurrency import run_in_threadpool
+
+# Intervallo minimo tra due notifiche dello stesso argomento
+PUBSUB_COALESCE_SECONDS = float(os.getenv("PUBSUB_COALESCE_SECONDS", "1"))
+
+logger = logging.getLogger(__name__)
+
+Loader = Callable[[List[Hashable]], Dict[Hashable, Any]]
+
+class Subscription:
+    """
+    Iscrizione a un insieme di argomenti. Tiene solo l'ultimo valore non
+    ancora letto per argomento: un client lento non accumula code.
+    """
+    __slots__ = ("topics", "_pending", "_latest", "_ready")
+
+    def __init__(self, topics: Iterable[Hashable]):
+        self.topics = frozenset(topics)
+        self._pending: Dict[Hashable, Any] = {}
+        # Ultimo valore inviato o in attesa per argomento
+        self._latest: Dict[Hashable, Any] = {}
+        self._ready = asyncio.Event()
+
+    def push(self, topic: Hashable, value: Any) -> bool:
+        if topic in self._latest and self._latest[topic] == value:
+            return False
+        self._latest[topic] = value
+        self._pending[topic] = value
+        self._ready.set()
+        return True
+
+    def seed(self, values: Dict[Hashable, Any]) -> None:
+        """
+        Valori già inviati al client, da non ripetere finché non cambiano.
+        Le notifiche arrivate nel frattempo restano in attesa se diverse.
+        """
+        for topic, value in values.items():
+            if topic in self._pending and self._pending[topic] == value:
+                del self._pending[topic]
+            self._latest.setdefault(topic, value)
+        if not self._pending:
+            self._ready.clear()
+
+    async def next(self, timeout: float) -> List[Any]:
+        """
+        Valori arrivati dall'ultima chiamata, oppure lista vuota dopo `timeout` secondi
+        """
+        try:
+            await asyncio.wait_for(self._ready.wait(), timeout)
+        except asyncio.TimeoutError:
+            return []
+        self._ready.clear()
+        values = list(self._pending.values())
+        self._pending.clear()
+        return values
+
+class CoalescingPubSub:
+    def __init__(self, loader: Loader, interval: float = PUBSUB_COALESCE_SECONDS):
+        """
+        Pub/sub nel processo. `publish` segna un argomento come modificato e
+        può essere chiamato da qualsiasi thread; ogni `interval` secondi gli
+        argomenti modificati che hanno iscritti vengono letti tutti insieme
+        con `loader` (in un thread) e i valori cambiati inviati agli iscritti.
+        Una raffica di pubblicazioni produce quindi una sola lettura e una sola
+        notifica per intervallo. Gli iscritti vanno gestiti dal loop degli eventi
+        e vanno registrati prima di leggere lo stato iniziale, così nessuna
+        pubblicazione successiva alla lettura va persa.
+        """
+        self.loader = loader
+        self.interval = interval
+        self.subscriptions = 0
+        self.published = 0
+        self.delivered = 0
+        self._subscribers: Dict[Hashable, Set[Subscription]] = {}
+        self._dirty: Set[Hashable] = set()
+        self._lock = threading.Lock()
+        self._task: Optional[asyncio.Task] = None
+
+    def publish(self, topic: Hashable) -> None:
+        with self._lock:
+            self._dirty.add(topic)
+            self.published += 1
+
+    def subscribe(self, topics: Iterable[Hashable]) -> Subscription:
+        subscription = Subscription(topics)
+        self.subscriptions += 1
+        for topic in subscription.topics:
+            self._subscribers.setdefault(topic, set()).add(subscription)
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        self.subscriptions -= 1
+        for topic in subscription.topics:
+            subscribers = self._subscribers.get(topic)
+            if subscribers is None:
+                continue
+            subscribers.discard(subscription)
+            if not subscribers:
+                del self._subscribers[topic]
+
+    async def _run(self) -> None:
+        # Termina quando non ci sono più iscritti; subscribe la riavvia
+        while self._subscribers:
+            await asyncio.sleep(self.interval)
+            with self._lock:
+                dirty, self._dirty = self._dirty, set()
+            topics = [topic for topic in dirty if topic in self._subscribers]
+            if not topics:
+                continue
+            try:
+                values = await run_in_threadpool(self.loader, topics)
+            except Exception:
+                logger.exception("Lettura degli aggiornamenti fallita")
+                with self._lock:
+                    self._dirty.update(topics)
+                continue
+            for topic, value in values.items():
+                for subscription in self._subscribers.get(topic, ()):
+                    if subscription.push(topic, value):
+                        self.delivered += 1
@@ -0,0 +1,114 @@
+import math
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Collection, Dict, List, Optional, Tuple
+from fastapi import Depends, HTTPException, Request, status
+
+from app.api.deps import get_current_user
+from app.models.user import User
+
+# Limiti nel formato "richieste/secondi": il bucket contiene al massimo
+# `richieste` token e si ricarica completamente in `secondi`
+RATE_LIMIT_ENABLED = os.getenv("RATE_LIMIT_ENABLED", "1") == "1"
+BOOKINGS_RATE_LIMIT = os.getenv("BOOKINGS_RATE_LIMIT", "30/60")
+AVAILABILITY_RATE_LIMIT = os.getenv("AVAILABILITY_RATE_LIMIT", "60/60")
+# Per indirizzo IP: più utenti possono uscire dallo stesso NAT del campus
+LOGIN_RATE_LIMIT = os.getenv("LOGIN_RATE_LIMIT", "60/60")
+RATE_LIMIT_MAX_KEYS = int(os.getenv("RATE_LIMIT_MAX_KEYS", "100000"))
+
+def parse_rate(value: str) -> Tuple[int, float]:
+    requests, seconds = value.split("/")
+    return int(requests), float(seconds)
+
+class TokenBucketLimiter:
+    def __init__(self, name: str, rate: str, max_keys: int = RATE_LIMIT_MAX_KEYS):
+        """
+        Token bucket per chiave (utente o IP), locale al processo. Per ogni
+        chiave attiva tiene solo token rimasti e istante dell'ultimo
+        aggiornamento; le chiavi ferme da più del tempo di ricarica completa
+        equivalgono a un bucket nuovo e vengono scartate.
+        """
+        self.name = name
+        self.capacity, self.period = parse_rate(rate)
+        self.refill_per_second = self.capacity / self.period
+        self.max_keys = max_keys
+        self.enabled = RATE_LIMIT_ENABLED
+        self.rejected = 0
+        self._buckets: "OrderedDict[object, List[float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def acquire(self, key: object) -> float:
+        """
+        Consuma un token per `key`. Restituisce 0 se la richiesta è ammessa,
+        altrimenti i secondi da attendere prima del prossimo token.
+        """
+        now = time.monotonic()
+        with self._lock:
+            self._evict_idle(now)
+            bucket = self._buckets.pop(key, None)
+            if bucket is None:
+                bucket = [float(self.capacity), now]
+            else:
+                bucket[0] = min(self.capacity, bucket[0] + (now - bucket[1]) * self.refill_per_second)
+                bucket[1] = now
+            # In fondo le chiavi usate più di recente
+            self._buckets[key] = bucket
+            while len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+            if bucket[0] >= 1:
+                bucket[0] -= 1
+                return 0.0
+            self.rejected += 1
+            return (1 - bucket[0]) / self.refill_per_second
+
+    def _evict_idle(self, now: float) -> None:
+        while self._buckets:
+            key, (_, updated_at) = next(iter(self._buckets.items()))
+            if now - updated_at < self.period:
+                return
+            del self._buckets[key]
+
+    def check(self, key: object) -> None:
+        if not self.enabled:
+            return
+        wait = self.acquire(key)
+        if wait:
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Troppe richieste, riprovare più tardi",
+                headers={"Retry-After": str(math.ceil(wait))},
+            )
+
+    def stats(self) -> Dict[str, int]:
+        return {"keys": len(self._buckets), "rejected": self.rejected}
+
+bookings_limiter = TokenBucketLimiter("bookings", BOOKINGS_RATE_LIMIT)
+availability_limiter = TokenBucketLimiter("availability", AVAILABILITY_RATE_LIMIT)
+login_limiter = TokenBucketLimiter("login", LOGIN_RATE_LIMIT)
+
+rate_limiters = (bookings_limiter, availability_limiter, login_limiter)
+
+def limit_by_user(
+    limiter: TokenBucketLimiter,
+    methods: Optional[Collection[str]] = None,
+    principal: Callable[..., Any] = get_current_user,
+):
+    """
+    Dipendenza che applica `limiter` all'utente autenticato, solo ai metodi
+    indicati se `methods` è dato. `principal` va scelto uguale a quello delle
+    route (get_current_user_async per i router asincroni): FastAPI lo risolve
+    una sola volta per richiesta.
+    """
+    async def dependency(request: Request, current_user: User = Depends(principal)) -> None:
+        if methods is None or request.method in methods:
+            limiter.check(current_user.id)
+
+    return dependency
+
+def limit_by_ip(limiter: TokenBucketLimiter):
+    async def dependency(request: Request) -> None:
+        limiter.check(request.client.host if request.client else None)
+
+    return dependency
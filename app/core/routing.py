@@ -0,0 +1,142 @@
+import os
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import lru_cache, wraps
+from typing import Callable, Dict, Generator, Iterator, Optional, TypeVar
+from sqlalchemy import create_engine, event, make_url
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.core.database import engine
+from app.core.metrics import instrument_engine
+
+# Replica in sola lettura per le letture pesanti; senza, tutto va sul primario
+DATABASE_REPLICA_URL = os.getenv("DATABASE_REPLICA_URL")
+# Dopo una scrittura le letture dello stesso utente restano sul primario per
+# questo intervallo, che deve coprire il ritardo di replica
+READ_YOUR_WRITES_SECONDS = float(os.getenv("READ_YOUR_WRITES_SECONDS", "5"))
+
+F = TypeVar("F", bound=Callable)
+
+_replica_reads: ContextVar[bool] = ContextVar("replica_reads", default=False)
+# Impostata da use_primary: prevale anche sui metodi marcati chiamati dentro
+_primary_reads: ContextVar[bool] = ContextVar("primary_reads", default=False)
+
+class RecentWriters:
+    def __init__(self, window: float = READ_YOUR_WRITES_SECONDS):
+        """
+        Utenti che hanno scritto negli ultimi `window` secondi. Locale al
+        processo: con più worker va usata una finestra per worker o un
+        instradamento dei client sempre sullo stesso worker.
+        """
+        self.window = window
+        self._deadlines: Dict[int, float] = {}
+        self._lock = threading.Lock()
+
+    def add(self, user_id: int) -> None:
+        now = time.monotonic()
+        with self._lock:
+            if len(self._deadlines) > 10000:
+                self._deadlines = {uid: deadline for uid, deadline in self._deadlines.items() if deadline > now}
+            self._deadlines[user_id] = now + self.window
+
+    def __contains__(self, user_id: int) -> bool:
+        deadline = self._deadlines.get(user_id)
+        return deadline is not None and deadline > time.monotonic()
+
+recent_writers = RecentWriters()
+
+class RoutingSession(Session):
+    """
+    Sessione che manda sulla replica le SELECT eseguite dentro
+    `reads_from_replica`, finché nella sessione non c'è stata una scrittura
+    e l'utente della richiesta non ha scritto di recente. Tutto il resto
+    (flush, INSERT/UPDATE/DELETE, letture fuori dai metodi marcati) usa il primario.
+    """
+    def __init__(self, *args, replica: Optional[Engine] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.replica = replica
+
+    def get_bind(self, mapper=None, *, clause=None, **kwargs):
+        if self._flushing or (clause is not None and getattr(clause, "is_dml", False)):
+            self.info["wrote"] = True
+        elif (
+            self.replica is not None
+            and _replica_reads.get()
+            and not _primary_reads.get()
+            and not self.info.get("wrote")
+            and not self.info.get("sticky")
+        ):
+            return self.replica
+        return super().get_bind(mapper, clause=clause, **kwargs)
+
+@event.listens_for(RoutingSession, "after_commit")
+def _remember_writer(session: Session) -> None:
+    user_id = session.info.get("user_id")
+    if session.info.get("wrote") and user_id is not None:
+        recent_writers.add(user_id)
+
+def bind_user(db: Session, user_id: int) -> None:
+    """
+    Associa alla sessione l'utente della richiesta: se ha scritto da poco
+    legge dal primario, e se scrive ora le sue prossime richieste pure
+    """
+    db.info["user_id"] = user_id
+    if user_id in recent_writers:
+        db.info["sticky"] = True
+
+def mark_written(db: Session) -> None:
+    # Scrittura eseguita fuori da questa sessione (es. writer a gruppi)
+    db.info["wrote"] = True
+    user_id = db.info.get("user_id")
+    if user_id is not None:
+        recent_writers.add(user_id)
+
+def reads_from_replica(method: F) -> F:
+    """
+    Marca un metodo di servizio in sola lettura: le sue SELECT possono
+    andare sulla replica (le letture lazy successive restano sul primario)
+    """
+    @wraps(method)
+    def wrapper(*args, **kwargs):
+        token = _replica_reads.set(True)
+        try:
+            return method(*args, **kwargs)
+        finally:
+            _replica_reads.reset(token)
+
+    return wrapper  # type: ignore[return-value]
+
+@contextmanager
+def use_primary() -> Iterator[None]:
+    # Per le cache condivise, che non devono mai essere riempite da una replica
+    # in ritardo, e per le letture che chiamano metodi marcati ma vanno sul primario
+    token = _primary_reads.set(True)
+    try:
+        yield
+    finally:
+        _primary_reads.reset(token)
+
+@lru_cache()
+def get_replica_engine() -> Engine:
+    url = make_url(DATABASE_REPLICA_URL)
+    connect_args = {"check_same_thread": False} if url.get_backend_name() == "sqlite" else {}
+    replica = create_engine(url, connect_args=connect_args, pool_pre_ping=True)
+    instrument_engine(replica)
+    return replica
+
+@lru_cache()
+def get_routing_sessionmaker() -> sessionmaker:
+    return sessionmaker(
+        class_=RoutingSession, bind=engine, replica=get_replica_engine(), autocommit=False, autoflush=False
+    )
+
+def get_routing_db() -> Generator[Session, None, None]:
+    # Sostituisce get_db quando DATABASE_REPLICA_URL è configurato
+    db = get_routing_sessionmaker()()
+    try:
+        yield db
+    finally:
+        db.close()
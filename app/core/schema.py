@@ -0,0 +1,19 @@
+import os
+from sqlalchemy.engine import Engine
+
+# create_all crea solo le tabelle dei modelli importati: app.models.indexes
+# importa utenti, corsi, esami e prenotazioni, gli altri modelli sono qui
+import app.models.archive
+import app.models.exam_seat
+from app.models.base import Base
+from app.models.indexes import create_indexes
+
+# Crea lo schema all'avvio dell'app; con 0 va creato con `python -m app.cli init-db`
+DB_INIT_ON_STARTUP = os.getenv("DB_INIT_ON_STARTUP", "1") == "1"
+
+def init_db(engine: Engine) -> None:
+    """
+    Crea le tabelle mancanti e gli indici mancanti sulle tabelle esistenti
+    """
+    Base.metadata.create_all(bind=engine)
+    create_indexes(engine)
@@ -1,10 +1,17 @@
 from datetime import datetime, timedelta
-from typing import Any, Union
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, Union
 from jose import jwt
-from passlib.context import CryptContext
 from app.core.config import settings
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+if TYPE_CHECKING:
+    from passlib.context import CryptContext
+
+@lru_cache()
+def get_pwd_context() -> "CryptContext":
+    # passlib e il backend bcrypt vengono caricati al primo hash o verifica
+    from passlib.context import CryptContext
+    return CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 def create_access_token(
     subject: Union[str, Any], expires_delta: timedelta = None
@@ -20,7 +27,7 @@ def create_access_token(
     return encoded_jwt
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+    return get_pwd_context().verify(plain_password, hashed_password)
 
 def get_password_hash(password: str) -> str:
-    return pwd_context.hash(password)
\ No newline at end of file
+    return get_pwd_context().hash(password)
\ No newline at end of file
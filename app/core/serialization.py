@@ -0,0 +1,69 @@
+import enum
+import json
+from datetime import date, time
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Sequence, Type, Union, get_args, get_origin
+from fastapi import Response
+from pydantic import BaseModel
+
+from app.models.base import Base
+
+JSON_MEDIA_TYPE = "application/json"
+
+def _encoder_for(annotation: Any) -> Optional[str]:
+    # Solo date ed enum cambiano rappresentazione, il resto passa com'è
+    if get_origin(annotation) is Union:
+        args = [arg for arg in get_args(annotation) if arg is not type(None)]
+        annotation = args[0] if len(args) == 1 else None
+    if isinstance(annotation, type):
+        if issubclass(annotation, (date, time)):
+            return "{value}.isoformat()"
+        if issubclass(annotation, enum.Enum):
+            return "{value}.value"
+    return None
+
+class RowSerializer:
+    def __init__(self, schema: Type[BaseModel], model: Type[Base]):
+        """
+        Serializzatore JSON per le righe lette come tuple di colonne: genera una
+        sola volta la funzione che costruisce il dizionario di ogni riga, così
+        le liste non passano né dagli oggetti ORM né dalla validazione Pydantic.
+        L'output è lo stesso dello schema `schema` serializzato da FastAPI.
+        """
+        self.schema = schema
+        self.fields = list(schema.model_fields)
+        self.columns = [getattr(model, field) for field in self.fields]
+        self._to_dicts = self._compile()
+
+    def _compile(self) -> Callable[[Iterable[Sequence[Any]]], List[Dict[str, Any]]]:
+        items = []
+        for index, (name, field) in enumerate(self.schema.model_fields.items()):
+            value = f"row[{index}]"
+            encoder = _encoder_for(field.annotation)
+            if encoder is not None:
+                value = f"(None if {value} is None else {encoder.format(value=value)})"
+            items.append(f"{name!r}: {value}")
+        source = f"def to_dicts(rows):\n    return [{{{', '.join(items)}}} for row in rows]\n"
+        namespace: Dict[str, Any] = {}
+        exec(compile(source, f"<serializer {self.schema.__name__}>", "exec"), namespace)
+        return namespace["to_dicts"]
+
+    def to_dicts(self, rows: Iterable[Sequence[Any]]) -> List[Dict[str, Any]]:
+        return self._to_dicts(rows)
+
+    def render(self, rows: Iterable[Sequence[Any]]) -> bytes:
+        # Stesse opzioni di JSONResponse
+        return json.dumps(
+            self._to_dicts(rows),
+            ensure_ascii=False,
+            allow_nan=False,
+            indent=None,
+            separators=(",", ":"),
+        ).encode("utf-8")
+
+    def response(self, rows: Iterable[Sequence[Any]], headers: Optional[Mapping[str, str]] = None) -> Response:
+        """
+        Risposta JSON già serializzata. Restituendo direttamente una Response,
+        FastAPI non copia gli header impostati sulla response iniettata
+        (cursore, ETag): vanno passati in `headers`.
+        """
+        return Response(content=self.render(rows), media_type=JSON_MEDIA_TYPE, headers=dict(headers or {}))
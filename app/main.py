@@ -3,11 +3,14 @@ from fastapi.middleware.cors import CORSMiddleware
 
 from app.api.api import api_router
 from app.core.config import settings
-from app.models.base import Base
-from app.core.database import engine
-
-# Crea le tabelle del database
-Base.metadata.create_all(bind=engine)
+from app.core.database import engine, get_db
+from app.core.schema import DB_INIT_ON_STARTUP, init_db
+from app.core.hashing import password_hasher
+from app.core.idempotency import IdempotencyMiddleware
+from app.core.metrics import instrument_engine, metrics_middleware
+from app.core.routing import DATABASE_REPLICA_URL, get_routing_db
+from app.services.booking_writer import booking_writer, GROUP_COMMIT_ENABLED
+from app.services.student_import_service import student_import_service
 
 app = FastAPI(
     title=settings.APP_NAME,
@@ -16,6 +19,18 @@ app = FastAPI(
     redoc_url="/api/redoc",
 )
 
+# Idempotency-Key su prenotazione e cancellazione: i tentativi ripetuti dei
+# client ricevono la risposta già inviata senza lavoro sul database.
+# Registrato prima di CORS, che resta più esterno: anche i replay e gli
+# errori del middleware ricevono gli header CORS
+app.add_middleware(
+    IdempotencyMiddleware,
+    routes=[
+        ("POST", r"^/api/bookings/?$"),
+        ("DELETE", r"^/api/bookings/.+"),
+    ],
+)
+
 # Configurazione CORS
 app.add_middleware(
     CORSMiddleware,
@@ -25,8 +40,29 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Latenza per route e query per richiesta, esposte su /api/metrics
+app.middleware("http")(metrics_middleware)
+instrument_engine(engine)
+
+# Con una replica configurata le letture dei servizi marcati vanno sulla replica
+if DATABASE_REPLICA_URL:
+    app.dependency_overrides[get_db] = get_routing_db
+
 app.include_router(api_router, prefix="/api")
 
+# Lo schema viene creato all'avvio del server e non all'import del modulo;
+# con DB_INIT_ON_STARTUP=0 lo gestisce `python -m app.cli init-db`
+if DB_INIT_ON_STARTUP:
+    app.add_event_handler("startup", lambda: init_db(engine))
+
+app.add_event_handler("shutdown", password_hasher.shutdown)
+app.add_event_handler("shutdown", student_import_service.shutdown)
+
+# Scrittura a gruppi delle prenotazioni, se abilitata
+if GROUP_COMMIT_ENABLED:
+    app.add_event_handler("startup", booking_writer.start)
+    app.add_event_handler("shutdown", booking_writer.stop)
+
 @app.get("/")
 def root():
     return {"message": "Benvenuto nel sistema di prenotazione esami universitari"}
\ No newline at end of file
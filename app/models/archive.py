@@ -0,0 +1,32 @@
+from sqlalchemy import Column, DateTime, Index, Table
+from app.models.base import Base
+from app.models.booking import Booking
+from app.models.exam import Exam
+
+def _archive_columns(table: Table):
+    # Stesse colonne della tabella corrente con gli id originali, senza chiavi
+    # esterne: l'esame archiviato non esiste più in exams
+    columns = [
+        Column(column.name, column.type, primary_key=column.primary_key, nullable=column.nullable, autoincrement=False)
+        for column in table.columns
+    ]
+    columns.append(Column("archived_at", DateTime, nullable=False))
+    return columns
+
+class ExamArchive(Base):
+    """
+    Esami passati spostati da exams dall'archiviazione
+    """
+    __table__ = Table("exams_archive", Base.metadata, *_archive_columns(Exam.__table__))
+
+class BookingArchive(Base):
+    """
+    Prenotazioni degli esami archiviati
+    """
+    __table__ = Table("bookings_archive", Base.metadata, *_archive_columns(Booking.__table__))
+
+ARCHIVE_INDEXES = (
+    Index("ix_exams_archive_course_id_date", ExamArchive.course_id, ExamArchive.date),
+    Index("ix_bookings_archive_exam_id", BookingArchive.exam_id),
+    Index("ix_bookings_archive_student_id", BookingArchive.student_id),
+)
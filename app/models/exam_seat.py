@@ -0,0 +1,12 @@
+from sqlalchemy import Column, Integer, ForeignKey
+from app.models.base import Base
+
+class ExamSeat(Base):
+    """
+    Contatore dei posti confermati per esame, mantenuto dalle prenotazioni
+    """
+    __tablename__ = "exam_seats"
+
+    id = Column(Integer, primary_key=True, index=True)
+    exam_id = Column(Integer, ForeignKey("exams.id", ondelete="CASCADE"), unique=True, nullable=False)
+    booked = Column(Integer, nullable=False, default=0)
\ No newline at end of file
@@ -0,0 +1,34 @@
+from typing import Union
+from sqlalchemy import Index
+from sqlalchemy.engine import Connection, Engine
+
+from app.models.booking import Booking
+from app.models.course import Course
+from app.models.exam import Exam
+from app.models.user import User
+
+# Indici delle query più frequenti dei repository. Importare questo modulo
+# li registra sulla metadata, quindi create_all li crea con le tabelle.
+HOT_INDEXES = (
+    # Conteggi e liste delle prenotazioni di un esame
+    Index("ix_bookings_exam_id_confirmed", Booking.exam_id, Booking.confirmed),
+    # Una sola prenotazione per studente ed esame; serve anche le liste per studente
+    Index("uq_bookings_student_id_exam_id", Booking.student_id, Booking.exam_id, unique=True),
+    # Esami di un corso, anche solo quelli attivi e futuri, ordinati per data
+    Index("ix_exams_course_id_is_active_date", Exam.course_id, Exam.is_active, Exam.date),
+    # Catalogo degli esami attivi e futuri
+    Index("ix_exams_is_active_date", Exam.is_active, Exam.date),
+    Index("ix_courses_professor_id", Course.professor_id),
+    Index("uq_courses_code", Course.code, unique=True),
+    Index("uq_users_email", User.email, unique=True),
+    Index("uq_users_student_id", User.student_id, unique=True),
+    Index("ix_users_role", User.role),
+)
+
+def create_indexes(bind: Union[Engine, Connection]) -> None:
+    """
+    Crea gli indici mancanti sulle tabelle già esistenti, che create_all
+    salta. Un indice univoco fallisce se la tabella contiene duplicati.
+    """
+    for index in HOT_INDEXES:
+        index.create(bind, checkfirst=True)
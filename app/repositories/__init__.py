@@ -1,4 +1,6 @@
 from app.repositories.user import user_repository
 from app.repositories.course import course_repository
 from app.repositories.exam import exam_repository
-from app.repositories.booking import booking_repository
\ No newline at end of file
+from app.repositories.booking import booking_repository
+from app.repositories.seat import seat_repository
+from app.repositories.archive import exam_archive_repository, booking_archive_repository
\ No newline at end of file
@@ -0,0 +1,4 @@
+from app.repositories.aio.user import async_user_repository
+from app.repositories.aio.course import async_course_repository
+from app.repositories.aio.exam import async_exam_repository
+from app.repositories.aio.booking import async_booking_repository
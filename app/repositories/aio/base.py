@@ -0,0 +1,87 @@
+from typing import Any, Dict, Generic, List, Optional, Sequence, Type, Union
+from sqlalchemy import Row, Select, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.pagination import encode_cursor, keyset
+from app.repositories.base import CreateSchemaType, ModelType, UpdateSchemaType
+
+class AsyncBaseRepository(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
+    # Colonna di ordinamento per la paginazione a cursore (oltre all'id)
+    sort_attr: Optional[str] = None
+
+    def __init__(self, model: Type[ModelType]):
+        """
+        Repository base asincrono, con gli stessi metodi CRUD di BaseRepository
+        """
+        self.model = model
+
+    async def get(self, db: AsyncSession, id: Any) -> Optional[ModelType]:
+        return await db.get(self.model, id)
+
+    async def get_multi(
+        self, db: AsyncSession, *, skip: int = 0, limit: int = 100, cursor: Optional[str] = None
+    ) -> List[ModelType]:
+        return await self._all(db, self._paginate(select(self.model), skip=skip, limit=limit, cursor=cursor))
+
+    async def get_multi_rows(
+        self, db: AsyncSession, *, columns: Sequence[Any], skip: int = 0, limit: int = 100, cursor: Optional[str] = None
+    ) -> List[Row]:
+        return await self._rows(db, self._paginate(select(*columns), skip=skip, limit=limit, cursor=cursor))
+
+    async def create(self, db: AsyncSession, *, obj_in: CreateSchemaType) -> ModelType:
+        obj_in_data = obj_in.dict()
+        db_obj = self.model(**obj_in_data)
+        db.add(db_obj)
+        await db.commit()
+        await db.refresh(db_obj)
+        return db_obj
+
+    async def update(
+        self,
+        db: AsyncSession,
+        *,
+        db_obj: ModelType,
+        obj_in: Union[UpdateSchemaType, Dict[str, Any]]
+    ) -> ModelType:
+        obj_data = db_obj.__dict__
+        if isinstance(obj_in, dict):
+            update_data = obj_in
+        else:
+            update_data = obj_in.dict(exclude_unset=True)
+        for field in obj_data:
+            if field in update_data:
+                setattr(db_obj, field, update_data[field])
+        db.add(db_obj)
+        await db.commit()
+        await db.refresh(db_obj)
+        return db_obj
+
+    async def remove(self, db: AsyncSession, *, id: int) -> ModelType:
+        obj = await db.get(self.model, id)
+        await db.delete(obj)
+        await db.commit()
+        return obj
+
+    def next_cursor(self, items: List[ModelType], *, limit: int) -> Optional[str]:
+        if not items or len(items) < limit:
+            return None
+        last = items[-1]
+        if self.sort_attr is None:
+            return encode_cursor(last.id)
+        return encode_cursor(getattr(last, self.sort_attr), last.id)
+
+    async def _all(self, db: AsyncSession, stmt: Select) -> List[ModelType]:
+        result = await db.execute(stmt)
+        return list(result.scalars().all())
+
+    async def _rows(self, db: AsyncSession, stmt: Select) -> List[Row]:
+        result = await db.execute(stmt)
+        return list(result.all())
+
+    def _paginate(
+        self, stmt: Select, *, skip: int, limit: int, cursor: Optional[str]
+    ) -> Select:
+        sort_column = getattr(self.model, self.sort_attr) if self.sort_attr else None
+        stmt = keyset(stmt, id_column=self.model.id, sort_column=sort_column, cursor=cursor)
+        if cursor is None:
+            stmt = stmt.offset(skip)
+        return stmt.limit(limit)
@@ -0,0 +1,79 @@
+from typing import Any, List, Optional, Sequence
+from sqlalchemy import Row, func, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.booking import Booking
+from app.models.exam_seat import ExamSeat
+from app.schemas.booking import BookingCreate, BookingUpdate
+from app.repositories.aio.base import AsyncBaseRepository
+from app.repositories.seat import claim_statement, release_statement, seed_statement
+
+class AsyncBookingRepository(AsyncBaseRepository[Booking, BookingCreate, BookingUpdate]):
+    async def get_by_student_and_exam(self, db: AsyncSession, *, student_id: int, exam_id: int) -> Optional[Booking]:
+        result = await db.execute(
+            select(Booking).where(Booking.student_id == student_id, Booking.exam_id == exam_id).limit(1)
+        )
+        return result.scalars().first()
+
+    async def get_by_student_id(self, db: AsyncSession, *, student_id: int, skip: int = 0, limit: int = 100, cursor: Optional[str] = None) -> List[Booking]:
+        return await self._all(db, self._paginate(
+            select(Booking).where(Booking.student_id == student_id),
+            skip=skip, limit=limit, cursor=cursor,
+        ))
+
+    async def get_by_exam_id(self, db: AsyncSession, *, exam_id: int, skip: int = 0, limit: int = 100, cursor: Optional[str] = None) -> List[Booking]:
+        return await self._all(db, self._paginate(
+            select(Booking).where(Booking.exam_id == exam_id),
+            skip=skip, limit=limit, cursor=cursor,
+        ))
+
+    async def get_rows_by_exam_id(self, db: AsyncSession, *, exam_id: int, columns: Sequence[Any], skip: int = 0, limit: int = 100, cursor: Optional[str] = None) -> List[Row]:
+        return await self._rows(db, self._paginate(
+            select(*columns).where(Booking.exam_id == exam_id),
+            skip=skip, limit=limit, cursor=cursor,
+        ))
+
+    async def count_by_exam_id(self, db: AsyncSession, *, exam_id: int) -> int:
+        result = await db.execute(
+            select(func.count(Booking.id)).where(Booking.exam_id == exam_id, Booking.confirmed == True)
+        )
+        return result.scalar_one()
+
+    async def reserve(self, db: AsyncSession, *, obj_in: BookingCreate) -> Optional[Booking]:
+        # Stessa update condizionale di BookingRepository.reserve
+        seats = 1 if obj_in.confirmed else 0
+        claim = claim_statement(obj_in.exam_id, seats, obj_in.student_id)
+        claimed = (await db.execute(claim)).rowcount == 1
+        if not claimed and await self._ensure_counter(db, exam_id=obj_in.exam_id):
+            claimed = (await db.execute(claim)).rowcount == 1
+        if not claimed:
+            await db.rollback()
+            return None
+        db_obj = Booking(**obj_in.dict())
+        db.add(db_obj)
+        try:
+            await db.commit()
+        except IntegrityError:
+            # Studente già iscritto (vincolo univoco): il rollback libera il posto
+            await db.rollback()
+            return None
+        await db.refresh(db_obj)
+        return db_obj
+
+    async def _ensure_counter(self, db: AsyncSession, *, exam_id: int) -> bool:
+        # Come SeatRepository.ensure: True se il contatore è stato appena creato,
+        # qui o da una richiesta concorrente
+        if await db.scalar(select(ExamSeat.id).where(ExamSeat.exam_id == exam_id)):
+            return False
+        try:
+            async with db.begin_nested():
+                result = await db.execute(seed_statement(exam_id))
+        except IntegrityError:
+            # Un'altra richiesta ha creato il contatore nel frattempo
+            return True
+        return result.rowcount > 0
+
+    async def release(self, db: AsyncSession, *, exam_id: int, seats: int = 1) -> None:
+        await db.execute(release_statement(exam_id, seats))
+
+async_booking_repository = AsyncBookingRepository(Booking)
@@ -0,0 +1,19 @@
+from typing import List, Optional
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.course import Course
+from app.schemas.course import CourseCreate, CourseUpdate
+from app.repositories.aio.base import AsyncBaseRepository
+
+class AsyncCourseRepository(AsyncBaseRepository[Course, CourseCreate, CourseUpdate]):
+    async def get_by_code(self, db: AsyncSession, *, code: str) -> Optional[Course]:
+        result = await db.execute(select(Course).where(Course.code == code).limit(1))
+        return result.scalars().first()
+
+    async def get_by_professor_id(self, db: AsyncSession, *, professor_id: int, skip: int = 0, limit: int = 100, cursor: Optional[str] = None) -> List[Course]:
+        return await self._all(db, self._paginate(
+            select(Course).where(Course.professor_id == professor_id),
+            skip=skip, limit=limit, cursor=cursor,
+        ))
+
+async_course_repository = AsyncCourseRepository(Course)
@@ -0,0 +1,30 @@
+from typing import List, Optional
+from datetime import datetime
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.exam import Exam
+from app.schemas.exam import ExamCreate, ExamUpdate
+from app.repositories.aio.base import AsyncBaseRepository
+
+class AsyncExamRepository(AsyncBaseRepository[Exam, ExamCreate, ExamUpdate]):
+    sort_attr = "date"
+
+    async def get_by_course_id(self, db: AsyncSession, *, course_id: int, skip: int = 0, limit: int = 100, cursor: Optional[str] = None) -> List[Exam]:
+        return await self._all(db, self._paginate(
+            select(Exam).where(Exam.course_id == course_id),
+            skip=skip, limit=limit, cursor=cursor,
+        ))
+
+    async def get_active_exams(self, db: AsyncSession, *, skip: int = 0, limit: int = 100, cursor: Optional[str] = None) -> List[Exam]:
+        return await self._all(db, self._paginate(
+            select(Exam).where(Exam.is_active == True, Exam.date >= datetime.now()),
+            skip=skip, limit=limit, cursor=cursor,
+        ))
+
+    async def get_upcoming_exams_by_course(self, db: AsyncSession, *, course_id: int, skip: int = 0, limit: int = 100, cursor: Optional[str] = None) -> List[Exam]:
+        return await self._all(db, self._paginate(
+            select(Exam).where(Exam.course_id == course_id, Exam.is_active == True, Exam.date >= datetime.now()),
+            skip=skip, limit=limit, cursor=cursor,
+        ))
+
+async_exam_repository = AsyncExamRepository(Exam)
@@ -0,0 +1,46 @@
+from typing import List, Optional
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.hashing import password_hasher
+from app.models.user import User, UserRole
+from app.schemas.user import UserCreate, UserUpdate
+from app.repositories.aio.base import AsyncBaseRepository
+
+class AsyncUserRepository(AsyncBaseRepository[User, UserCreate, UserUpdate]):
+    async def get_by_email(self, db: AsyncSession, *, email: str) -> Optional[User]:
+        result = await db.execute(select(User).where(User.email == email).limit(1))
+        return result.scalars().first()
+
+    async def get_by_student_id(self, db: AsyncSession, *, student_id: str) -> Optional[User]:
+        result = await db.execute(select(User).where(User.student_id == student_id).limit(1))
+        return result.scalars().first()
+
+    async def get_professors(self, db: AsyncSession, *, skip: int = 0, limit: int = 100, cursor: Optional[str] = None) -> List[User]:
+        return await self._all(db, self._paginate(
+            select(User).where(User.role == UserRole.PROFESSOR),
+            skip=skip, limit=limit, cursor=cursor,
+        ))
+
+    async def create(self, db: AsyncSession, *, obj_in: UserCreate) -> User:
+        db_obj = User(
+            email=obj_in.email,
+            hashed_password=await password_hasher.hash_async(obj_in.password),
+            first_name=obj_in.first_name,
+            last_name=obj_in.last_name,
+            role=obj_in.role,
+            student_id=obj_in.student_id,
+        )
+        db.add(db_obj)
+        await db.commit()
+        await db.refresh(db_obj)
+        return db_obj
+
+    async def authenticate(self, db: AsyncSession, *, email: str, password: str) -> Optional[User]:
+        user = await self.get_by_email(db, email=email)
+        if not user:
+            return None
+        if not await password_hasher.verify_async(password, user.hashed_password):
+            return None
+        return user
+
+async_user_repository = AsyncUserRepository(User)
@@ -0,0 +1,66 @@
+from datetime import datetime
+from typing import Dict, List, Optional
+from pydantic import BaseModel
+from sqlalchemy import Table, delete, insert, literal, select
+from sqlalchemy.orm import Session
+from app.models.archive import BookingArchive, ExamArchive
+from app.models.booking import Booking
+from app.models.exam import Exam
+from app.models.exam_seat import ExamSeat
+from app.repositories.base import BaseRepository
+
+def _copy_statement(source: Table, target: Table, where, archived_at: datetime):
+    # INSERT ... SELECT delle righe da archiviare, con l'istante di archiviazione
+    names = [column.name for column in source.columns]
+    return insert(target).from_select(
+        names + ["archived_at"],
+        select(*source.columns, literal(archived_at, target.c.archived_at.type)).where(where),
+    )
+
+class ExamArchiveRepository(BaseRepository[ExamArchive, BaseModel, BaseModel]):
+    sort_attr = "date"
+
+    def get_by_course_id(self, db: Session, *, course_id: int, skip: int = 0, limit: int = 100, cursor: Optional[str] = None) -> List[ExamArchive]:
+        return self._paginate(
+            db.query(ExamArchive).filter(ExamArchive.course_id == course_id),
+            skip=skip, limit=limit, cursor=cursor,
+        ).all()
+
+    def get_expired_ids(self, db: Session, *, before: datetime, limit: int) -> List[int]:
+        # Prossimo lotto di esami correnti da archiviare, in ordine di id
+        return db.scalars(
+            select(Exam.id).where(Exam.date < before).order_by(Exam.id).limit(limit)
+        ).all()
+
+    def move(self, db: Session, *, exam_ids: List[int], archived_at: datetime) -> Dict[str, int]:
+        """
+        Copia esami e prenotazioni nelle tabelle di archivio e li elimina da
+        quelle correnti, insieme ai contatori dei posti. Non esegue commit:
+        il lotto va confermato o annullato per intero.
+        """
+        bookings = db.execute(_copy_statement(
+            Booking.__table__, BookingArchive.__table__, Booking.exam_id.in_(exam_ids), archived_at
+        )).rowcount
+        exams = db.execute(_copy_statement(
+            Exam.__table__, ExamArchive.__table__, Exam.id.in_(exam_ids), archived_at
+        )).rowcount
+        db.execute(delete(ExamSeat).where(ExamSeat.exam_id.in_(exam_ids)))
+        db.execute(delete(Booking).where(Booking.exam_id.in_(exam_ids)))
+        db.execute(delete(Exam).where(Exam.id.in_(exam_ids)))
+        return {"exams": exams, "bookings": bookings}
+
+class BookingArchiveRepository(BaseRepository[BookingArchive, BaseModel, BaseModel]):
+    def get_by_student_id(self, db: Session, *, student_id: int, skip: int = 0, limit: int = 100, cursor: Optional[str] = None) -> List[BookingArchive]:
+        return self._paginate(
+            db.query(BookingArchive).filter(BookingArchive.student_id == student_id),
+            skip=skip, limit=limit, cursor=cursor,
+        ).all()
+
+    def get_by_exam_id(self, db: Session, *, exam_id: int, skip: int = 0, limit: int = 100, cursor: Optional[str] = None) -> List[BookingArchive]:
+        return self._paginate(
+            db.query(BookingArchive).filter(BookingArchive.exam_id == exam_id),
+            skip=skip, limit=limit, cursor=cursor,
+        ).all()
+
+exam_archive_repository = ExamArchiveRepository(ExamArchive)
+booking_archive_repository = BookingArchiveRepository(BookingArchive)
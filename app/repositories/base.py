@@ -1,13 +1,51 @@
-from typing import Any, Dict, Generic, List, Optional, Type, TypeVar, Union
-from sqlalchemy.orm import Session
+from typing import Any, Dict, Generic, List, Optional, Sequence, Tuple, Type, TypeVar, Union
+from sqlalchemy import Index, Row, Table, UniqueConstraint
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Query, Session
 from pydantic import BaseModel
 from app.models.base import Base
+from app.core.pagination import encode_cursor, keyset
 
 ModelType = TypeVar("ModelType", bound=Base)
 CreateSchemaType = TypeVar("CreateSchemaType", bound=BaseModel)
 UpdateSchemaType = TypeVar("UpdateSchemaType", bound=BaseModel)
 
+def violated_unique_columns(table: Table, exc: IntegrityError) -> Optional[Tuple[str, ...]]:
+    """
+    Colonne del vincolo univoco di `table` violato, None se l'errore è un
+    altro. PostgreSQL e MySQL riportano il nome del vincolo, SQLite le colonne.
+    """
+    message = str(exc.orig)
+    diag = getattr(exc.orig, "diag", None)
+    name = getattr(diag, "constraint_name", None)
+    for constraint in (*table.indexes, *table.constraints):
+        if not (isinstance(constraint, UniqueConstraint) or (isinstance(constraint, Index) and constraint.unique)):
+            continue
+        columns = tuple(column.name for column in constraint.columns)
+        if name is not None:
+            matched = constraint.name == name
+        elif constraint.name and (f"'{constraint.name}'" in message or f".{constraint.name}'" in message):
+            # MySQL: "Duplicate entry ... for key '[tabella.]nome'"
+            matched = True
+        else:
+            matched = message == "UNIQUE constraint failed: " + ", ".join(f"{table.name}.{column}" for column in columns)
+        if matched:
+            return columns
+    return None
+
+class UniqueViolation(Exception):
+    """
+    Scrittura rifiutata da un vincolo univoco: `columns` sono le colonne del
+    vincolo violato. I servizi la traducono nell'errore per il client.
+    """
+    def __init__(self, columns: Tuple[str, ...]):
+        super().__init__(f"Vincolo univoco violato: {', '.join(columns)}")
+        self.columns = columns
+
 class BaseRepository(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
+    # Colonna di ordinamento per la paginazione a cursore (oltre all'id)
+    sort_attr: Optional[str] = None
+
     def __init__(self, model: Type[ModelType]):
         """
         Repository base con metodi CRUD di default
@@ -18,15 +56,40 @@ class BaseRepository(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         return db.query(self.model).filter(self.model.id == id).first()
 
     def get_multi(
-        self, db: Session, *, skip: int = 0, limit: int = 100
+        self, db: Session, *, skip: int = 0, limit: int = 100, cursor: Optional[str] = None
     ) -> List[ModelType]:
-        return db.query(self.model).offset(skip).limit(limit).all()
+        return self._paginate(db.query(self.model), skip=skip, limit=limit, cursor=cursor).all()
+
+    def get_multi_rows(
+        self, db: Session, *, columns: Sequence[Any], skip: int = 0, limit: int = 100, cursor: Optional[str] = None
+    ) -> List[Row]:
+        # Come get_multi, ma legge solo le colonne richieste come tuple
+        return self._paginate(db.query(*columns), skip=skip, limit=limit, cursor=cursor).all()
+
+    def next_cursor(self, items: List[ModelType], *, limit: int) -> Optional[str]:
+        # Cursore opaco per la pagina successiva, None se è l'ultima
+        if not items or len(items) < limit:
+            return None
+        last = items[-1]
+        if self.sort_attr is None:
+            return encode_cursor(last.id)
+        return encode_cursor(getattr(last, self.sort_attr), last.id)
+
+    def _paginate(
+        self, query: Query, *, skip: int, limit: int, cursor: Optional[str]
+    ) -> Query:
+        # Con il cursore la pagina parte dall'ultima chiave vista, senza offset
+        sort_column = getattr(self.model, self.sort_attr) if self.sort_attr else None
+        query = keyset(query, id_column=self.model.id, sort_column=sort_column, cursor=cursor)
+        if cursor is None:
+            query = query.offset(skip)
+        return query.limit(limit)
 
     def create(self, db: Session, *, obj_in: CreateSchemaType) -> ModelType:
         obj_in_data = obj_in.dict()
         db_obj = self.model(**obj_in_data)
         db.add(db_obj)
-        db.commit()
+        self._commit(db)
         db.refresh(db_obj)
         return db_obj
 
@@ -46,10 +109,22 @@ class BaseRepository(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
             if field in update_data:
                 setattr(db_obj, field, update_data[field])
         db.add(db_obj)
-        db.commit()
+        self._commit(db)
         db.refresh(db_obj)
         return db_obj
 
+    def _commit(self, db: Session) -> None:
+        # Le scritture non cercano i duplicati prima, li rifiuta il database:
+        # la violazione di un vincolo univoco diventa UniqueViolation
+        try:
+            db.commit()
+        except IntegrityError as exc:
+            db.rollback()
+            columns = violated_unique_columns(self.model.__table__, exc)
+            if columns is None:
+                raise
+            raise UniqueViolation(columns) from exc
+
     def remove(self, db: Session, *, id: int) -> ModelType:
         obj = db.query(self.model).get(id)
         db.delete(obj)
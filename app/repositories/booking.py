@@ -1,8 +1,14 @@
 from typing import List, Optional
-from sqlalchemy.orm import Session
+from sqlalchemy import Result, Row, func, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, aliased
 from app.models.booking import Booking
+from app.models.course import Course
+from app.models.exam import Exam
+from app.models.user import User
 from app.schemas.booking import BookingCreate, BookingUpdate
 from app.repositories.base import BaseRepository
+from app.repositories.seat import seat_repository
 
 class BookingRepository(BaseRepository[Booking, BookingCreate, BookingUpdate]):
     def get_by_student_and_exam(self, db: Session, *, student_id: int, exam_id: int) -> Optional[Booking]:
@@ -12,23 +18,17 @@ class BookingRepository(BaseRepository[Booking, BookingCreate, BookingUpdate]):
             .first()
         )
     
-    def get_by_student_id(self, db: Session, *, student_id: int, skip: int = 0, limit: int = 100) -> List[Booking]:
-        return (
-            db.query(Booking)
-            .filter(Booking.student_id == student_id)
-            .offset(skip)
-            .limit(limit)
-            .all()
-        )
+    def get_by_student_id(self, db: Session, *, student_id: int, skip: int = 0, limit: int = 100, cursor: Optional[str] = None) -> List[Booking]:
+        return self._paginate(
+            db.query(Booking).filter(Booking.student_id == student_id),
+            skip=skip, limit=limit, cursor=cursor,
+        ).all()
     
-    def get_by_exam_id(self, db: Session, *, exam_id: int, skip: int = 0, limit: int = 100) -> List[Booking]:
-        return (
-            db.query(Booking)
-            .filter(Booking.exam_id == exam_id)
-            .offset(skip)
-            .limit(limit)
-            .all()
-        )
+    def get_by_exam_id(self, db: Session, *, exam_id: int, skip: int = 0, limit: int = 100, cursor: Optional[str] = None) -> List[Booking]:
+        return self._paginate(
+            db.query(Booking).filter(Booking.exam_id == exam_id),
+            skip=skip, limit=limit, cursor=cursor,
+        ).all()
     
     def count_by_exam_id(self, db: Session, *, exam_id: int) -> int:
         return (
@@ -37,4 +37,101 @@ class BookingRepository(BaseRepository[Booking, BookingCreate, BookingUpdate]):
             .count()
         )
 
+    def get_dashboard_rows(self, db: Session, *, student_id: int) -> List[Row]:
+        # Prenotazioni dello studente con esame, corso e docente in una sola
+        # query, indipendente dal numero di prenotazioni
+        professor = aliased(User)
+        return (
+            db.query(Booking, Exam, Course, professor)
+            .join(Exam, Exam.id == Booking.exam_id)
+            .join(Course, Course.id == Exam.course_id)
+            .outerjoin(professor, professor.id == Course.professor_id)
+            .filter(Booking.student_id == student_id)
+            .order_by(Exam.date, Booking.id)
+            .all()
+        )
+
+    def get_availability(
+        self, db: Session, *, exam_ids: Optional[List[int]] = None, course_id: Optional[int] = None
+    ) -> List[Row]:
+        # Posti confermati per esame con un'unica query: il conteggio
+        # correlato (invece di join e GROUP BY) lascia usare gli indici
+        # sia agli esami che alle prenotazioni
+        confirmed_count = (
+            select(func.count(Booking.id))
+            .where(Booking.exam_id == Exam.id, Booking.confirmed == True)
+            .correlate(Exam)
+            .scalar_subquery()
+        )
+        query = (
+            db.query(
+                Exam.id.label("exam_id"),
+                Exam.max_students,
+                confirmed_count.label("confirmed_count"),
+            )
+            .order_by(Exam.id)
+        )
+        if exam_ids is not None:
+            query = query.filter(Exam.id.in_(exam_ids))
+        if course_id is not None:
+            query = query.filter(Exam.course_id == course_id)
+        return query.all()
+
+    def iter_roster(self, db: Session, *, exam_id: Optional[int] = None, chunk_size: int = 500) -> Result:
+        # Righe delle prenotazioni già unite a studente, esame e corso, lette
+        # dal database a blocchi di chunk_size senza creare oggetti ORM
+        stmt = (
+            select(
+                Booking.id.label("booking_id"),
+                Booking.confirmed,
+                Booking.created_at.label("booked_at"),
+                User.id.label("student_user_id"),
+                User.student_id,
+                User.first_name,
+                User.last_name,
+                User.email,
+                Exam.id.label("exam_id"),
+                Exam.date.label("exam_date"),
+                Exam.location,
+                Course.code.label("course_code"),
+                Course.name.label("course_name"),
+            )
+            .join(User, User.id == Booking.student_id)
+            .join(Exam, Exam.id == Booking.exam_id)
+            .join(Course, Course.id == Exam.course_id)
+            .order_by(Booking.id)
+            .execution_options(yield_per=chunk_size)
+        )
+        if exam_id is not None:
+            stmt = stmt.where(Booking.exam_id == exam_id)
+        return db.execute(stmt)
+
+    def reserve(self, db: Session, *, obj_in: BookingCreate, commit: bool = True) -> Optional[Booking]:
+        # Occupa il posto e inserisce la prenotazione nella stessa transazione;
+        # None se la prenotazione non è ammessa. Con commit=False la transazione
+        # resta al chiamante (scrittura a gruppi)
+        seats = 1 if obj_in.confirmed else 0
+        if not seat_repository.claim(
+            db, exam_id=obj_in.exam_id, seats=seats, student_id=obj_in.student_id
+        ):
+            if commit:
+                db.rollback()
+            return None
+        db_obj = Booking(**obj_in.dict())
+        db.add(db_obj)
+        try:
+            if commit:
+                db.commit()
+            else:
+                db.flush()
+        except IntegrityError:
+            # Studente già iscritto: il vincolo uq_bookings_student_id_exam_id
+            # rifiuta l'inserimento e il rollback libera il posto occupato
+            if commit:
+                db.rollback()
+            return None
+        if commit:
+            db.refresh(db_obj)
+        return db_obj
+
 booking_repository = BookingRepository(Booking)
\ No newline at end of file
@@ -1,4 +1,4 @@
-from typing import List, Optional
+from typing import Dict, Iterable, List, Optional
 from sqlalchemy.orm import Session
 from app.models.course import Course
 from app.schemas.course import CourseCreate, CourseUpdate
@@ -8,13 +8,18 @@ class CourseRepository(BaseRepository[Course, CourseCreate, CourseUpdate]):
     def get_by_code(self, db: Session, *, code: str) -> Optional[Course]:
         return db.query(Course).filter(Course.code == code).first()
     
-    def get_by_professor_id(self, db: Session, *, professor_id: int, skip: int = 0, limit: int = 100) -> List[Course]:
-        return (
-            db.query(Course)
-            .filter(Course.professor_id == professor_id)
-            .offset(skip)
-            .limit(limit)
-            .all()
-        )
+    def get_by_professor_id(self, db: Session, *, professor_id: int, skip: int = 0, limit: int = 100, cursor: Optional[str] = None) -> List[Course]:
+        return self._paginate(
+            db.query(Course).filter(Course.professor_id == professor_id),
+            skip=skip, limit=limit, cursor=cursor,
+        ).all()
+
+    def get_professor_ids(self, db: Session, *, course_ids: Iterable[int]) -> Dict[int, Optional[int]]:
+        # Professore di ogni corso esistente tra quelli richiesti, con una query
+        course_ids = set(course_ids)
+        if not course_ids:
+            return {}
+        rows = db.query(Course.id, Course.professor_id).filter(Course.id.in_(course_ids)).all()
+        return {row.id: row.professor_id for row in rows}
 
 course_repository = CourseRepository(Course)
\ No newline at end of file
@@ -1,36 +1,69 @@
-from typing import List, Optional
+from typing import Any, Dict, Iterable, List, Optional
 from datetime import datetime
+from sqlalchemy import Row, insert, update
 from sqlalchemy.orm import Session
+from app.models.course import Course
 from app.models.exam import Exam
 from app.schemas.exam import ExamCreate, ExamUpdate
 from app.repositories.base import BaseRepository
 
 class ExamRepository(BaseRepository[Exam, ExamCreate, ExamUpdate]):
-    def get_by_course_id(self, db: Session, *, course_id: int, skip: int = 0, limit: int = 100) -> List[Exam]:
-        return (
-            db.query(Exam)
-            .filter(Exam.course_id == course_id)
-            .offset(skip)
-            .limit(limit)
-            .all()
-        )
+    sort_attr = "date"
+
+    def get_by_course_id(self, db: Session, *, course_id: int, skip: int = 0, limit: int = 100, cursor: Optional[str] = None) -> List[Exam]:
+        return self._paginate(
+            db.query(Exam).filter(Exam.course_id == course_id),
+            skip=skip, limit=limit, cursor=cursor,
+        ).all()
+    
+    def get_active_exams(self, db: Session, *, skip: int = 0, limit: int = 100, cursor: Optional[str] = None) -> List[Exam]:
+        return self._paginate(
+            db.query(Exam).filter(Exam.is_active == True, Exam.date >= datetime.now()),
+            skip=skip, limit=limit, cursor=cursor,
+        ).all()
     
-    def get_active_exams(self, db: Session, *, skip: int = 0, limit: int = 100) -> List[Exam]:
+    def get_all_active_exams(self, db: Session) -> List[Exam]:
         return (
             db.query(Exam)
             .filter(Exam.is_active == True, Exam.date >= datetime.now())
-            .offset(skip)
-            .limit(limit)
+            .order_by(Exam.date, Exam.id)
             .all()
         )
     
-    def get_upcoming_exams_by_course(self, db: Session, *, course_id: int, skip: int = 0, limit: int = 100) -> List[Exam]:
+    def get_by_ids(self, db: Session, *, ids: Iterable[int]) -> List[Exam]:
+        return db.query(Exam).filter(Exam.id.in_(set(ids))).order_by(Exam.id).all()
+    
+    def create_many(self, db: Session, *, objs_in: List[ExamCreate], commit: bool = True) -> List[Exam]:
+        # INSERT a lotti con RETURNING. Chiedere l'ordine dei parametri farebbe
+        # inserire una riga per statement su SQLite: gli esami tornano per id
+        exams = db.scalars(
+            insert(Exam).returning(Exam),
+            [obj_in.dict() for obj_in in objs_in],
+        ).all()
+        if commit:
+            db.commit()
+        return sorted(exams, key=lambda exam: exam.id)
+    
+    def update_many(self, db: Session, *, values: List[Dict[str, Any]]) -> None:
+        # UPDATE per chiave primaria: ogni dizionario contiene l'id e le colonne da modificare
+        if not values:
+            return
+        db.execute(update(Exam), values)
+        db.commit()
+    
+    def get_schedule_rows(self, db: Session, *, since: datetime) -> List[Row]:
+        # Esami attivi da `since` in poi, con il professore del corso
         return (
-            db.query(Exam)
-            .filter(Exam.course_id == course_id, Exam.is_active == True, Exam.date >= datetime.now())
-            .offset(skip)
-            .limit(limit)
+            db.query(Exam.id, Exam.date, Exam.location, Exam.course_id, Course.professor_id)
+            .join(Course, Course.id == Exam.course_id)
+            .filter(Exam.is_active == True, Exam.date >= since)
             .all()
         )
+    
+    def get_upcoming_exams_by_course(self, db: Session, *, course_id: int, skip: int = 0, limit: int = 100, cursor: Optional[str] = None) -> List[Exam]:
+        return self._paginate(
+            db.query(Exam).filter(Exam.course_id == course_id, Exam.is_active == True, Exam.date >= datetime.now()),
+            skip=skip, limit=limit, cursor=cursor,
+        ).all()
 
 exam_repository = ExamRepository(Exam)
\ No newline at end of file
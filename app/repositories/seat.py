@@ -0,0 +1,95 @@
+from datetime import datetime
+from sqlalchemy import Delete, Insert, Update, delete, func, insert, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from app.models.booking import Booking
+from app.models.exam import Exam
+from app.models.exam_seat import ExamSeat
+from app.models.user import User, UserRole
+
+# Statement condivisi dal repository sincrono e da quello asincrono
+
+def claim_statement(exam_id: int, seats: int, student_id: int = None) -> Update:
+    # La prenotazione doppia non è verificata qui: la rifiuta all'inserimento
+    # il vincolo uq_bookings_student_id_exam_id, annullando anche questa update
+    capacity = select(Exam.max_students).where(Exam.id == exam_id)
+    conditions = [ExamSeat.exam_id == exam_id]
+    if student_id is not None:
+        capacity = capacity.where(Exam.is_active == True, Exam.date >= datetime.now())
+        conditions.append(
+            select(User.id).where(User.id == student_id, User.role == UserRole.STUDENT).exists()
+        )
+    conditions.append(ExamSeat.booked < capacity.scalar_subquery())
+    return (
+        update(ExamSeat)
+        .where(*conditions)
+        .values(booked=ExamSeat.booked + seats)
+        .execution_options(synchronize_session=False)
+    )
+
+def release_statement(exam_id: int, seats: int) -> Update:
+    return (
+        update(ExamSeat)
+        .where(ExamSeat.exam_id == exam_id, ExamSeat.booked >= seats)
+        .values(booked=ExamSeat.booked - seats)
+        .execution_options(synchronize_session=False)
+    )
+
+def seed_statement(exam_id: int) -> Insert:
+    # Inizializza il contatore dalle prenotazioni confermate, solo se l'esame esiste
+    confirmed = (
+        select(func.count(Booking.id))
+        .where(Booking.exam_id == exam_id, Booking.confirmed == True)
+        .scalar_subquery()
+    )
+    return insert(ExamSeat).from_select(
+        ["exam_id", "booked"],
+        select(Exam.id, confirmed).where(Exam.id == exam_id),
+    )
+
+def drop_statement(exam_id: int) -> Delete:
+    return delete(ExamSeat).where(ExamSeat.exam_id == exam_id)
+
+class SeatRepository:
+    def __init__(self):
+        """
+        Repository dei contatori dei posti: le prenotazioni occupano e liberano
+        posti con update condizionali, senza COUNT sulle prenotazioni
+        """
+        self.model = ExamSeat
+
+    def claim(self, db: Session, *, exam_id: int, seats: int = 1, student_id: int = None) -> bool:
+        """
+        Occupa `seats` posti se l'esame non è pieno. Se viene passato lo studente,
+        la stessa update verifica anche che l'esame sia attivo e futuro e che
+        l'utente sia uno studente. Non esegue commit.
+        """
+        if db.execute(claim_statement(exam_id, seats, student_id)).rowcount == 1:
+            return True
+        # Il contatore non esiste ancora: lo inizializza e ritenta una volta
+        if self.ensure(db, exam_id=exam_id):
+            return db.execute(claim_statement(exam_id, seats, student_id)).rowcount == 1
+        return False
+
+    def release(self, db: Session, *, exam_id: int, seats: int = 1) -> None:
+        db.execute(release_statement(exam_id, seats))
+
+    def ensure(self, db: Session, *, exam_id: int) -> bool:
+        """
+        Crea il contatore partendo dalle prenotazioni confermate esistenti.
+        Restituisce True solo se il contatore è stato creato ora.
+        """
+        if db.query(ExamSeat.id).filter(ExamSeat.exam_id == exam_id).first():
+            return False
+        try:
+            with db.begin_nested():
+                result = db.execute(seed_statement(exam_id))
+        except IntegrityError:
+            # Un'altra richiesta ha creato il contatore nel frattempo
+            return True
+        return result.rowcount > 0
+
+    def drop(self, db: Session, *, exam_id: int) -> None:
+        db.execute(drop_statement(exam_id))
+
+seat_repository = SeatRepository()
\ No newline at end of file
@@ -1,9 +1,11 @@
-from typing import Optional
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+from sqlalchemy import insert, or_
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 from app.models.user import User, UserRole
 from app.schemas.user import UserCreate, UserUpdate
 from app.repositories.base import BaseRepository
-from app.core.security import get_password_hash, verify_password
+from app.core.hashing import password_hasher
 
 class UserRepository(BaseRepository[User, UserCreate, UserUpdate]):
     def get_by_email(self, db: Session, *, email: str) -> Optional[User]:
@@ -12,20 +14,43 @@ class UserRepository(BaseRepository[User, UserCreate, UserUpdate]):
     def get_by_student_id(self, db: Session, *, student_id: str) -> Optional[User]:
         return db.query(User).filter(User.student_id == student_id).first()
     
-    def get_professors(self, db: Session, *, skip: int = 0, limit: int = 100):
-        return db.query(User).filter(User.role == UserRole.PROFESSOR).offset(skip).limit(limit).all()
+    def get_professors(self, db: Session, *, skip: int = 0, limit: int = 100, cursor: Optional[str] = None) -> List[User]:
+        return self._paginate(
+            db.query(User).filter(User.role == UserRole.PROFESSOR),
+            skip=skip, limit=limit, cursor=cursor,
+        ).all()
+
+    def get_registered(
+        self, db: Session, *, emails: Iterable[str], student_ids: Iterable[str]
+    ) -> Tuple[Set[str], Set[str]]:
+        # Email e student_id già presenti tra quelli dati, con una sola query
+        emails, student_ids = set(emails), set(student_ids)
+        if not emails and not student_ids:
+            return set(), set()
+        rows = db.query(User.email, User.student_id).filter(
+            or_(User.email.in_(emails), User.student_id.in_(student_ids))
+        ).all()
+        return (
+            {row.email for row in rows if row.email in emails},
+            {row.student_id for row in rows if row.student_id in student_ids},
+        )
+
+    def insert_many(self, db: Session, *, rows: List[Dict[str, Any]]) -> None:
+        # Un solo INSERT con più righe di parametri; non esegue commit
+        if rows:
+            db.execute(insert(User), rows)
 
     def create(self, db: Session, *, obj_in: UserCreate) -> User:
         db_obj = User(
             email=obj_in.email,
-            hashed_password=get_password_hash(obj_in.password),
+            hashed_password=password_hasher.hash(obj_in.password),
             first_name=obj_in.first_name,
             last_name=obj_in.last_name,
             role=obj_in.role,
             student_id=obj_in.student_id,
         )
         db.add(db_obj)
-        db.commit()
+        self._commit(db)
         db.refresh(db_obj)
         return db_obj
     
@@ -33,7 +58,16 @@ class UserRepository(BaseRepository[User, UserCreate, UserUpdate]):
         user = self.get_by_email(db, email=email)
         if not user:
             return None
-        if not verify_password(password, user.hashed_password):
+        if not password_hasher.verify(password, user.hashed_password):
+            return None
+        return user
+
+    async def authenticate_async(self, db: Session, *, email: str, password: str) -> Optional[User]:
+        # La query resta nel threadpool, bcrypt va nel pool di processi
+        user = await run_in_threadpool(self.get_by_email, db, email=email)
+        if not user:
+            return None
+        if not await password_hasher.verify_async(password, user.hashed_password):
             return None
         return user
 
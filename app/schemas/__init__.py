@@ -1,4 +1,8 @@
 from app.schemas.user import UserBase, UserCreate, UserUpdate, User
 from app.schemas.course import CourseBase, CourseCreate, CourseUpdate, Course
 from app.schemas.exam import ExamBase, ExamCreate, ExamUpdate, Exam
-from app.schemas.booking import BookingBase, BookingCreate, BookingUpdate, Booking
\ No newline at end of file
+from app.schemas.booking import BookingBase, BookingCreate, BookingUpdate, Booking, SeatAvailability
+from app.schemas.dashboard import DashboardBooking, DashboardCourse, DashboardExam, DashboardProfessor, StudentDashboard
+from app.schemas.session import IssueKind, SessionCalendar, SessionUpdate, CalendarIssue, CalendarValidation, SessionResult
+from app.schemas.archive import ArchivedExam, ArchivedBooking, ArchiveRun
+from app.schemas.student_import import ImportRowError, StudentImportRun
\ No newline at end of file
@@ -0,0 +1,19 @@
+from datetime import datetime
+from pydantic import BaseModel
+from app.schemas.booking import Booking
+from app.schemas.exam import Exam
+
+class ArchivedExam(Exam):
+    archived_at: datetime
+
+class ArchivedBooking(Booking):
+    archived_at: datetime
+
+class ArchiveRun(BaseModel):
+    # Esami con data precedente a questo istante vengono archiviati
+    horizon: datetime
+    batches: int = 0
+    exams: int = 0
+    bookings: int = 0
+    # False se l'esecuzione si è fermata a max_batches con esami ancora da archiviare
+    completed: bool = False
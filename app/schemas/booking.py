@@ -19,4 +19,10 @@ class Booking(BookingBase):
     updated_at: datetime
 
     class Config:
-        orm_mode = True
\ No newline at end of file
+        orm_mode = True
+
+class SeatAvailability(BaseModel):
+    exam_id: int
+    max_students: int
+    confirmed_count: int
+    remaining: int
\ No newline at end of file
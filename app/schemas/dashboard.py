@@ -0,0 +1,35 @@
+from typing import List, Optional
+from pydantic import BaseModel
+from datetime import datetime
+
+class DashboardProfessor(BaseModel):
+    id: int
+    first_name: str
+    last_name: str
+    email: str
+
+class DashboardCourse(BaseModel):
+    id: int
+    name: str
+    code: str
+    credits: int
+    professor: Optional[DashboardProfessor] = None
+
+class DashboardExam(BaseModel):
+    id: int
+    date: datetime
+    location: str
+    max_students: int
+    description: Optional[str] = None
+    is_active: bool
+    course: DashboardCourse
+
+class DashboardBooking(BaseModel):
+    id: int
+    confirmed: bool
+    created_at: datetime
+    exam: DashboardExam
+
+class StudentDashboard(BaseModel):
+    student_id: int
+    bookings: List[DashboardBooking]
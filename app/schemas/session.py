@@ -0,0 +1,39 @@
+import enum
+from typing import List, Optional
+from pydantic import BaseModel
+from app.schemas.exam import Exam, ExamCreate
+
+class IssueKind(str, enum.Enum):
+    LOCATION = "location"
+    PROFESSOR = "professor"
+    COURSE_NOT_FOUND = "course_not_found"
+    EXAM_NOT_FOUND = "exam_not_found"
+    PAST_DATE = "past_date"
+    INVALID_MAX_STUDENTS = "invalid_max_students"
+
+class SessionCalendar(BaseModel):
+    exams: List[ExamCreate]
+
+class SessionUpdate(BaseModel):
+    exam_ids: List[int]
+    is_active: Optional[bool] = None
+    # Sposta tutti gli esami di questo numero di minuti (anche negativo)
+    shift_minutes: Optional[int] = None
+
+class CalendarIssue(BaseModel):
+    # Posizione dell'esame proposto nel calendario
+    index: int
+    kind: IssueKind
+    # Esame già programmato in conflitto
+    exam_id: Optional[int] = None
+    # Altro esame del calendario in conflitto
+    other_index: Optional[int] = None
+
+class CalendarValidation(BaseModel):
+    valid: bool
+    issues: List[CalendarIssue]
+
+class SessionResult(BaseModel):
+    # Vuota se ci sono errori: nessun esame viene creato o modificato
+    exams: List[Exam]
+    issues: List[CalendarIssue]
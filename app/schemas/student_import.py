@@ -0,0 +1,24 @@
+from typing import List, Optional
+from pydantic import BaseModel
+
+class ImportRowError(BaseModel):
+    # Numero di riga nel file (1 è l'intestazione)
+    line: int
+    detail: str
+
+class StudentImportRun(BaseModel):
+    # Presente solo per le importazioni avviate dall'API
+    id: Optional[str] = None
+    start_line: int = 2
+    # Ultima riga già salvata: un'importazione interrotta si riprende da last_line + 1
+    last_line: int = 1
+    batches: int = 0
+    created: int = 0
+    # Righe scartate perché email o ID studente sono già registrati o ripetuti nel file
+    duplicates: int = 0
+    invalid: int = 0
+    # Righe scartate, al più STUDENT_IMPORT_MAX_ERRORS
+    errors: List[ImportRowError] = []
+    completed: bool = False
+    # Errore che ha interrotto l'importazione
+    failure: Optional[str] = None
@@ -1,4 +1,8 @@
 from app.services.user_service import user_service
 from app.services.course_service import course_service
 from app.services.exam_service import exam_service
-from app.services.booking_service import booking_service
\ No newline at end of file
+from app.services.booking_service import booking_service
+from app.services.export_service import export_service
+from app.services.session_service import session_service
+from app.services.archive_service import archive_service
+from app.services.student_import_service import student_import_service
\ No newline at end of file
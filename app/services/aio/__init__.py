@@ -0,0 +1,2 @@
+from app.services.aio.catalog_service import async_catalog_service
+from app.services.aio.booking_service import async_booking_service
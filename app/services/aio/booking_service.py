@@ -0,0 +1,88 @@
+from datetime import datetime
+from typing import Any, List, Optional, Sequence
+from fastapi import HTTPException
+from sqlalchemy import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.repositories.aio.booking import async_booking_repository
+from app.repositories.aio.exam import async_exam_repository
+from app.repositories.aio.user import async_user_repository
+from app.schemas.booking import BookingCreate, Booking
+from app.services.booking_service import availability_updates
+from app.models.user import UserRole
+
+class AsyncBookingService:
+    async def create_booking(self, db: AsyncSession, booking_in: BookingCreate) -> Booking:
+        booking = await async_booking_repository.reserve(db, obj_in=booking_in)
+        if booking:
+            availability_updates.publish(booking.exam_id)
+            return booking
+        
+        # Prenotazione rifiutata: ripete i controlli per restituire l'errore corretto
+        await self._check_booking(db, booking_in)
+        raise HTTPException(
+            status_code=400,
+            detail="Non ci sono più posti disponibili per questo esame",
+        )
+    
+    async def _check_booking(self, db: AsyncSession, booking_in: BookingCreate) -> None:
+        student = await async_user_repository.get(db, id=booking_in.student_id)
+        if not student:
+            raise HTTPException(status_code=404, detail="Studente non trovato")
+        if student.role != UserRole.STUDENT:
+            raise HTTPException(status_code=400, detail="L'utente non è uno studente")
+        
+        exam = await async_exam_repository.get(db, id=booking_in.exam_id)
+        if not exam:
+            raise HTTPException(status_code=404, detail="Esame non trovato")
+        if not exam.is_active:
+            raise HTTPException(status_code=400, detail="L'esame non è attivo")
+        if exam.date < datetime.now():
+            raise HTTPException(status_code=400, detail="L'esame è già passato")
+        
+        existing_booking = await async_booking_repository.get_by_student_and_exam(
+            db, student_id=booking_in.student_id, exam_id=booking_in.exam_id
+        )
+        if existing_booking:
+            raise HTTPException(status_code=400, detail="Lo studente è già iscritto all'esame")
+    
+    async def get_booking(self, db: AsyncSession, booking_id: int) -> Booking:
+        booking = await async_booking_repository.get(db, id=booking_id)
+        if not booking:
+            raise HTTPException(status_code=404, detail="Prenotazione non trovata")
+        return booking
+    
+    async def get_bookings_by_student(self, db: AsyncSession, student_id: int, skip: int = 0, limit: int = 100, cursor: Optional[str] = None) -> List[Booking]:
+        student = await async_user_repository.get(db, id=student_id)
+        if not student:
+            raise HTTPException(status_code=404, detail="Studente non trovato")
+        return await async_booking_repository.get_by_student_id(db, student_id=student_id, skip=skip, limit=limit, cursor=cursor)
+    
+    async def get_bookings_by_exam(self, db: AsyncSession, exam_id: int, skip: int = 0, limit: int = 100, cursor: Optional[str] = None) -> List[Booking]:
+        exam = await async_exam_repository.get(db, id=exam_id)
+        if not exam:
+            raise HTTPException(status_code=404, detail="Esame non trovato")
+        return await async_booking_repository.get_by_exam_id(db, exam_id=exam_id, skip=skip, limit=limit, cursor=cursor)
+    
+    async def get_booking_rows_by_exam(self, db: AsyncSession, exam_id: int, columns: Sequence[Any], skip: int = 0, limit: int = 100, cursor: Optional[str] = None) -> List[Row]:
+        exam = await async_exam_repository.get(db, id=exam_id)
+        if not exam:
+            raise HTTPException(status_code=404, detail="Esame non trovato")
+        return await async_booking_repository.get_rows_by_exam_id(db, exam_id=exam_id, columns=columns, skip=skip, limit=limit, cursor=cursor)
+    
+    async def count_bookings_by_exam(self, db: AsyncSession, exam_id: int) -> int:
+        exam = await async_exam_repository.get(db, id=exam_id)
+        if not exam:
+            raise HTTPException(status_code=404, detail="Esame non trovato")
+        return await async_booking_repository.count_by_exam_id(db, exam_id=exam_id)
+    
+    async def cancel_booking(self, db: AsyncSession, student_id: int, exam_id: int) -> None:
+        booking = await async_booking_repository.get_by_student_and_exam(db, student_id=student_id, exam_id=exam_id)
+        if not booking:
+            raise HTTPException(status_code=404, detail="Prenotazione non trovata")
+        
+        if booking.confirmed:
+            await async_booking_repository.release(db, exam_id=exam_id)
+        await async_booking_repository.remove(db, id=booking.id)
+        availability_updates.publish(exam_id)
+
+async_booking_service = AsyncBookingService()
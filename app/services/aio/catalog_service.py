@@ -0,0 +1,43 @@
+from typing import Any, List, Optional, Sequence
+from fastapi import HTTPException
+from sqlalchemy import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.repositories.aio.course import async_course_repository
+from app.repositories.aio.exam import async_exam_repository
+from app.schemas.course import Course
+from app.schemas.exam import Exam
+
+class AsyncCatalogService:
+    async def get_course(self, db: AsyncSession, course_id: int) -> Course:
+        course = await async_course_repository.get(db, id=course_id)
+        if not course:
+            raise HTTPException(status_code=404, detail="Corso non trovato")
+        return course
+    
+    async def get_courses(self, db: AsyncSession, skip: int = 0, limit: int = 100, cursor: Optional[str] = None) -> List[Course]:
+        return await async_course_repository.get_multi(db, skip=skip, limit=limit, cursor=cursor)
+    
+    async def get_exam(self, db: AsyncSession, exam_id: int) -> Exam:
+        exam = await async_exam_repository.get(db, id=exam_id)
+        if not exam:
+            raise HTTPException(status_code=404, detail="Esame non trovato")
+        return exam
+    
+    async def get_exams(self, db: AsyncSession, skip: int = 0, limit: int = 100, cursor: Optional[str] = None) -> List[Exam]:
+        return await async_exam_repository.get_multi(db, skip=skip, limit=limit, cursor=cursor)
+    
+    async def get_exam_rows(self, db: AsyncSession, columns: Sequence[Any], skip: int = 0, limit: int = 100, cursor: Optional[str] = None) -> List[Row]:
+        return await async_exam_repository.get_multi_rows(db, columns=columns, skip=skip, limit=limit, cursor=cursor)
+    
+    async def get_active_exams(self, db: AsyncSession, skip: int = 0, limit: int = 100, cursor: Optional[str] = None) -> List[Exam]:
+        return await async_exam_repository.get_active_exams(db, skip=skip, limit=limit, cursor=cursor)
+    
+    async def get_exams_by_course(self, db: AsyncSession, course_id: int, skip: int = 0, limit: int = 100, cursor: Optional[str] = None) -> List[Exam]:
+        await self.get_course(db, course_id)
+        return await async_exam_repository.get_by_course_id(db, course_id=course_id, skip=skip, limit=limit, cursor=cursor)
+    
+    async def get_upcoming_exams_by_course(self, db: AsyncSession, course_id: int, skip: int = 0, limit: int = 100, cursor: Optional[str] = None) -> List[Exam]:
+        await self.get_course(db, course_id)
+        return await async_exam_repository.get_upcoming_exams_by_course(db, course_id=course_id, skip=skip, limit=limit, cursor=cursor)
+
+async_catalog_service = AsyncCatalogService()
@@ -0,0 +1,74 @@
+import os
+from datetime import datetime, timedelta
+from typing import Callable, List, Optional
+from fastapi import HTTPException
+from sqlalchemy.orm import Session
+from app.core.routing import reads_from_replica
+from app.models.archive import BookingArchive, ExamArchive
+from app.repositories.archive import booking_archive_repository, exam_archive_repository
+from app.schemas.archive import ArchiveRun
+
+# Gli esami più vecchi di così passano, con le prenotazioni, nelle tabelle di archivio
+ARCHIVE_RETENTION_DAYS = int(os.getenv("ARCHIVE_RETENTION_DAYS", "365"))
+# Esami spostati per transazione
+ARCHIVE_BATCH_SIZE = int(os.getenv("ARCHIVE_BATCH_SIZE", "200"))
+
+class ArchiveService:
+    def archive_expired(
+        self,
+        db: Session,
+        *,
+        retention_days: int = ARCHIVE_RETENTION_DAYS,
+        batch_size: int = ARCHIVE_BATCH_SIZE,
+        max_batches: Optional[int] = None,
+        on_batch: Optional[Callable[[ArchiveRun], None]] = None,
+    ) -> ArchiveRun:
+        """
+        Sposta a lotti gli esami oltre l'orizzonte di conservazione e le loro
+        prenotazioni nelle tabelle di archivio. Ogni lotto è una transazione:
+        un'esecuzione interrotta si riprende rilanciandola, senza righe doppie
+        né perse.
+        """
+        if retention_days < 1:
+            raise HTTPException(
+                status_code=400,
+                detail="La conservazione deve essere di almeno un giorno",
+            )
+        run = ArchiveRun(horizon=datetime.now() - timedelta(days=retention_days))
+        while max_batches is None or run.batches < max_batches:
+            exam_ids = exam_archive_repository.get_expired_ids(db, before=run.horizon, limit=batch_size)
+            if not exam_ids:
+                run.completed = True
+                break
+            try:
+                moved = exam_archive_repository.move(db, exam_ids=exam_ids, archived_at=datetime.now())
+                db.commit()
+            except Exception:
+                db.rollback()
+                raise
+            run.batches += 1
+            run.exams += moved["exams"]
+            run.bookings += moved["bookings"]
+            if on_batch is not None:
+                on_batch(run)
+        return run
+
+    @reads_from_replica
+    def get_archived_exams_by_course(self, db: Session, course_id: int, skip: int = 0, limit: int = 100, cursor: Optional[str] = None) -> List[ExamArchive]:
+        return exam_archive_repository.get_by_course_id(db, course_id=course_id, skip=skip, limit=limit, cursor=cursor)
+
+    @reads_from_replica
+    def get_archived_bookings_by_exam(self, db: Session, exam_id: int, skip: int = 0, limit: int = 100, cursor: Optional[str] = None) -> List[BookingArchive]:
+        # Verifica se l'esame è in archivio
+        if not exam_archive_repository.get(db, id=exam_id):
+            raise HTTPException(
+                status_code=404,
+                detail="Esame non trovato in archivio",
+            )
+        return booking_archive_repository.get_by_exam_id(db, exam_id=exam_id, skip=skip, limit=limit, cursor=cursor)
+
+    @reads_from_replica
+    def get_archived_bookings_by_student(self, db: Session, student_id: int, skip: int = 0, limit: int = 100, cursor: Optional[str] = None) -> List[BookingArchive]:
+        return booking_archive_repository.get_by_student_id(db, student_id=student_id, skip=skip, limit=limit, cursor=cursor)
+
+archive_service = ArchiveService()
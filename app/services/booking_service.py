@@ -1,15 +1,45 @@
-from typing import List
+from typing import Dict, List, Optional
 from fastapi import HTTPException
 from sqlalchemy.orm import Session
+from app.core.pubsub import CoalescingPubSub
+from app.core.routing import mark_written, reads_from_replica
 from app.repositories.booking import booking_repository
+from app.repositories.course import course_repository
 from app.repositories.exam import exam_repository
+from app.repositories.seat import seat_repository
 from app.repositories.user import user_repository
-from app.schemas.booking import BookingCreate, BookingUpdate, Booking
-from app.models.user import UserRole
+from app.schemas.booking import BookingCreate, BookingUpdate, Booking, SeatAvailability
+from app.schemas.dashboard import (
+    DashboardBooking, DashboardCourse, DashboardExam, DashboardProfessor, StudentDashboard
+)
+from app.services.booking_writer import booking_writer
+from app.models.user import User, UserRole
 from datetime import datetime
 
+# Numero massimo di esami per richiesta di disponibilità
+MAX_AVAILABILITY_EXAMS = 200
+
 class BookingService:
     def create_booking(self, db: Session, booking_in: BookingCreate) -> Booking:
+        # Prenotazione atomica: una update condizionale sul contatore dei posti
+        # e l'inserimento, nella stessa transazione (o nel lotto del writer)
+        if booking_writer.enabled:
+            booking = booking_writer.submit(booking_in).result()
+            mark_written(db)
+        else:
+            booking = booking_repository.reserve(db, obj_in=booking_in)
+        if booking:
+            availability_updates.publish(booking.exam_id)
+            return booking
+        
+        # Prenotazione rifiutata: ripete i controlli per restituire l'errore corretto
+        self._check_booking(db, booking_in)
+        raise HTTPException(
+            status_code=400,
+            detail="Non ci sono più posti disponibili per questo esame",
+        )
+    
+    def _check_booking(self, db: Session, booking_in: BookingCreate) -> None:
         # Verifica se lo studente esiste ed è effettivamente uno studente
         student = user_repository.get(db, id=booking_in.student_id)
         if not student:
@@ -62,8 +92,6 @@ class BookingService:
                 status_code=400,
                 detail="Non ci sono più posti disponibili per questo esame",
             )
-        
-        return booking_repository.create(db, obj_in=booking_in)
     
     def get_booking(self, db: Session, booking_id: int) -> Booking:
         booking = booking_repository.get(db, id=booking_id)
@@ -71,10 +99,12 @@ class BookingService:
             raise HTTPException(status_code=404, detail="Prenotazione non trovata")
         return booking
     
-    def get_bookings(self, db: Session, skip: int = 0, limit: int = 100) -> List[Booking]:
-        return booking_repository.get_multi(db, skip=skip, limit=limit)
+    @reads_from_replica
+    def get_bookings(self, db: Session, skip: int = 0, limit: int = 100, cursor: Optional[str] = None) -> List[Booking]:
+        return booking_repository.get_multi(db, skip=skip, limit=limit, cursor=cursor)
     
-    def get_bookings_by_student(self, db: Session, student_id: int, skip: int = 0, limit: int = 100) -> List[Booking]:
+    @reads_from_replica
+    def get_bookings_by_student(self, db: Session, student_id: int, skip: int = 0, limit: int = 100, cursor: Optional[str] = None) -> List[Booking]:
         # Verifica se lo studente esiste
         student = user_repository.get(db, id=student_id)
         if not student:
@@ -83,9 +113,43 @@ class BookingService:
                 detail="Studente non trovato",
             )
         
-        return booking_repository.get_by_student_id(db, student_id=student_id, skip=skip, limit=limit)
+        return booking_repository.get_by_student_id(db, student_id=student_id, skip=skip, limit=limit, cursor=cursor)
+    
+    @reads_from_replica
+    def get_student_dashboard(self, db: Session, student: User) -> StudentDashboard:
+        # Gli oggetti annidati sono costruiti dalle colonne già caricate, senza
+        # accedere alle relazioni (che genererebbero una query per riga)
+        bookings = []
+        for booking, exam, course, professor in booking_repository.get_dashboard_rows(db, student_id=student.id):
+            bookings.append(DashboardBooking(
+                id=booking.id,
+                confirmed=booking.confirmed,
+                created_at=booking.created_at,
+                exam=DashboardExam(
+                    id=exam.id,
+                    date=exam.date,
+                    location=exam.location,
+                    max_students=exam.max_students,
+                    description=exam.description,
+                    is_active=exam.is_active,
+                    course=DashboardCourse(
+                        id=course.id,
+                        name=course.name,
+                        code=course.code,
+                        credits=course.credits,
+                        professor=DashboardProfessor(
+                            id=professor.id,
+                            first_name=professor.first_name,
+                            last_name=professor.last_name,
+                            email=professor.email,
+                        ) if professor else None,
+                    ),
+                ),
+            ))
+        return StudentDashboard(student_id=student.id, bookings=bookings)
     
-    def get_bookings_by_exam(self, db: Session, exam_id: int, skip: int = 0, limit: int = 100) -> List[Booking]:
+    @reads_from_replica
+    def get_bookings_by_exam(self, db: Session, exam_id: int, skip: int = 0, limit: int = 100, cursor: Optional[str] = None) -> List[Booking]:
         # Verifica se l'esame esiste
         exam = exam_repository.get(db, id=exam_id)
         if not exam:
@@ -94,8 +158,9 @@ class BookingService:
                 detail="Esame non trovato",
             )
         
-        return booking_repository.get_by_exam_id(db, exam_id=exam_id, skip=skip, limit=limit)
+        return booking_repository.get_by_exam_id(db, exam_id=exam_id, skip=skip, limit=limit, cursor=cursor)
     
+    @reads_from_replica
     def count_bookings_by_exam(self, db: Session, exam_id: int) -> int:
         # Verifica se l'esame esiste
         exam = exam_repository.get(db, id=exam_id)
@@ -107,18 +172,71 @@ class BookingService:
         
         return booking_repository.count_by_exam_id(db, exam_id=exam_id)
     
+    @reads_from_replica
+    def get_availability(self, db: Session, exam_ids: Optional[List[int]] = None, course_id: Optional[int] = None) -> List[SeatAvailability]:
+        if not exam_ids and course_id is None:
+            raise HTTPException(
+                status_code=400,
+                detail="Specificare gli esami o il corso",
+            )
+        if exam_ids and len(exam_ids) > MAX_AVAILABILITY_EXAMS:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Si possono richiedere al massimo {MAX_AVAILABILITY_EXAMS} esami",
+            )
+        
+        rows = booking_repository.get_availability(db, exam_ids=exam_ids or None, course_id=course_id)
+        
+        # Verifica se il corso esiste solo quando non ci sono esami
+        if not rows and course_id is not None and not course_repository.get(db, id=course_id):
+            raise HTTPException(
+                status_code=404,
+                detail="Corso non trovato",
+            )
+        
+        return [
+            SeatAvailability(
+                exam_id=row.exam_id,
+                max_students=row.max_students,
+                confirmed_count=row.confirmed_count,
+                remaining=max(row.max_students - row.confirmed_count, 0),
+            )
+            for row in rows
+        ]
+    
     def update_booking(self, db: Session, booking_id: int, booking_in: BookingUpdate) -> Booking:
         booking = booking_repository.get(db, id=booking_id)
         if not booking:
             raise HTTPException(status_code=404, detail="Prenotazione non trovata")
         
-        return booking_repository.update(db, db_obj=booking, obj_in=booking_in)
+        # Aggiorna il contatore dei posti se cambia la conferma
+        seats_changed = booking_in.confirmed is not None and booking_in.confirmed != booking.confirmed
+        if seats_changed:
+            if booking_in.confirmed:
+                if not seat_repository.claim(db, exam_id=booking.exam_id):
+                    db.rollback()
+                    raise HTTPException(
+                        status_code=400,
+                        detail="Non ci sono più posti disponibili per questo esame",
+                    )
+            else:
+                seat_repository.release(db, exam_id=booking.exam_id)
+        
+        booking = booking_repository.update(db, db_obj=booking, obj_in=booking_in)
+        if seats_changed:
+            availability_updates.publish(booking.exam_id)
+        return booking
     
     def delete_booking(self, db: Session, booking_id: int) -> Booking:
         booking = booking_repository.get(db, id=booking_id)
         if not booking:
             raise HTTPException(status_code=404, detail="Prenotazione non trovata")
-        return booking_repository.remove(db, id=booking_id)
+        exam_id = booking.exam_id
+        if booking.confirmed:
+            seat_repository.release(db, exam_id=exam_id)
+        booking = booking_repository.remove(db, id=booking_id)
+        availability_updates.publish(exam_id)
+        return booking
     
     def cancel_booking(self, db: Session, student_id: int, exam_id: int) -> None:
         booking = booking_repository.get_by_student_and_exam(db, student_id=student_id, exam_id=exam_id)
@@ -128,6 +246,26 @@ class BookingService:
                 detail="Prenotazione non trovata",
             )
         
+        if booking.confirmed:
+            seat_repository.release(db, exam_id=exam_id)
         booking_repository.remove(db, id=booking.id)
+        availability_updates.publish(exam_id)
+
+booking_service = BookingService()
+
+def _load_availability(exam_ids: List[int]) -> Dict[int, SeatAvailability]:
+    # Posti rimasti degli esami modificati nell'intervallo, con una query per blocco
+    from app.core.database import SessionLocal
+
+    db = SessionLocal()
+    try:
+        result = {}
+        for start in range(0, len(exam_ids), MAX_AVAILABILITY_EXAMS):
+            chunk = exam_ids[start:start + MAX_AVAILABILITY_EXAMS]
+            result.update((row.exam_id, row) for row in booking_service.get_availability(db, exam_ids=chunk))
+        return result
+    finally:
+        db.close()
 
-booking_service = BookingService()
\ No newline at end of file
+# Notifiche dei posti rimasti agli iscritti di /api/availability/stream
+availability_updates = CoalescingPubSub(_load_availability)
\ No newline at end of file
@@ -0,0 +1,127 @@
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Callable, List, Optional, Tuple
+from sqlalchemy.orm import Session
+from app.repositories.booking import booking_repository
+from app.schemas.booking import BookingCreate
+from app.models.booking import Booking
+
+# Scrittura a gruppi delle prenotazioni (opzionale)
+GROUP_COMMIT_ENABLED = os.getenv("BOOKING_GROUP_COMMIT", "0") == "1"
+GROUP_COMMIT_MAX_BATCH = int(os.getenv("BOOKING_GROUP_COMMIT_MAX_BATCH", "64"))
+GROUP_COMMIT_MAX_DELAY_MS = float(os.getenv("BOOKING_GROUP_COMMIT_MAX_DELAY_MS", "5"))
+
+_STOP = object()
+
+class BookingWriter:
+    def __init__(
+        self,
+        session_factory: Optional[Callable[[], Session]] = None,
+        max_batch_size: int = GROUP_COMMIT_MAX_BATCH,
+        max_delay_ms: float = GROUP_COMMIT_MAX_DELAY_MS,
+    ):
+        """
+        Accoda le prenotazioni e le scrive a gruppi: un solo commit per lotto,
+        con un savepoint per riga così che ogni richiesta riceva il proprio esito
+        """
+        self.session_factory = session_factory
+        self.max_batch_size = max_batch_size
+        self.max_delay = max_delay_ms / 1000
+        self._queue: "queue.Queue" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def enabled(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        if self.enabled:
+            return
+        if self.session_factory is None:
+            from app.core.database import SessionLocal
+            self.session_factory = SessionLocal
+        self._thread = threading.Thread(target=self._run, name="booking-writer", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        if not self.enabled:
+            return
+        self._queue.put(_STOP)
+        self._thread.join()
+        self._thread = None
+
+    def submit(self, booking_in: BookingCreate) -> "Future[Optional[Booking]]":
+        """
+        Restituisce un future con la prenotazione creata, oppure None se la
+        prenotazione è stata rifiutata (esame pieno, duplicato, ...)
+        """
+        future: "Future[Optional[Booking]]" = Future()
+        self._queue.put((booking_in, future))
+        return future
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is _STOP:
+                return
+            batch = [item]
+            stopping = False
+            deadline = time.monotonic() + self.max_delay
+            while len(batch) < self.max_batch_size:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=timeout)
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+            self._flush(batch)
+            if stopping:
+                return
+
+    def _flush(self, batch: List[Tuple[BookingCreate, Future]]) -> None:
+        db = self.session_factory()
+        try:
+            _begin(db)
+            results = []
+            for booking_in, future in batch:
+                savepoint = db.begin_nested()
+                booking = booking_repository.reserve(db, obj_in=booking_in, commit=False)
+                if booking is None:
+                    savepoint.rollback()
+                else:
+                    savepoint.commit()
+                results.append((booking, future))
+            db.commit()
+            for booking, future in results:
+                if booking is not None:
+                    db.refresh(booking)
+                future.set_result(booking)
+        except Exception as exc:
+            db.rollback()
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(exc)
+        finally:
+            db.close()
+
+def _begin(db: Session) -> None:
+    """
+    Apre la transazione del lotto prima del primo savepoint. pysqlite la apre
+    solo al primo INSERT/UPDATE: un SAVEPOINT emesso prima ne avvia una
+    propria, e il suo RELEASE conferma la riga da sola.
+    """
+    connection = db.connection()
+    if connection.dialect.driver != "pysqlite":
+        return
+    if not connection.connection.dbapi_connection.in_transaction:
+        connection.exec_driver_sql("BEGIN")
+
+booking_writer = BookingWriter()
\ No newline at end of file
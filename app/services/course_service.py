@@ -1,21 +1,17 @@
 from typing import List, Optional
 from fastapi import HTTPException
 from sqlalchemy.orm import Session
+from app.core.routing import reads_from_replica
+from app.repositories.base import UniqueViolation
 from app.repositories.course import course_repository
 from app.repositories.user import user_repository
 from app.schemas.course import CourseCreate, CourseUpdate, Course
+from app.services.exam_catalog import exam_catalog
+from app.services.scheduling import exam_scheduler
 from app.models.user import UserRole
 
 class CourseService:
     def create_course(self, db: Session, course_in: CourseCreate) -> Course:
-        # Verifica se il codice del corso è già utilizzato
-        db_course = course_repository.get_by_code(db, code=course_in.code)
-        if db_course:
-            raise HTTPException(
-                status_code=400,
-                detail="Il codice del corso è già registrato nel sistema.",
-            )
-        
         # Verifica se il professore esiste ed è effettivamente un professore
         professor = user_repository.get(db, id=course_in.professor_id)
         if not professor:
@@ -29,7 +25,11 @@ class CourseService:
                 detail="L'utente assegnato non è un professore",
             )
         
-        return course_repository.create(db, obj_in=course_in)
+        # Il codice duplicato lo rifiuta il vincolo uq_courses_code
+        try:
+            return course_repository.create(db, obj_in=course_in)
+        except UniqueViolation as exc:
+            raise _duplicate(exc)
     
     def get_course(self, db: Session, course_id: int) -> Optional[Course]:
         course = course_repository.get(db, id=course_id)
@@ -37,10 +37,12 @@ class CourseService:
             raise HTTPException(status_code=404, detail="Corso non trovato")
         return course
     
-    def get_courses(self, db: Session, skip: int = 0, limit: int = 100) -> List[Course]:
-        return course_repository.get_multi(db, skip=skip, limit=limit)
+    @reads_from_replica
+    def get_courses(self, db: Session, skip: int = 0, limit: int = 100, cursor: Optional[str] = None) -> List[Course]:
+        return course_repository.get_multi(db, skip=skip, limit=limit, cursor=cursor)
     
-    def get_courses_by_professor(self, db: Session, professor_id: int, skip: int = 0, limit: int = 100) -> List[Course]:
+    @reads_from_replica
+    def get_courses_by_professor(self, db: Session, professor_id: int, skip: int = 0, limit: int = 100, cursor: Optional[str] = None) -> List[Course]:
         # Verifica se il professore esiste
         professor = user_repository.get(db, id=professor_id)
         if not professor:
@@ -54,7 +56,7 @@ class CourseService:
                 detail="L'utente assegnato non è un professore",
             )
         
-        return course_repository.get_by_professor_id(db, professor_id=professor_id, skip=skip, limit=limit)
+        return course_repository.get_by_professor_id(db, professor_id=professor_id, skip=skip, limit=limit, cursor=cursor)
     
     def update_course(self, db: Session, course_id: int, course_in: CourseUpdate) -> Course:
         course = course_repository.get(db, id=course_id)
@@ -84,12 +86,27 @@ class CourseService:
                     detail="L'utente assegnato non è un professore",
                 )
         
-        return course_repository.update(db, db_obj=course, obj_in=course_in)
+        try:
+            course = course_repository.update(db, db_obj=course, obj_in=course_in)
+        except UniqueViolation as exc:
+            # Codice registrato da un'altra richiesta dopo il controllo
+            raise _duplicate(exc)
+        # I conflitti per professore dipendono dal professore del corso
+        exam_scheduler.invalidate()
+        return course
     
     def delete_course(self, db: Session, course_id: int) -> Course:
         course = course_repository.get(db, id=course_id)
         if not course:
             raise HTTPException(status_code=404, detail="Corso non trovato")
-        return course_repository.remove(db, id=course_id)
+        course = course_repository.remove(db, id=course_id)
+        exam_catalog.invalidate()
+        exam_scheduler.invalidate()
+        return course
+
+def _duplicate(exc: UniqueViolation) -> Exception:
+    if exc.columns != ("code",):
+        return exc
+    return HTTPException(status_code=400, detail="Il codice del corso è già registrato nel sistema.")
 
-course_service = CourseService()
\ No newline at end of file
+course_service = CourseService()
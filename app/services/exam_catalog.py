@@ -0,0 +1,101 @@
+import os
+import threading
+import time
+from bisect import bisect_left, bisect_right
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+from fastapi import HTTPException
+from sqlalchemy.orm import Session
+from app.core.pagination import decode_cursor
+from app.core.routing import use_primary
+from app.repositories.exam import exam_repository
+from app.schemas.exam import Exam
+
+# Ricarica comunque il catalogo dopo questo intervallo: le modifiche fatte
+# da altri processi diventano visibili al più entro questo tempo
+EXAM_CATALOG_REFRESH_SECONDS = float(os.getenv("EXAM_CATALOG_REFRESH_SECONDS", "300"))
+
+ExamKey = Tuple[datetime, int]
+
+class _Snapshot:
+    def __init__(self, exams: List[Exam]):
+        self.exams = exams
+        self.keys: List[ExamKey] = [(exam.date, exam.id) for exam in exams]
+        self.by_course: Dict[int, List[Exam]] = {}
+        for exam in exams:
+            self.by_course.setdefault(exam.course_id, []).append(exam)
+        self.keys_by_course: Dict[int, List[ExamKey]] = {
+            course_id: [(exam.date, exam.id) for exam in course_exams]
+            for course_id, course_exams in self.by_course.items()
+        }
+        self.loaded_at = time.monotonic()
+
+class ExamCatalog:
+    def __init__(self, refresh_seconds: float = EXAM_CATALOG_REFRESH_SECONDS):
+        """
+        Catalogo in memoria degli esami attivi futuri, ordinati per (data, id)
+        e indicizzati per corso. Gli esami già passati vengono saltati in
+        lettura con una ricerca binaria sulla data, quindi il catalogo va
+        ricaricato solo quando gli esami cambiano.
+        """
+        self.refresh_seconds = refresh_seconds
+        self._snapshot: Optional[_Snapshot] = None
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def invalidate(self) -> None:
+        # Un caricamento iniziato prima dell'invalidazione non viene conservato
+        self._generation += 1
+        self._snapshot = None
+
+    def get_active_exams(
+        self, db: Session, *, skip: int = 0, limit: int = 100, cursor: Optional[str] = None
+    ) -> List[Exam]:
+        snapshot = self._load(db)
+        return self._page(snapshot.exams, snapshot.keys, skip=skip, limit=limit, cursor=cursor)
+
+    def get_upcoming_exams_by_course(
+        self, db: Session, *, course_id: int, skip: int = 0, limit: int = 100, cursor: Optional[str] = None
+    ) -> List[Exam]:
+        snapshot = self._load(db)
+        return self._page(
+            snapshot.by_course.get(course_id, []),
+            snapshot.keys_by_course.get(course_id, []),
+            skip=skip, limit=limit, cursor=cursor,
+        )
+
+    def has_course(self, db: Session, course_id: int) -> bool:
+        return course_id in self._load(db).by_course
+
+    def _load(self, db: Session) -> _Snapshot:
+        snapshot = self._snapshot
+        if snapshot is not None and time.monotonic() - snapshot.loaded_at < self.refresh_seconds:
+            return snapshot
+        with self._lock:
+            snapshot = self._snapshot
+            if snapshot is None or time.monotonic() - snapshot.loaded_at >= self.refresh_seconds:
+                generation = self._generation
+                with use_primary():
+                    exams = exam_repository.get_all_active_exams(db)
+                snapshot = _Snapshot([Exam.model_validate(exam, from_attributes=True) for exam in exams])
+                if generation == self._generation:
+                    self._snapshot = snapshot
+            return snapshot
+
+    def _page(
+        self, exams: List[Exam], keys: List[ExamKey], *, skip: int, limit: int, cursor: Optional[str]
+    ) -> List[Exam]:
+        # Salta gli esami già passati
+        start = bisect_left(keys, (datetime.now(),))
+        if cursor is not None:
+            try:
+                last_date, last_id = decode_cursor(cursor)
+                last_key = (datetime.fromisoformat(last_date), int(last_id))
+            except (ValueError, TypeError):
+                raise HTTPException(status_code=400, detail="Cursore di paginazione non valido")
+            start = max(start, bisect_right(keys, last_key))
+        else:
+            start += skip
+        return exams[start:start + limit]
+
+exam_catalog = ExamCatalog()
\ No newline at end of file
@@ -1,10 +1,14 @@
-from typing import List
+from typing import List, Optional
 from datetime import datetime
 from fastapi import HTTPException
 from sqlalchemy.orm import Session
+from app.core.routing import reads_from_replica
 from app.repositories.exam import exam_repository
 from app.repositories.course import course_repository
+from app.repositories.seat import seat_repository
 from app.schemas.exam import ExamCreate, ExamUpdate, Exam
+from app.services.exam_catalog import exam_catalog
+from app.services.scheduling import exam_scheduler
 
 class ExamService:
     def create_exam(self, db: Session, exam_in: ExamCreate) -> Exam:
@@ -30,7 +34,16 @@ class ExamService:
                 detail="Il numero massimo di studenti deve essere positivo",
             )
         
-        return exam_repository.create(db, obj_in=exam_in)
+        # Verifica che aula e professore siano liberi in quell'orario
+        if exam_in.is_active:
+            exam_scheduler.check_exam(
+                db, date=exam_in.date, location=exam_in.location, professor_id=course.professor_id
+            )
+        
+        exam = exam_repository.create(db, obj_in=exam_in)
+        exam_catalog.invalidate()
+        exam_scheduler.record(exam, professor_id=course.professor_id)
+        return exam
     
     def get_exam(self, db: Session, exam_id: int) -> Exam:
         exam = exam_repository.get(db, id=exam_id)
@@ -38,13 +51,16 @@ class ExamService:
             raise HTTPException(status_code=404, detail="Esame non trovato")
         return exam
     
-    def get_exams(self, db: Session, skip: int = 0, limit: int = 100) -> List[Exam]:
-        return exam_repository.get_multi(db, skip=skip, limit=limit)
+    @reads_from_replica
+    def get_exams(self, db: Session, skip: int = 0, limit: int = 100, cursor: Optional[str] = None) -> List[Exam]:
+        return exam_repository.get_multi(db, skip=skip, limit=limit, cursor=cursor)
     
-    def get_active_exams(self, db: Session, skip: int = 0, limit: int = 100) -> List[Exam]:
-        return exam_repository.get_active_exams(db, skip=skip, limit=limit)
+    @reads_from_replica
+    def get_active_exams(self, db: Session, skip: int = 0, limit: int = 100, cursor: Optional[str] = None) -> List[Exam]:
+        return exam_catalog.get_active_exams(db, skip=skip, limit=limit, cursor=cursor)
     
-    def get_exams_by_course(self, db: Session, course_id: int, skip: int = 0, limit: int = 100) -> List[Exam]:
+    @reads_from_replica
+    def get_exams_by_course(self, db: Session, course_id: int, skip: int = 0, limit: int = 100, cursor: Optional[str] = None) -> List[Exam]:
         # Verifica se il corso esiste
         course = course_repository.get(db, id=course_id)
         if not course:
@@ -53,18 +69,20 @@ class ExamService:
                 detail="Corso non trovato",
             )
         
-        return exam_repository.get_by_course_id(db, course_id=course_id, skip=skip, limit=limit)
+        return exam_repository.get_by_course_id(db, course_id=course_id, skip=skip, limit=limit, cursor=cursor)
     
-    def get_upcoming_exams_by_course(self, db: Session, course_id: int, skip: int = 0, limit: int = 100) -> List[Exam]:
-        # Verifica se il corso esiste
-        course = course_repository.get(db, id=course_id)
-        if not course:
-            raise HTTPException(
-                status_code=404,
-                detail="Corso non trovato",
-            )
+    @reads_from_replica
+    def get_upcoming_exams_by_course(self, db: Session, course_id: int, skip: int = 0, limit: int = 100, cursor: Optional[str] = None) -> List[Exam]:
+        # Verifica se il corso esiste (un corso con esami in catalogo esiste)
+        if not exam_catalog.has_course(db, course_id):
+            course = course_repository.get(db, id=course_id)
+            if not course:
+                raise HTTPException(
+                    status_code=404,
+                    detail="Corso non trovato",
+                )
         
-        return exam_repository.get_upcoming_exams_by_course(db, course_id=course_id, skip=skip, limit=limit)
+        return exam_catalog.get_upcoming_exams_by_course(db, course_id=course_id, skip=skip, limit=limit, cursor=cursor)
     
     def update_exam(self, db: Session, exam_id: int, exam_in: ExamUpdate) -> Exam:
         exam = exam_repository.get(db, id=exam_id)
@@ -85,12 +103,35 @@ class ExamService:
                 detail="Il numero massimo di studenti deve essere positivo",
             )
         
-        return exam_repository.update(db, db_obj=exam, obj_in=exam_in)
+        # Verifica i conflitti se l'esame attivo cambia orario o aula, o viene riattivato
+        is_active = exam.is_active if exam_in.is_active is None else exam_in.is_active
+        rescheduled = (
+            (exam_in.date is not None and exam_in.date != exam.date)
+            or (exam_in.location is not None and exam_in.location != exam.location)
+            or (is_active and not exam.is_active)
+        )
+        if is_active and rescheduled:
+            exam_scheduler.check_exam(
+                db,
+                date=exam_in.date or exam.date,
+                location=exam_in.location or exam.location,
+                professor_id=exam_scheduler.professor_of(db, exam.course_id),
+                exclude_exam_id=exam.id,
+            )
+        
+        exam = exam_repository.update(db, db_obj=exam, obj_in=exam_in)
+        exam_catalog.invalidate()
+        exam_scheduler.record(exam, professor_id=exam_scheduler.professor_of(db, exam.course_id))
+        return exam
     
     def delete_exam(self, db: Session, exam_id: int) -> Exam:
         exam = exam_repository.get(db, id=exam_id)
         if not exam:
             raise HTTPException(status_code=404, detail="Esame non trovato")
-        return exam_repository.remove(db, id=exam_id)
+        seat_repository.drop(db, exam_id=exam_id)
+        exam = exam_repository.remove(db, id=exam_id)
+        exam_catalog.invalidate()
+        exam_scheduler.forget(exam_id)
+        return exam
 
 exam_service = ExamService()
\ No newline at end of file
@@ -0,0 +1,81 @@
+import csv
+import enum
+import io
+import json
+from datetime import datetime
+from typing import Iterator
+from fastapi import HTTPException
+from sqlalchemy import Result
+from sqlalchemy.orm import Session
+from app.core.routing import reads_from_replica
+from app.repositories.booking import booking_repository
+from app.repositories.exam import exam_repository
+
+# Righe lette dal database e scritte nella risposta per ogni blocco
+EXPORT_CHUNK_SIZE = 500
+
+class ExportFormat(str, enum.Enum):
+    CSV = "csv"
+    NDJSON = "ndjson"
+
+MEDIA_TYPES = {
+    ExportFormat.CSV: "text/csv",
+    ExportFormat.NDJSON: "application/x-ndjson",
+}
+
+def _json_default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Tipo non serializzabile: {type(value).__name__}")
+
+class ExportService:
+    @reads_from_replica
+    def export_exam_roster(self, db: Session, exam_id: int, export_format: ExportFormat) -> Iterator[str]:
+        # Verifica se l'esame esiste prima di iniziare lo streaming
+        exam = exam_repository.get(db, id=exam_id)
+        if not exam:
+            raise HTTPException(
+                status_code=404,
+                detail="Esame non trovato",
+            )
+
+        rows = booking_repository.iter_roster(db, exam_id=exam_id, chunk_size=EXPORT_CHUNK_SIZE)
+        return self._render(rows, export_format)
+
+    @reads_from_replica
+    def export_bookings(self, db: Session, export_format: ExportFormat) -> Iterator[str]:
+        rows = booking_repository.iter_roster(db, chunk_size=EXPORT_CHUNK_SIZE)
+        return self._render(rows, export_format)
+
+    def _render(self, rows: Result, export_format: ExportFormat) -> Iterator[str]:
+        if export_format == ExportFormat.CSV:
+            return self._render_csv(rows)
+        return self._render_ndjson(rows)
+
+    def _render_csv(self, rows: Result) -> Iterator[str]:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(rows.keys())
+        count = 0
+        for row in rows:
+            writer.writerow(
+                value.isoformat() if isinstance(value, datetime) else value for value in row
+            )
+            count += 1
+            if count % EXPORT_CHUNK_SIZE == 0:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate(0)
+        yield buffer.getvalue()
+
+    def _render_ndjson(self, rows: Result) -> Iterator[str]:
+        lines = []
+        for row in rows:
+            lines.append(json.dumps(row._asdict(), default=_json_default, ensure_ascii=False))
+            if len(lines) == EXPORT_CHUNK_SIZE:
+                yield "\n".join(lines) + "\n"
+                lines = []
+        if lines:
+            yield "\n".join(lines) + "\n"
+
+export_service = ExportService()
\ No newline at end of file
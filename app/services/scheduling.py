@@ -0,0 +1,267 @@
+import os
+import threading
+import time
+from bisect import bisect_left, bisect_right, insort
+from datetime import datetime, timedelta
+from typing import Collection, Dict, Hashable, Iterable, List, NamedTuple, Optional, Tuple
+from fastapi import HTTPException
+from sqlalchemy.orm import Session
+from app.core.routing import use_primary
+from app.repositories.course import course_repository
+from app.repositories.exam import exam_repository
+from app.schemas.exam import ExamCreate
+from app.schemas.session import CalendarIssue, CalendarValidation, IssueKind
+
+# Gli esami non hanno una durata: si assume che occupino aula e professore
+# per questo intervallo a partire dall'orario di inizio
+EXAM_DURATION_MINUTES = int(os.getenv("EXAM_DURATION_MINUTES", "180"))
+# Ricarica comunque l'indice dopo questo intervallo (modifiche di altri processi)
+SCHEDULE_REFRESH_SECONDS = float(os.getenv("SCHEDULE_REFRESH_SECONDS", "300"))
+
+MAX_CALENDAR_EXAMS = 500
+
+def location_key(location: str) -> str:
+    # "Aula  1" e "aula 1" sono la stessa aula
+    return " ".join(location.split()).casefold()
+
+class IntervalIndex:
+    def __init__(self, duration: timedelta, entries: Iterable[Tuple[Hashable, datetime, int]] = ()):
+        """
+        Intervalli [inizio, inizio + duration) raggruppati per chiave e ordinati
+        per inizio. Con una durata fissa due intervalli si sovrappongono se gli
+        inizi distano meno di una durata, quindi le sovrapposizioni si trovano
+        con due ricerche binarie.
+        """
+        self.duration = duration
+        self._starts: Dict[Hashable, List[Tuple[datetime, int]]] = {}
+        for key, start, item_id in entries:
+            self._starts.setdefault(key, []).append((start, item_id))
+        for starts in self._starts.values():
+            starts.sort()
+
+    def add(self, key: Hashable, start: datetime, item_id: int) -> None:
+        insort(self._starts.setdefault(key, []), (start, item_id))
+
+    def remove(self, key: Hashable, start: datetime, item_id: int) -> None:
+        starts = self._starts.get(key)
+        if not starts:
+            return
+        position = bisect_left(starts, (start, item_id))
+        if position < len(starts) and starts[position] == (start, item_id):
+            del starts[position]
+            if not starts:
+                del self._starts[key]
+
+    def overlapping(self, key: Hashable, start: datetime) -> List[int]:
+        starts = self._starts.get(key)
+        if not starts:
+            return []
+        # Esami che iniziano in (start - durata, start + durata)
+        lo = bisect_right(starts, (start - self.duration, float("inf")))
+        hi = bisect_left(starts, (start + self.duration, float("-inf")))
+        return [item_id for _, item_id in starts[lo:hi]]
+
+class Conflict(NamedTuple):
+    kind: IssueKind
+    exam_id: int
+
+class _Entry(NamedTuple):
+    location: str
+    date: datetime
+    professor_id: Optional[int]
+
+class _Snapshot:
+    def __init__(self, rows, duration: timedelta):
+        self.by_location = IntervalIndex(
+            duration, ((location_key(row.location), row.date, row.id) for row in rows)
+        )
+        self.by_professor = IntervalIndex(
+            duration, ((row.professor_id, row.date, row.id) for row in rows if row.professor_id is not None)
+        )
+        self.course_professor: Dict[int, Optional[int]] = {row.course_id: row.professor_id for row in rows}
+        # Dove è indicizzato ogni esame, per spostarlo o rimuoverlo
+        self.entries: Dict[int, _Entry] = {
+            row.id: _Entry(location_key(row.location), row.date, row.professor_id) for row in rows
+        }
+        self.loaded_at = time.monotonic()
+
+    def add(self, exam_id: int, entry: _Entry) -> None:
+        self.entries[exam_id] = entry
+        self.by_location.add(entry.location, entry.date, exam_id)
+        if entry.professor_id is not None:
+            self.by_professor.add(entry.professor_id, entry.date, exam_id)
+
+    def discard(self, exam_id: int) -> None:
+        entry = self.entries.pop(exam_id, None)
+        if entry is None:
+            return
+        self.by_location.remove(entry.location, entry.date, exam_id)
+        if entry.professor_id is not None:
+            self.by_professor.remove(entry.professor_id, entry.date, exam_id)
+
+class ExamScheduler:
+    def __init__(
+        self,
+        duration_minutes: int = EXAM_DURATION_MINUTES,
+        refresh_seconds: float = SCHEDULE_REFRESH_SECONDS,
+    ):
+        """
+        Indice in memoria degli esami attivi per aula e per professore (tramite
+        Course.professor_id), per trovare i conflitti di orario senza
+        scorrere tutti gli esami. Gli esami creati, modificati o cancellati da
+        questo processo vi vengono scritti con `record` e `forget`; va invece
+        invalidato quando cambiano i corsi. Le modifiche di altri processi
+        compaiono solo alla ricarica, fino a `refresh_seconds` dopo: nel
+        frattempo un altro worker può accettare un esame in conflitto.
+        """
+        self.duration = timedelta(minutes=duration_minutes)
+        self.refresh_seconds = refresh_seconds
+        self._snapshot: Optional[_Snapshot] = None
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def invalidate(self) -> None:
+        self._generation += 1
+        self._snapshot = None
+
+    def record(self, exam, *, professor_id: Optional[int]) -> None:
+        """
+        Aggiorna l'indice dopo la creazione o la modifica di `exam`, senza
+        ricaricarlo: l'esame viene spostato, aggiunto o tolto se non è più attivo
+        """
+        with self._lock:
+            snapshot = self._snapshot
+            if snapshot is None:
+                return
+            snapshot.discard(exam.id)
+            snapshot.course_professor[exam.course_id] = professor_id
+            if exam.is_active and exam.date >= datetime.now() - self.duration:
+                snapshot.add(exam.id, _Entry(location_key(exam.location), exam.date, professor_id))
+
+    def forget(self, exam_id: int) -> None:
+        # Esame cancellato
+        with self._lock:
+            if self._snapshot is not None:
+                self._snapshot.discard(exam_id)
+
+    def find_conflicts(
+        self,
+        db: Session,
+        *,
+        date: datetime,
+        location: str,
+        professor_id: Optional[int],
+        exclude_exam_ids: Collection[int] = (),
+    ) -> List[Conflict]:
+        snapshot = self._load(db)
+        conflicts = [
+            Conflict(IssueKind.LOCATION, exam_id)
+            for exam_id in snapshot.by_location.overlapping(location_key(location), date)
+        ]
+        if professor_id is not None:
+            conflicts.extend(
+                Conflict(IssueKind.PROFESSOR, exam_id)
+                for exam_id in snapshot.by_professor.overlapping(professor_id, date)
+            )
+        return [conflict for conflict in conflicts if conflict.exam_id not in exclude_exam_ids]
+
+    def check_exam(
+        self,
+        db: Session,
+        *,
+        date: datetime,
+        location: str,
+        professor_id: Optional[int],
+        exclude_exam_id: Optional[int] = None,
+    ) -> None:
+        conflicts = self.find_conflicts(
+            db,
+            date=date,
+            location=location,
+            professor_id=professor_id,
+            exclude_exam_ids=() if exclude_exam_id is None else (exclude_exam_id,),
+        )
+        for conflict in conflicts:
+            if conflict.kind == IssueKind.LOCATION:
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"L'aula è già occupata in quell'orario dall'esame {conflict.exam_id}",
+                )
+            raise HTTPException(
+                status_code=400,
+                detail=f"Il professore ha già l'esame {conflict.exam_id} in quell'orario",
+            )
+
+    def professor_of(self, db: Session, course_id: int) -> Optional[int]:
+        snapshot = self._load(db)
+        if course_id in snapshot.course_professor:
+            return snapshot.course_professor[course_id]
+        return course_repository.get_professor_ids(db, course_ids=[course_id]).get(course_id)
+
+    def validate_calendar(
+        self, db: Session, exams: List[ExamCreate], *, exclude_exam_ids: Collection[int] = ()
+    ) -> CalendarValidation:
+        """
+        Controlla in un solo passaggio un calendario di esami proposti, sia
+        contro gli esami già programmati sia tra loro. I professori dei
+        corsi che non hanno esami in indice vengono letti con una sola query.
+        `exclude_exam_ids` sono esami esistenti che il calendario sostituisce.
+        """
+        if len(exams) > MAX_CALENDAR_EXAMS:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Un calendario può contenere al massimo {MAX_CALENDAR_EXAMS} esami",
+            )
+        snapshot = self._load(db)
+        professors = dict(snapshot.course_professor)
+        missing = {exam.course_id for exam in exams} - professors.keys()
+        professors.update(course_repository.get_professor_ids(db, course_ids=missing))
+
+        now = datetime.now()
+        proposed_locations = IntervalIndex(self.duration)
+        proposed_professors = IntervalIndex(self.duration)
+        issues: List[CalendarIssue] = []
+        for index, exam in enumerate(exams):
+            if exam.course_id not in professors:
+                issues.append(CalendarIssue(index=index, kind=IssueKind.COURSE_NOT_FOUND))
+                continue
+            if exam.date < now:
+                issues.append(CalendarIssue(index=index, kind=IssueKind.PAST_DATE))
+            if exam.max_students <= 0:
+                issues.append(CalendarIssue(index=index, kind=IssueKind.INVALID_MAX_STUDENTS))
+            if not exam.is_active:
+                # Gli esami non attivi non occupano aula e professore
+                continue
+            professor_id = professors[exam.course_id]
+            location = location_key(exam.location)
+            conflicts = self.find_conflicts(
+                db, date=exam.date, location=exam.location, professor_id=professor_id, exclude_exam_ids=exclude_exam_ids
+            )
+            for conflict in conflicts:
+                issues.append(CalendarIssue(index=index, kind=conflict.kind, exam_id=conflict.exam_id))
+            for other in proposed_locations.overlapping(location, exam.date):
+                issues.append(CalendarIssue(index=index, kind=IssueKind.LOCATION, other_index=other))
+            proposed_locations.add(location, exam.date, index)
+            if professor_id is not None:
+                for other in proposed_professors.overlapping(professor_id, exam.date):
+                    issues.append(CalendarIssue(index=index, kind=IssueKind.PROFESSOR, other_index=other))
+                proposed_professors.add(professor_id, exam.date, index)
+        return CalendarValidation(valid=not issues, issues=issues)
+
+    def _load(self, db: Session) -> _Snapshot:
+        snapshot = self._snapshot
+        if snapshot is not None and time.monotonic() - snapshot.loaded_at < self.refresh_seconds:
+            return snapshot
+        with self._lock:
+            snapshot = self._snapshot
+            if snapshot is None or time.monotonic() - snapshot.loaded_at >= self.refresh_seconds:
+                generation = self._generation
+                # Anche gli esami appena iniziati occupano ancora aula e professore
+                with use_primary():
+                    rows = exam_repository.get_schedule_rows(db, since=datetime.now() - self.duration)
+                snapshot = _Snapshot(rows, self.duration)
+                if generation == self._generation:
+                    self._snapshot = snapshot
+            return snapshot
+
+exam_scheduler = ExamScheduler()
@@ -0,0 +1,100 @@
+from datetime import datetime, timedelta
+from typing import List
+from fastapi import HTTPException
+from sqlalchemy.orm import Session
+from app.repositories.exam import exam_repository
+from app.schemas.exam import Exam, ExamCreate
+from app.schemas.session import CalendarIssue, IssueKind, SessionCalendar, SessionResult, SessionUpdate
+from app.services.exam_catalog import exam_catalog
+from app.services.scheduling import MAX_CALENDAR_EXAMS, exam_scheduler
+
+class SessionService:
+    def create_session(self, db: Session, calendar_in: SessionCalendar) -> SessionResult:
+        """
+        Crea tutti gli esami di una sessione in una transazione, oppure nessuno:
+        se una riga non è valida restituisce gli errori di ogni riga
+        """
+        validation = exam_scheduler.validate_calendar(db, calendar_in.exams)
+        if not validation.valid:
+            return SessionResult(exams=[], issues=validation.issues)
+        
+        # Letti prima del commit, che li farebbe ricaricare uno alla volta
+        exams = [
+            Exam.model_validate(exam, from_attributes=True)
+            for exam in exam_repository.create_many(db, objs_in=calendar_in.exams, commit=False)
+        ]
+        db.commit()
+        exam_catalog.invalidate()
+        exam_scheduler.invalidate()
+        return SessionResult(exams=exams, issues=[])
+    
+    def update_session(self, db: Session, session_in: SessionUpdate) -> SessionResult:
+        """
+        Attiva o disattiva e/o sposta nel tempo un insieme di esami, tutti o
+        nessuno. Gli errori fanno riferimento alla posizione in exam_ids.
+        """
+        if session_in.is_active is None and not session_in.shift_minutes:
+            raise HTTPException(status_code=400, detail="Nessuna modifica richiesta")
+        exam_ids = list(dict.fromkeys(session_in.exam_ids))
+        if len(exam_ids) > MAX_CALENDAR_EXAMS:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Si possono modificare al massimo {MAX_CALENDAR_EXAMS} esami",
+            )
+        
+        exams = {exam.id: exam for exam in exam_repository.get_by_ids(db, ids=exam_ids)}
+        issues = [
+            CalendarIssue(index=index, kind=IssueKind.EXAM_NOT_FOUND)
+            for index, exam_id in enumerate(exam_ids)
+            if exam_id not in exams
+        ]
+        
+        shift = timedelta(minutes=session_in.shift_minutes or 0)
+        positions: List[int] = []
+        proposed: List[ExamCreate] = []
+        values = []
+        now = datetime.now()
+        for index, exam_id in enumerate(exam_ids):
+            exam = exams.get(exam_id)
+            if exam is None:
+                continue
+            is_active = exam.is_active if session_in.is_active is None else session_in.is_active
+            date = exam.date + shift
+            values.append({"id": exam.id, "date": date, "is_active": is_active, "updated_at": now})
+            # Solo gli esami che restano attivi devono avere aula e professore liberi
+            if is_active:
+                positions.append(index)
+                proposed.append(ExamCreate(
+                    course_id=exam.course_id,
+                    date=date,
+                    location=exam.location,
+                    max_students=exam.max_students,
+                    description=exam.description,
+                    is_active=True,
+                ))
+        
+        validation = exam_scheduler.validate_calendar(db, proposed, exclude_exam_ids=exam_ids)
+        issues.extend(self._remap(validation.issues, positions))
+        if issues:
+            return SessionResult(exams=[], issues=sorted(issues, key=lambda issue: issue.index))
+        
+        exam_repository.update_many(db, values=values)
+        exam_catalog.invalidate()
+        exam_scheduler.invalidate()
+        exams = [
+            Exam.model_validate(exam, from_attributes=True)
+            for exam in exam_repository.get_by_ids(db, ids=exam_ids)
+        ]
+        return SessionResult(exams=exams, issues=[])
+    
+    def _remap(self, issues: List[CalendarIssue], positions: List[int]) -> List[CalendarIssue]:
+        # Riporta gli indici del calendario validato alle posizioni in exam_ids
+        return [
+            issue.model_copy(update={
+                "index": positions[issue.index],
+                "other_index": None if issue.other_index is None else positions[issue.other_index],
+            })
+            for issue in issues
+        ]
+
+session_service = SessionService()
@@ -0,0 +1,241 @@
+import csv
+import logging
+import os
+import threading
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from fastapi import HTTPException
+from pydantic import ValidationError
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from app.core.hashing import PASSWORD_HASH_WORKERS, PasswordHasher
+from app.models.user import UserRole
+from app.repositories.user import user_repository
+from app.schemas.student_import import ImportRowError, StudentImportRun
+from app.schemas.user import UserCreate
+
+# Studenti per transazione: validati, controllati e inseriti insieme
+STUDENT_IMPORT_BATCH_SIZE = int(os.getenv("STUDENT_IMPORT_BATCH_SIZE", "500"))
+STUDENT_IMPORT_MAX_ERRORS = int(os.getenv("STUDENT_IMPORT_MAX_ERRORS", "1000"))
+# Importazioni avviate dall'API di cui resta consultabile l'avanzamento
+STUDENT_IMPORT_MAX_JOBS = int(os.getenv("STUDENT_IMPORT_MAX_JOBS", "100"))
+# Processi bcrypt riservati alle importazioni, separati da quelli dei login:
+# di default metà di PASSWORD_HASH_WORKERS (0 esegue gli hash nel thread)
+STUDENT_IMPORT_HASH_WORKERS = int(os.getenv(
+    "STUDENT_IMPORT_HASH_WORKERS", str(min(PASSWORD_HASH_WORKERS, max(1, PASSWORD_HASH_WORKERS // 2)))
+))
+
+IMPORT_COLUMNS = ("email", "first_name", "last_name", "student_id", "password")
+
+logger = logging.getLogger(__name__)
+
+Row = Tuple[int, Dict[str, str]]
+
+class StudentImportService:
+    def __init__(
+        self,
+        session_factory: Optional[Callable[[], Session]] = None,
+        hash_workers: int = STUDENT_IMPORT_HASH_WORKERS,
+    ):
+        """
+        Importazione massiva di studenti da CSV. Il file viene letto a lotti:
+        per ogni lotto i duplicati si cercano con una query sola, le password
+        sono hashate in parallelo e le righe nuove inserite con un solo INSERT
+        e un commit. Gli hash usano un pool di processi proprio, così un
+        lotto non fa attendere i login dietro migliaia di bcrypt.
+        """
+        self.session_factory = session_factory
+        self.hasher = PasswordHasher(hash_workers)
+        self._jobs: "OrderedDict[str, StudentImportRun]" = OrderedDict()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def import_csv(
+        self,
+        db: Session,
+        lines: Iterable[str],
+        *,
+        start_line: int = 2,
+        batch_size: int = STUDENT_IMPORT_BATCH_SIZE,
+        run: Optional[StudentImportRun] = None,
+        on_batch: Optional[Callable[[StudentImportRun], None]] = None,
+    ) -> StudentImportRun:
+        """
+        Importa le righe a partire da `start_line` (1 è l'intestazione).
+        Ogni lotto è una transazione: dopo un errore si riprende da
+        `run.last_line + 1`, e rielaborare righe già salvate le scarta
+        come duplicati senza crearle due volte.
+        """
+        if start_line < 2:
+            raise HTTPException(status_code=400, detail="Le righe dei dati partono dalla 2")
+        if batch_size < 1:
+            raise HTTPException(status_code=400, detail="Il lotto deve contenere almeno una riga")
+        if run is None:
+            run = StudentImportRun(start_line=start_line, last_line=start_line - 1)
+        reader = csv.DictReader(lines)
+        missing = [column for column in IMPORT_COLUMNS if column not in (reader.fieldnames or ())]
+        if missing:
+            raise HTTPException(status_code=400, detail=f"Colonne mancanti nel file: {', '.join(missing)}")
+
+        # Prima riga del file per ogni email e ID studente già visti
+        seen: Dict[str, Dict[str, int]] = {"email": {}, "student_id": {}}
+        batch: List[Row] = []
+        for row in reader:
+            if reader.line_num < start_line:
+                continue
+            batch.append((reader.line_num, row))
+            if len(batch) >= batch_size:
+                self._import_batch(db, batch, run, seen)
+                batch = []
+                if on_batch is not None:
+                    on_batch(run)
+        if batch:
+            self._import_batch(db, batch, run, seen)
+            if on_batch is not None:
+                on_batch(run)
+        run.completed = True
+        return run
+
+    def _import_batch(self, db: Session, batch: List[Row], run: StudentImportRun, seen: Dict[str, Dict[str, int]]) -> None:
+        first_error = len(run.errors)
+        students = self._validate(batch, run, seen)
+        students = self._drop_registered(db, students, run)
+        hashes = self.hasher.hash_many([student.password for _, student in students])
+        hashed = {line: hashed_password for (line, _), hashed_password in zip(students, hashes)}
+        try:
+            try:
+                self._insert(db, students, hashed)
+            except IntegrityError:
+                # Registrazioni arrivate durante il lotto: le scarta e ritenta una volta
+                db.rollback()
+                students = self._drop_registered(db, students, run)
+                self._insert(db, students, hashed)
+        except Exception:
+            db.rollback()
+            raise
+        run.errors[first_error:] = sorted(run.errors[first_error:], key=lambda error: error.line)
+        run.created += len(students)
+        run.last_line = batch[-1][0]
+        run.batches += 1
+
+    def _validate(self, batch: List[Row], run: StudentImportRun, seen: Dict[str, Dict[str, int]]) -> List[Tuple[int, UserCreate]]:
+        students = []
+        for line, row in batch:
+            values = {column: (row.get(column) or "").strip() for column in IMPORT_COLUMNS}
+            if not values["student_id"]:
+                self._reject(run, line, "ID studente mancante")
+                run.invalid += 1
+                continue
+            try:
+                student = UserCreate(role=UserRole.STUDENT, **values)
+            except ValidationError as exc:
+                error = exc.errors()[0]
+                self._reject(run, line, f"{error['loc'][0]}: {error['msg']}")
+                run.invalid += 1
+                continue
+            repeated = next(
+                (
+                    (key, seen[key][value])
+                    for key, value in (("email", student.email), ("student_id", student.student_id))
+                    if value in seen[key]
+                ),
+                None,
+            )
+            if repeated is not None:
+                key, first_line = repeated
+                label = "Email" if key == "email" else "ID studente"
+                self._reject(run, line, f"{label} già presente alla riga {first_line} del file")
+                run.duplicates += 1
+                continue
+            seen["email"][student.email] = line
+            seen["student_id"][student.student_id] = line
+            students.append((line, student))
+        return students
+
+    def _drop_registered(self, db: Session, students: List[Tuple[int, UserCreate]], run: StudentImportRun) -> List[Tuple[int, UserCreate]]:
+        emails, student_ids = user_repository.get_registered(
+            db,
+            emails=[student.email for _, student in students],
+            student_ids=[student.student_id for _, student in students],
+        )
+        if not emails and not student_ids:
+            return students
+        kept = []
+        for line, student in students:
+            if student.email in emails:
+                self._reject(run, line, "L'email è già registrata nel sistema.")
+            elif student.student_id in student_ids:
+                self._reject(run, line, "L'ID studente è già registrato nel sistema.")
+            else:
+                kept.append((line, student))
+                continue
+            run.duplicates += 1
+        return kept
+
+    def _insert(self, db: Session, students: List[Tuple[int, UserCreate]], hashed: Dict[int, str]) -> None:
+        now = datetime.now()
+        user_repository.insert_many(db, rows=[
+            {
+                "email": student.email,
+                "hashed_password": hashed[line],
+                "first_name": student.first_name,
+                "last_name": student.last_name,
+                "role": UserRole.STUDENT,
+                "student_id": student.student_id,
+                "created_at": now,
+                "updated_at": now,
+            }
+            for line, student in students
+        ])
+        db.commit()
+
+    def _reject(self, run: StudentImportRun, line: int, detail: str) -> None:
+        if len(run.errors) < STUDENT_IMPORT_MAX_ERRORS:
+            run.errors.append(ImportRowError(line=line, detail=detail))
+
+    def start_job(self, path: str, *, start_line: int = 2, batch_size: int = STUDENT_IMPORT_BATCH_SIZE) -> StudentImportRun:
+        """
+        Importa in background il file CSV in `path`, che viene cancellato alla
+        fine. Le importazioni vengono eseguite una alla volta, così non si
+        contendono il pool dei processi di hashing.
+        """
+        run = StudentImportRun(id=uuid.uuid4().hex, start_line=start_line, last_line=start_line - 1)
+        with self._lock:
+            self._jobs[run.id] = run
+            while len(self._jobs) > STUDENT_IMPORT_MAX_JOBS:
+                self._jobs.popitem(last=False)
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="student-import")
+        self._executor.submit(self._run_job, run, path, batch_size)
+        return run
+
+    def get_job(self, job_id: str) -> StudentImportRun:
+        run = self._jobs.get(job_id)
+        if run is None:
+            raise HTTPException(status_code=404, detail="Importazione non trovata")
+        return run
+
+    def _run_job(self, run: StudentImportRun, path: str, batch_size: int) -> None:
+        if self.session_factory is None:
+            from app.core.database import SessionLocal
+            self.session_factory = SessionLocal
+        db = self.session_factory()
+        try:
+            with open(path, newline="", encoding="utf-8-sig") as source:
+                self.import_csv(db, source, start_line=run.start_line, batch_size=batch_size, run=run)
+        except HTTPException as exc:
+            run.failure = exc.detail
+        except Exception as exc:
+            logger.exception("Importazione studenti %s interrotta", run.id)
+            run.failure = f"Importazione interrotta dopo la riga {run.last_line}: {exc.__class__.__name__}"
+        finally:
+            db.close()
+            os.unlink(path)
+
+    def shutdown(self) -> None:
+        self.hasher.shutdown()
+
+student_import_service = StudentImportService()
@@ -1,30 +1,28 @@
-from typing import List, Optional
+from typing import Any, List, Optional, Sequence
 from fastapi import HTTPException
+from sqlalchemy import Row
 from sqlalchemy.orm import Session
+from app.core.routing import reads_from_replica
+from app.core.principal_cache import principal_cache
+from app.repositories.base import UniqueViolation
 from app.repositories.user import user_repository
 from app.schemas.user import UserCreate, UserUpdate, User
 from app.models.user import UserRole
 
+# Messaggio per il vincolo univoco violato, per colonne del vincolo
+UNIQUE_VIOLATIONS = {
+    ("email",): "L'email è già registrata nel sistema.",
+    ("student_id",): "L'ID studente è già registrato nel sistema.",
+}
+
 class UserService:
     def create_user(self, db: Session, user_in: UserCreate) -> User:
-        # Verifica se l'email è già utilizzata
-        db_user = user_repository.get_by_email(db, email=user_in.email)
-        if db_user:
-            raise HTTPException(
-                status_code=400,
-                detail="L'email è già registrata nel sistema.",
-            )
-        
-        # Verifica se lo student_id è già utilizzato (se fornito)
-        if user_in.student_id:
-            db_student = user_repository.get_by_student_id(db, student_id=user_in.student_id)
-            if db_student:
-                raise HTTPException(
-                    status_code=400,
-                    detail="L'ID studente è già registrato nel sistema.",
-                )
-        
-        return user_repository.create(db, obj_in=user_in)
+        # Email e student_id duplicati li rifiutano i vincoli univoci
+        # (uq_users_email, uq_users_student_id)
+        try:
+            return user_repository.create(db, obj_in=user_in)
+        except UniqueViolation as exc:
+            raise _duplicate(exc)
     
     def get_user(self, db: Session, user_id: int) -> Optional[User]:
         user = user_repository.get(db, id=user_id)
@@ -32,8 +30,13 @@ class UserService:
             raise HTTPException(status_code=404, detail="Utente non trovato")
         return user
     
-    def get_users(self, db: Session, skip: int = 0, limit: int = 100) -> List[User]:
-        return user_repository.get_multi(db, skip=skip, limit=limit)
+    @reads_from_replica
+    def get_users(self, db: Session, skip: int = 0, limit: int = 100, cursor: Optional[str] = None) -> List[User]:
+        return user_repository.get_multi(db, skip=skip, limit=limit, cursor=cursor)
+    
+    @reads_from_replica
+    def get_user_rows(self, db: Session, columns: Sequence[Any], skip: int = 0, limit: int = 100, cursor: Optional[str] = None) -> List[Row]:
+        return user_repository.get_multi_rows(db, columns=columns, skip=skip, limit=limit, cursor=cursor)
     
     def update_user(self, db: Session, user_id: int, user_in: UserUpdate) -> User:
         user = user_repository.get(db, id=user_id)
@@ -58,13 +61,21 @@ class UserService:
                     detail="L'ID studente è già registrato nel sistema.",
                 )
         
-        return user_repository.update(db, db_obj=user, obj_in=user_in)
+        try:
+            user = user_repository.update(db, db_obj=user, obj_in=user_in)
+        except UniqueViolation as exc:
+            # Valore registrato da un'altra richiesta dopo i controlli
+            raise _duplicate(exc)
+        principal_cache.invalidate_user(user_id)
+        return user
     
     def delete_user(self, db: Session, user_id: int) -> User:
         user = user_repository.get(db, id=user_id)
         if not user:
             raise HTTPException(status_code=404, detail="Utente non trovato")
-        return user_repository.remove(db, id=user_id)
+        user = user_repository.remove(db, id=user_id)
+        principal_cache.invalidate_user(user_id)
+        return user
     
     def authenticate_user(self, db: Session, email: str, password: str) -> User:
         user = user_repository.authenticate(db, email=email, password=password)
@@ -74,5 +85,20 @@ class UserService:
                 detail="Email o password non corretti",
             )
         return user
+    
+    async def authenticate_user_async(self, db: Session, email: str, password: str) -> User:
+        user = await user_repository.authenticate_async(db, email=email, password=password)
+        if not user:
+            raise HTTPException(
+                status_code=401,
+                detail="Email o password non corretti",
+            )
+        return user
+
+def _duplicate(exc: UniqueViolation) -> Exception:
+    detail = UNIQUE_VIOLATIONS.get(exc.columns)
+    if detail is None:
+        return exc
+    return HTTPException(status_code=400, detail=detail)
 
-user_service = UserService()
\ No newline at end of file
+user_service = UserService()
@@ -0,0 +1,63 @@
+"""
+Posti disponibili per una pagina di esami: una richiesta per esame contro
+l'endpoint aggregato.
+
+    python -m benchmarks.bench_availability --exams 50 --rounds 50
+"""
+import argparse
+import time
+
+from app.repositories.booking import booking_repository
+from app.repositories.exam import exam_repository
+from app.services.booking_service import booking_service
+from benchmarks.common import (
+    QueryCounter,
+    latency_summary,
+    make_engine,
+    make_session_factory,
+    print_report,
+    seed,
+)
+
+def per_exam(db, exam_ids):
+    result = []
+    for exam_id in exam_ids:
+        exam = exam_repository.get(db, id=exam_id)
+        count = booking_repository.count_by_exam_id(db, exam_id=exam_id)
+        result.append((exam_id, exam.max_students - count))
+    return result
+
+def batch(db, exam_ids):
+    return booking_service.get_availability(db, exam_ids=exam_ids)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--exams", type=int, default=50)
+    parser.add_argument("--bookings-per-exam", type=int, default=200)
+    parser.add_argument("--rounds", type=int, default=50)
+    args = parser.parse_args()
+
+    engine = make_engine(":tmp:")
+    ids = seed(engine, courses=1, exams_per_course=args.exams, students=args.bookings_per_exam,
+               max_students=args.bookings_per_exam * 2, bookings_per_exam=args.bookings_per_exam)
+    session_factory = make_session_factory(engine)
+
+    results = {}
+    for name, fn in (("per_exam", per_exam), ("batch", batch)):
+        latencies = []
+        with QueryCounter(engine) as counter:
+            for _ in range(args.rounds):
+                db = session_factory()
+                start = time.perf_counter()
+                fn(db, ids["exam_ids"])
+                latencies.append(time.perf_counter() - start)
+                db.close()
+        results[name] = {
+            "exams_per_request": args.exams,
+            "queries_per_request": counter.queries / args.rounds,
+            **latency_summary(latencies),
+        }
+    print_report("Disponibilità posti", results)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,173 @@
+"""
+Stream SSE dei posti disponibili: apre molte connessioni inattive contro un
+server uvicorn nello stesso processo, poi esegue una raffica di prenotazioni
+sullo stesso esame. Riporta memoria per connessione, letture dal database,
+eventi ricevuti per connessione (uno solo se la raffica viene accorpata) e
+latenza di consegna.
+
+    python -m benchmarks.bench_availability_stream --connections 2000 --burst 50
+"""
+import argparse
+import asyncio
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import uvicorn
+
+from app.core.database import get_db
+from app.core.rate_limit import rate_limiters
+from app.core.security import create_access_token
+from app.main import app
+from app.schemas.booking import BookingCreate
+from app.services.booking_service import availability_updates, booking_service
+from benchmarks.common import latency_summary, make_engine, make_session_factory, print_report, seed
+
+EVENT_MARKER = b"event: availability"
+
+def rss_kb() -> int:
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") // 1024
+
+def start_server() -> uvicorn.Server:
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=0, lifespan="off", log_level="warning"))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.01)
+    return server
+
+class Stream:
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.reader = reader
+        self.writer = writer
+        self.buffer = b""
+
+    @classmethod
+    async def open(cls, port: int, token: str, exam_ids) -> "Stream":
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        query = "&".join(f"exam_ids={exam_id}" for exam_id in exam_ids)
+        writer.write(
+            f"GET /api/availability/stream?{query} HTTP/1.1\r\nHost: bench\r\n"
+            f"Authorization: Bearer {token}\r\n\r\n".encode()
+        )
+        await writer.drain()
+        return cls(reader, writer)
+
+    async def events(self, count: int) -> None:
+        # Attende `count` eventi oltre a quelli già contati
+        target = self.buffer.count(EVENT_MARKER) + count
+        while self.buffer.count(EVENT_MARKER) < target:
+            chunk = await self.reader.read(65536)
+            if not chunk:
+                raise ConnectionError("stream chiuso")
+            self.buffer += chunk
+
+    async def drain_for(self, seconds: float) -> int:
+        # Eventi arrivati entro `seconds`
+        before = self.buffer.count(EVENT_MARKER)
+        try:
+            while True:
+                self.buffer += await asyncio.wait_for(self.reader.read(65536), seconds)
+        except asyncio.TimeoutError:
+            pass
+        return self.buffer.count(EVENT_MARKER) - before
+
+async def run(args, port, tokens, exam_ids, book) -> dict:
+    rss_before = rss_kb()
+    # Connessioni aperte a ondate: ogni apertura legge l'utente con una sessione
+    # del pool, come una riconnessione di massa dopo un riavvio
+    semaphore = asyncio.Semaphore(args.connect_concurrency)
+
+    async def connect(token):
+        async with semaphore:
+            stream = await Stream.open(port, token, exam_ids)
+            await stream.events(len(exam_ids))
+            return stream
+
+    start = time.perf_counter()
+    streams = await asyncio.gather(*(connect(token) for token in tokens))
+    connect_s = time.perf_counter() - start
+    await asyncio.sleep(1)
+    rss_idle = rss_kb()
+
+    burst_start = time.perf_counter()
+    await asyncio.get_running_loop().run_in_executor(None, book)
+    burst_end = time.perf_counter()
+
+    async def receive(stream):
+        await stream.events(1)
+        return time.perf_counter() - burst_end
+
+    latencies = await asyncio.gather(*(receive(stream) for stream in streams))
+    extra = await asyncio.gather(*(stream.drain_for(availability_updates.interval * 2) for stream in streams))
+    for stream in streams:
+        stream.writer.close()
+    return {
+        "connections": len(streams),
+        "connect_s": round(connect_s, 2),
+        "rss_per_connection_kb": round((rss_idle - rss_before) / len(streams), 1),
+        "burst_bookings": args.burst,
+        "burst_s": round(burst_end - burst_start, 3),
+        "events_per_connection": 1 + sum(extra) / len(streams),
+        "delivery": latency_summary(latencies),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--connections", type=int, default=1000)
+    parser.add_argument("--exams", type=int, default=3, help="esami seguiti da ogni connessione")
+    parser.add_argument("--burst", type=int, default=50, help="prenotazioni nella raffica")
+    parser.add_argument("--connect-concurrency", type=int, default=10)
+    args = parser.parse_args()
+
+    engine = make_engine(":tmp:")
+    ids = seed(engine, courses=1, exams_per_course=args.exams, students=max(args.connections, args.burst),
+               max_students=args.burst * 2)
+    session_factory = make_session_factory(engine)
+
+    def bench_db():
+        db = session_factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    loads = []
+
+    def load(exam_ids):
+        loads.append(len(exam_ids))
+        db = session_factory()
+        try:
+            return {row.exam_id: row for row in booking_service.get_availability(db, exam_ids=exam_ids)}
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = bench_db
+    availability_updates.loader = load
+    for limiter in rate_limiters:
+        limiter.enabled = False
+
+    def book():
+        def one(student_id):
+            db = session_factory()
+            try:
+                booking_service.create_booking(db, BookingCreate(student_id=student_id, exam_id=ids["exam_ids"][0]))
+            finally:
+                db.close()
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            list(pool.map(one, ids["student_ids"][:args.burst]))
+
+    tokens = [create_access_token(student_id) for student_id in ids["student_ids"][:args.connections]]
+    server = start_server()
+    port = server.servers[0].sockets[0].getsockname()[1]
+    results = asyncio.run(run(args, port, tokens, ids["exam_ids"], book))
+    results["published"] = availability_updates.published
+    results["availability_reads"] = len(loads)
+    server.should_exit = True
+    print_report("Stream disponibilità", results)
+
+if __name__ == "__main__":
+    main()
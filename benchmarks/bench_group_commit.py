@@ -0,0 +1,91 @@
+"""
+Confronto tra la scrittura per riga delle prenotazioni e la scrittura a gruppi.
+
+    python -m benchmarks.bench_group_commit --students 2000 --threads 32
+"""
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+from fastapi import HTTPException
+
+from app.schemas.booking import BookingCreate
+from app.services.booking_service import booking_service
+from app.services.booking_writer import booking_writer
+from benchmarks.common import (
+    QueryCounter,
+    latency_summary,
+    make_engine,
+    make_session_factory,
+    print_report,
+    seed,
+)
+
+def run(session_factory, engine, student_ids, exam_ids, threads):
+    latencies = []
+    rejected = 0
+
+    def book(student_id):
+        exam_id = exam_ids[student_id % len(exam_ids)]
+        db = session_factory()
+        start = time.perf_counter()
+        try:
+            booking_service.create_booking(
+                db, BookingCreate(student_id=student_id, exam_id=exam_id)
+            )
+            return time.perf_counter() - start, False
+        except HTTPException:
+            return time.perf_counter() - start, True
+        finally:
+            db.close()
+
+    with QueryCounter(engine) as counter:
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=threads) as pool:
+            for latency, was_rejected in pool.map(book, student_ids):
+                latencies.append(latency)
+                rejected += was_rejected
+        elapsed = time.perf_counter() - start
+
+    return {
+        "requests": len(student_ids),
+        "rejected": rejected,
+        "elapsed_s": round(elapsed, 3),
+        "requests_per_s": round(len(student_ids) / elapsed, 1),
+        "commits": counter.commits,
+        "commits_per_s": round(counter.commits / elapsed, 1),
+        **latency_summary(latencies),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--students", type=int, default=2000)
+    parser.add_argument("--exams", type=int, default=5)
+    parser.add_argument("--threads", type=int, default=32)
+    parser.add_argument("--batch", type=int, default=64)
+    parser.add_argument("--delay-ms", type=float, default=5)
+    args = parser.parse_args()
+
+    # La capacità lascia fuori circa il 10% delle richieste (esami pieni)
+    capacity = int(args.students / args.exams * 0.9)
+    results = {}
+    for mode in ("per_row", "group_commit"):
+        engine = make_engine(":tmp:")
+        ids = seed(engine, courses=1, exams_per_course=args.exams,
+                   students=args.students, max_students=capacity)
+        session_factory = make_session_factory(engine)
+        if mode == "group_commit":
+            booking_writer.session_factory = session_factory
+            booking_writer.max_batch_size = args.batch
+            booking_writer.max_delay = args.delay_ms / 1000
+            booking_writer.start()
+        try:
+            results[mode] = run(
+                session_factory, engine, ids["student_ids"], ids["exam_ids"], args.threads
+            )
+        finally:
+            booking_writer.stop()
+            engine.dispose()
+    print_report("Prenotazioni: per riga vs scrittura a gruppi", results)
+
+if __name__ == "__main__":
+    main()
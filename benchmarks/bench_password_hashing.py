@@ -0,0 +1,53 @@
+"""
+Verifiche bcrypt al secondo: thread pool di default contro pool di processi.
+
+    python -m benchmarks.bench_password_hashing --logins 200 --workers 4
+"""
+import argparse
+import asyncio
+import os
+import time
+
+from app.core.hashing import PasswordHasher
+from benchmarks.common import SEED_PASSWORD, SEED_PASSWORD_HASH, print_report
+
+async def run(hasher: PasswordHasher, logins: int, concurrency: int) -> float:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def login():
+        async with semaphore:
+            assert await hasher.verify_async(SEED_PASSWORD, SEED_PASSWORD_HASH)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(login() for _ in range(logins)))
+    return time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--concurrency", type=int, default=64)
+    args = parser.parse_args()
+
+    results = {}
+    for mode, workers in (("thread_pool", 0), ("process_pool", args.workers)):
+        hasher = PasswordHasher(workers=workers)
+        if workers:
+            # Avvia i processi prima della misura
+            hasher.verify(SEED_PASSWORD, SEED_PASSWORD_HASH)
+        try:
+            elapsed = asyncio.run(run(hasher, args.logins, args.concurrency))
+        finally:
+            hasher.shutdown()
+        cores = max(workers, 1)
+        results[mode] = {
+            "workers": workers,
+            "logins": args.logins,
+            "elapsed_s": round(elapsed, 3),
+            "logins_per_s": round(args.logins / elapsed, 1),
+            "logins_per_s_per_core": round(args.logins / elapsed / cores, 1),
+        }
+    print_report("Verifica password bcrypt", results)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Costo del rate limiter: acquire() da solo, con molte chiavi attive, e
+latenza di GET /api/availability con i limiti attivi e disattivati.
+
+    python -m benchmarks.bench_rate_limit --keys 10000 --requests 2000
+"""
+import argparse
+import time
+
+from fastapi.testclient import TestClient
+
+from app.core.database import get_db
+from app.core.rate_limit import TokenBucketLimiter, rate_limiters
+from app.core.security import create_access_token
+from app.main import app
+from benchmarks.common import latency_summary, make_engine, make_session_factory, print_report, seed
+
+def bench_acquire(keys: int, calls: int) -> dict:
+    # Capacità alta: si misura il percorso delle richieste ammesse
+    limiter = TokenBucketLimiter("bench", f"{calls}/60", max_keys=keys)
+    start = time.perf_counter()
+    for n in range(calls):
+        limiter.acquire(n % keys)
+    elapsed = time.perf_counter() - start
+    return {"calls": calls, "active_keys": len(limiter._buckets), "ns_per_call": round(elapsed / calls * 1e9)}
+
+def bench_endpoint(client, headers, exam_ids, requests: int, enabled: bool) -> dict:
+    for limiter in rate_limiters:
+        limiter.enabled = enabled
+        limiter.capacity = requests * 2
+    latencies = []
+    for _ in range(requests):
+        start = time.perf_counter()
+        response = client.get("/api/availability/", params={"exam_ids": exam_ids}, headers=headers)
+        latencies.append(time.perf_counter() - start)
+        assert response.status_code == 200, response.text
+    return latency_summary(latencies)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--keys", type=int, default=10000)
+    parser.add_argument("--calls", type=int, default=200000)
+    parser.add_argument("--requests", type=int, default=2000)
+    args = parser.parse_args()
+
+    engine = make_engine(None)
+    ids = seed(engine, courses=2, exams_per_course=5, students=10)
+    session_factory = make_session_factory(engine)
+
+    def bench_db():
+        db = session_factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = bench_db
+    headers = {"Authorization": f"Bearer {create_access_token(ids['student_ids'][0])}"}
+    results = {"acquire": bench_acquire(args.keys, args.calls)}
+    with TestClient(app) as client:
+        # Riscaldamento: cache dell'utente autenticato e connessioni
+        bench_endpoint(client, headers, ids["exam_ids"], 50, enabled=False)
+        disabled = bench_endpoint(client, headers, ids["exam_ids"], args.requests, enabled=False)
+        enabled = bench_endpoint(client, headers, ids["exam_ids"], args.requests, enabled=True)
+    results["availability_disabled"] = disabled
+    results["availability_enabled"] = enabled
+    results["overhead_p50_ms"] = round(enabled["p50_ms"] - disabled["p50_ms"], 3)
+    print_report("Rate limiting", results)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+"""
+Instradamento letture/scritture con una replica simulata: due file SQLite,
+il secondo copiato dal primo ogni `--lag` secondi con l'API di backup di
+SQLite. Gli studenti prenotano e subito dopo rileggono le proprie
+prenotazioni, mentre altri thread leggono elenchi iscritti e posti.
+Riporta le query servite da ciascun database e le letture che non vedono la
+prenotazione appena fatta, con e senza la finestra read-your-writes.
+
+    python -m benchmarks.bench_replica --students 200 --lag 0.5
+"""
+import argparse
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.routing import RoutingSession, bind_user, recent_writers
+from app.schemas.booking import BookingCreate
+from app.services.booking_service import booking_service
+from benchmarks.common import QueryCounter, latency_summary, make_engine, print_report, seed
+
+class ReplicaSync(threading.Thread):
+    def __init__(self, primary_path: str, replica_path: str, lag: float):
+        """
+        Copia periodicamente il primario sulla replica: ogni lettura dalla
+        replica vede lo stato di al più `lag` secondi prima
+        """
+        super().__init__(daemon=True)
+        self.primary_path = primary_path
+        self.replica_path = replica_path
+        self.lag = lag
+        self._stopped = threading.Event()
+
+    def sync(self) -> None:
+        source = sqlite3.connect(self.primary_path, timeout=30)
+        target = sqlite3.connect(self.replica_path, timeout=30)
+        try:
+            source.backup(target)
+        finally:
+            source.close()
+            target.close()
+
+    def run(self) -> None:
+        while not self._stopped.wait(self.lag):
+            self.sync()
+
+    def stop(self) -> None:
+        self._stopped.set()
+        self.join()
+
+def student_requests(session_factory, student_id: int, exam_id: int) -> bool:
+    # Due richieste distinte, ognuna con la propria sessione come in get_db
+    db = session_factory()
+    try:
+        bind_user(db, student_id)
+        booking_service.create_booking(db, BookingCreate(student_id=student_id, exam_id=exam_id))
+    finally:
+        db.close()
+    db = session_factory()
+    try:
+        bind_user(db, student_id)
+        bookings = booking_service.get_bookings_by_student(db, student_id)
+        return any(booking.exam_id == exam_id for booking in bookings)
+    finally:
+        db.close()
+
+def roster_reads(session_factory, exam_ids, stop: threading.Event, latencies) -> None:
+    while not stop.is_set():
+        for exam_id in exam_ids:
+            db = session_factory()
+            start = time.perf_counter()
+            try:
+                booking_service.get_bookings_by_exam(db, exam_id, limit=500)
+                booking_service.get_availability(db, exam_ids=exam_ids)
+            finally:
+                db.close()
+            latencies.append(time.perf_counter() - start)
+
+def run(session_factory, engines, students, exam_ids, threads: int, readers: int) -> Dict:
+    stop = threading.Event()
+    latencies = []
+    counters = [QueryCounter(bound) for bound in engines]
+    for counter in counters:
+        counter.__enter__()
+    try:
+        reader_threads = [
+            threading.Thread(target=roster_reads, args=(session_factory, exam_ids, stop, latencies))
+            for _ in range(readers)
+        ]
+        for thread in reader_threads:
+            thread.start()
+        with ThreadPoolExecutor(max_workers=threads) as pool:
+            seen = list(pool.map(
+                lambda n: student_requests(session_factory, students[n], exam_ids[n % len(exam_ids)]),
+                range(len(students)),
+            ))
+        stop.set()
+        for thread in reader_threads:
+            thread.join()
+    finally:
+        for counter in counters:
+            counter.__exit__()
+    return {
+        "bookings": len(students),
+        "stale_own_reads": seen.count(False),
+        "primary_queries": counters[0].queries,
+        "replica_queries": counters[1].queries,
+        "roster_reads": latency_summary(latencies),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--students", type=int, default=200)
+    parser.add_argument("--exams", type=int, default=10)
+    parser.add_argument("--lag", type=float, default=0.5, help="secondi tra due copie sulla replica")
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--readers", type=int, default=4)
+    args = parser.parse_args()
+
+    fd, primary_path = tempfile.mkstemp(suffix=".db", prefix="bench-primary-")
+    os.close(fd)
+    fd, replica_path = tempfile.mkstemp(suffix=".db", prefix="bench-replica-")
+    os.close(fd)
+    primary = make_engine(primary_path)
+    ids = seed(primary, courses=1, exams_per_course=args.exams, students=args.students * 2,
+               max_students=args.students * 2)
+    replica_sync = ReplicaSync(primary_path, replica_path, args.lag)
+    replica_sync.sync()
+    replica = create_engine(f"sqlite:///{replica_path}", connect_args={"check_same_thread": False, "timeout": 30})
+    session_factory = sessionmaker(class_=RoutingSession, bind=primary, replica=replica, autocommit=False, autoflush=False)
+
+    replica_sync.start()
+    results = {}
+    halves = (ids["student_ids"][:args.students], ids["student_ids"][args.students:])
+    for (name, window), students in zip((("read_your_writes", args.lag * 4), ("no_stickiness", 0.0)), halves):
+        recent_writers.window = window
+        results[name] = run(session_factory, (primary, replica), students, ids["exam_ids"], args.threads, args.readers)
+    replica_sync.stop()
+    print_report("Replica di lettura", results)
+
+if __name__ == "__main__":
+    main()
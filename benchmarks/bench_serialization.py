@@ -0,0 +1,87 @@
+"""
+Serializzazione delle liste: oggetti ORM validati dagli schemi Pydantic e
+passati a jsonable_encoder (il percorso di default di FastAPI) contro tuple
+di colonne serializzate da RowSerializer.
+
+    python -m benchmarks.bench_serialization --rows 100 --rounds 200
+"""
+import argparse
+import json
+import time
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from app.core.serialization import RowSerializer
+from app.models.booking import Booking as BookingModel
+from app.models.course import Course as CourseModel
+from app.models.exam import Exam as ExamModel
+from app.models.user import User as UserModel
+from app.repositories.booking import booking_repository
+from app.repositories.course import course_repository
+from app.repositories.exam import exam_repository
+from app.repositories.user import user_repository
+from app.schemas.booking import Booking
+from app.schemas.course import Course
+from app.schemas.exam import Exam
+from app.schemas.user import User
+from benchmarks.common import make_engine, make_session_factory, print_report, seed
+
+ENTITIES = (
+    ("users", User, UserModel, user_repository),
+    ("courses", Course, CourseModel, course_repository),
+    ("exams", Exam, ExamModel, exam_repository),
+    ("bookings", Booking, BookingModel, booking_repository),
+)
+
+def orm_path(db, schema, repository, limit):
+    items = repository.get_multi(db, limit=limit)
+    content = jsonable_encoder([schema.model_validate(item, from_attributes=True) for item in items])
+    return JSONResponse(content).body
+
+def fast_path(db, serializer, repository, limit):
+    rows = repository.get_multi_rows(db, columns=serializer.columns, limit=limit)
+    return serializer.render(rows)
+
+def measure(session_factory, fn, rounds):
+    total = 0.0
+    rows = 0
+    for _ in range(rounds):
+        db = session_factory()
+        start = time.perf_counter()
+        body = fn(db)
+        total += time.perf_counter() - start
+        rows += len(json.loads(body))
+        db.close()
+    return body, rows / total
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=100)
+    parser.add_argument("--rounds", type=int, default=200)
+    args = parser.parse_args()
+
+    engine = make_engine()
+    seed(engine, courses=args.rows, exams_per_course=1, students=args.rows, bookings_per_exam=1)
+    session_factory = make_session_factory(engine)
+
+    results = {}
+    for name, schema, model, repository in ENTITIES:
+        serializer = RowSerializer(schema, model)
+        orm_body, orm_rate = measure(
+            session_factory, lambda db: orm_path(db, schema, repository, args.rows), args.rounds
+        )
+        fast_body, fast_rate = measure(
+            session_factory, lambda db: fast_path(db, serializer, repository, args.rows), args.rounds
+        )
+        results[name] = {
+            "rows_per_request": len(json.loads(fast_body)),
+            "orm_rows_per_sec": round(orm_rate),
+            "fast_rows_per_sec": round(fast_rate),
+            "speedup": round(fast_rate / orm_rate, 2),
+            "same_output": json.loads(orm_body) == json.loads(fast_body),
+        }
+    print_report("Serializzazione liste", results)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,265 @@
+"""
+Apertura delle iscrizioni: ogni studente simulato fa login, controlla più
+volte i posti disponibili e prova a prenotare un esame, tutti insieme contro
+l'app FastAPI nello stesso processo. Riporta throughput, latenze per
+endpoint, query eseguite e violazioni (esami oltre capienza, prenotazioni
+doppie, contatori dei posti disallineati).
+
+    python -m benchmarks.bench_stampede --students 300 --threads 32
+    python -m benchmarks.bench_stampede --database memory
+    python -m benchmarks.bench_stampede --save-baseline baseline.json
+    python -m benchmarks.bench_stampede --baseline baseline.json
+
+Con --database memory il file sta in /dev/shm: i thread del benchmark non
+possono condividere l'unica connessione del database in memoria.
+"""
+import argparse
+import json
+import random
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
+from typing import Dict, List
+
+from fastapi.testclient import TestClient
+from sqlalchemy import func, select
+
+from app.core.database import get_db
+from app.core.database_async import ASYNC_DB_ENABLED, get_async_db
+from app.main import app
+from app.models.booking import Booking
+from app.models.exam import Exam
+from app.models.exam_seat import ExamSeat
+from app.core.rate_limit import rate_limiters
+from app.services.booking_writer import booking_writer
+from benchmarks.common import (
+    SEED_PASSWORD,
+    QueryCounter,
+    latency_summary,
+    make_engine,
+    make_session_factory,
+    print_report,
+    seed,
+)
+
+# Variazioni oltre questa soglia vengono segnalate nel confronto con la baseline
+REGRESSION_THRESHOLD = 0.2
+
+class Recorder:
+    """
+    Latenze ed esiti per endpoint, condivisi dai thread dei client
+    """
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.statuses: Dict[str, Dict[int, int]] = defaultdict(lambda: defaultdict(int))
+        self._lock = threading.Lock()
+
+    def call(self, name: str, fn, *args, **kwargs):
+        start = time.perf_counter()
+        response = fn(*args, **kwargs)
+        elapsed = time.perf_counter() - start
+        with self._lock:
+            self.latencies[name].append(elapsed)
+            self.statuses[name][response.status_code] += 1
+        return response
+
+def override_databases(engine, session_factory) -> List:
+    """
+    L'app usa il database del benchmark al posto di quello configurato.
+    Restituisce gli engine da cui contare le query.
+    """
+    def bench_db():
+        db = session_factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = bench_db
+    booking_writer.session_factory = session_factory
+    # Tutti i client simulati hanno lo stesso indirizzo: i limiti si misurano
+    # con bench_rate_limit, qui si misura il sistema senza
+    for limiter in rate_limiters:
+        limiter.enabled = False
+    if ASYNC_DB_ENABLED:
+        from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+        from app.core.database_async import async_url
+
+        async_engine = create_async_engine(async_url(engine.url))
+        async_sessions = async_sessionmaker(async_engine, expire_on_commit=False)
+
+        async def bench_async_db():
+            async with async_sessions() as db:
+                yield db
+
+        app.dependency_overrides[get_async_db] = bench_async_db
+        return [engine, async_engine.sync_engine]
+    return [engine]
+
+def student_session(client, recorder, student_id, email, exam_ids, polls, rng):
+    login = None
+    for _ in range(5):
+        login = recorder.call(
+            "POST /auth/login", client.post, "/api/auth/login",
+            data={"username": email, "password": SEED_PASSWORD},
+        )
+        if login.status_code != 503:
+            break
+        time.sleep(float(login.headers.get("Retry-After", "1")))
+    if login.status_code != 200:
+        return
+    headers = {"Authorization": f"Bearer {login.json()['access_token']}"}
+    for _ in range(polls):
+        recorder.call(
+            "GET /availability", client.get, "/api/availability/",
+            params={"exam_ids": exam_ids}, headers=headers,
+        )
+    recorder.call(
+        "POST /bookings", client.post, "/api/bookings/",
+        json={"student_id": student_id, "exam_id": rng.choice(exam_ids)}, headers=headers,
+    )
+
+def check_violations(session_factory) -> Dict[str, int]:
+    db = session_factory()
+    try:
+        confirmed = (
+            select(Booking.exam_id, func.count(Booking.id).label("booked"))
+            .where(Booking.confirmed == True)
+            .group_by(Booking.exam_id)
+            .subquery()
+        )
+        overbooked = db.execute(
+            select(func.count()).select_from(Exam).join(confirmed, confirmed.c.exam_id == Exam.id)
+            .where(confirmed.c.booked > Exam.max_students)
+        ).scalar_one()
+        duplicates = db.execute(
+            select(func.count()).select_from(
+                select(Booking.student_id, Booking.exam_id)
+                .group_by(Booking.student_id, Booking.exam_id)
+                .having(func.count(Booking.id) > 1)
+                .subquery()
+            )
+        ).scalar_one()
+        drifted = db.execute(
+            select(func.count()).select_from(ExamSeat)
+            .outerjoin(confirmed, confirmed.c.exam_id == ExamSeat.exam_id)
+            .where(ExamSeat.booked != func.coalesce(confirmed.c.booked, 0))
+        ).scalar_one()
+        bookings = db.execute(select(func.count(Booking.id))).scalar_one()
+    finally:
+        db.close()
+    return {
+        "bookings": bookings,
+        "overbooked_exams": overbooked,
+        "duplicate_bookings": duplicates,
+        "seat_counter_drift": drifted,
+    }
+
+def compare(results: Dict, baseline: Dict) -> List[str]:
+    """
+    Differenze rispetto alla baseline: latenze e query in aumento,
+    throughput in calo, qualsiasi violazione nuova
+    """
+    lines = []
+
+    def check(label, current, previous, higher_is_worse=True):
+        if not previous:
+            return
+        change = (current - previous) / previous
+        worse = change > REGRESSION_THRESHOLD if higher_is_worse else change < -REGRESSION_THRESHOLD
+        lines.append(f"{'REGRESSION' if worse else 'ok':10} {label}: {previous} -> {current} ({change:+.0%})")
+
+    for endpoint, stats in results["endpoints"].items():
+        previous = baseline.get("endpoints", {}).get(endpoint)
+        if previous is None:
+            continue
+        for key in ("p50_ms", "p95_ms", "p99_ms"):
+            check(f"{endpoint} {key}", stats[key], previous[key])
+        check(f"{endpoint} requests_per_sec", stats["requests_per_sec"], previous["requests_per_sec"], higher_is_worse=False)
+    check("queries_per_request", results["queries_per_request"], baseline.get("queries_per_request"))
+    for key in ("overbooked_exams", "duplicate_bookings", "seat_counter_drift"):
+        if results["violations"][key] > baseline.get("violations", {}).get(key, 0):
+            lines.append(f"REGRESSION {key}: {results['violations'][key]}")
+    return lines
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database", choices=("memory", "file"), default="file")
+    parser.add_argument("--path", help="file SQLite da usare (default: file temporaneo)")
+    parser.add_argument("--courses", type=int, default=5)
+    parser.add_argument("--exams-per-course", type=int, default=2)
+    parser.add_argument("--students", type=int, default=200)
+    parser.add_argument("--max-students", type=int, default=15)
+    parser.add_argument("--polls", type=int, default=3, help="controlli dei posti per studente")
+    parser.add_argument("--threads", type=int, default=32)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--save-baseline", help="salva i risultati come baseline JSON")
+    parser.add_argument("--baseline", help="confronta i risultati con una baseline JSON")
+    args = parser.parse_args()
+
+    engine = make_engine(":shm:" if args.database == "memory" else (args.path or ":tmp:"))
+    ids = seed(
+        engine,
+        courses=args.courses,
+        exams_per_course=args.exams_per_course,
+        students=args.students,
+        max_students=args.max_students,
+    )
+    session_factory = make_session_factory(engine)
+    engines = override_databases(engine, session_factory)
+
+    rng = random.Random(args.seed)
+    # Tutti gli studenti puntano agli esami dello stesso corso
+    exam_ids = ids["exam_ids"][:args.exams_per_course]
+    students = [(student_id, f"student{n}@example.com") for n, student_id in enumerate(ids["student_ids"])]
+    recorder = Recorder()
+
+    with TestClient(app) as client, ExitStack() as stack:
+        counters = [stack.enter_context(QueryCounter(bound)) for bound in engines]
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.threads) as pool:
+            for future in [
+                pool.submit(
+                    student_session, client, recorder, student_id, email, exam_ids, args.polls,
+                    random.Random(rng.random()),
+                )
+                for student_id, email in students
+            ]:
+                future.result()
+        elapsed = time.perf_counter() - start
+
+    requests = sum(len(values) for values in recorder.latencies.values())
+    queries = sum(counter.queries for counter in counters)
+    results = {
+        "config": {key: value for key, value in vars(args).items() if key not in ("save_baseline", "baseline")},
+        "async_db": ASYNC_DB_ENABLED,
+        "elapsed_s": round(elapsed, 3),
+        "requests": requests,
+        "requests_per_sec": round(requests / elapsed, 1),
+        "queries": queries,
+        "commits": sum(counter.commits for counter in counters),
+        "queries_per_request": round(queries / requests, 2) if requests else 0,
+        "endpoints": {
+            name: {
+                **latency_summary(values),
+                "requests_per_sec": round(len(values) / elapsed, 1),
+                "statuses": dict(recorder.statuses[name]),
+            }
+            for name, values in recorder.latencies.items()
+        },
+        "violations": check_violations(session_factory),
+    }
+    print_report("Apertura iscrizioni", results)
+
+    if args.save_baseline:
+        with open(args.save_baseline, "w") as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+    if args.baseline:
+        with open(args.baseline) as f:
+            lines = compare(results, json.load(f))
+        print("\n".join(lines))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+Avvio a freddo di un worker: tempo di import di app.main, tempo fino alla
+prima risposta e memoria residente massima, ognuno misurato in un processo
+Python nuovo. Confronta lo schema creato all'avvio (DB_INIT_ON_STARTUP=1)
+con lo schema già creato da `python -m app.cli init-db`.
+
+    python -m benchmarks.bench_startup --runs 5
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+from benchmarks.common import print_report
+
+CHILD = """
+import json, resource, time
+start = time.perf_counter()
+import app.main
+imported = time.perf_counter()
+from fastapi.testclient import TestClient
+with TestClient(app.main.app) as client:
+    client.get("/")
+    first_response = time.perf_counter()
+print(json.dumps({
+    "import_s": imported - start,
+    "first_request_s": first_response - start,
+    "max_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+}))
+"""
+
+def run_child(env) -> dict:
+    output = subprocess.run(
+        [sys.executable, "-W", "ignore", "-c", CHILD],
+        env=env, check=True, capture_output=True, text=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+def summarize(samples) -> dict:
+    def median(values):
+        ordered = sorted(values)
+        return ordered[len(ordered) // 2]
+
+    return {
+        "runs": len(samples),
+        "import_ms": round(median([s["import_s"] for s in samples]) * 1000, 1),
+        "first_request_ms": round(median([s["first_request_s"] for s in samples]) * 1000, 1),
+        "max_rss_mb": round(median([s["max_rss_kb"] for s in samples]) / 1024, 1),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    env = dict(os.environ, PYTHONWARNINGS="ignore")
+    subprocess.run([sys.executable, "-m", "app.cli", "init-db"], env=env, check=True, capture_output=True)
+
+    results = {}
+    for name, init_on_startup in (("init_on_startup", "1"), ("schema_from_cli", "0")):
+        child_env = dict(env, DB_INIT_ON_STARTUP=init_on_startup)
+        results[name] = summarize([run_child(child_env) for _ in range(args.runs)])
+    print_report("Avvio a freddo", results)
+
+if __name__ == "__main__":
+    main()
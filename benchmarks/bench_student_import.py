@@ -0,0 +1,99 @@
+"""
+Registrazione degli studenti uno alla volta (come /auth/register) contro
+l'importazione a lotti da CSV. Metà delle righe del file è già registrata,
+così entrambi i percorsi pagano anche il controllo dei duplicati. Gli hash
+bcrypt usano PASSWORD_HASH_WORKERS processi per le registrazioni e
+STUDENT_IMPORT_HASH_WORKERS per l'importazione.
+
+    PASSWORD_HASH_WORKERS=8 STUDENT_IMPORT_HASH_WORKERS=4 python -m benchmarks.bench_student_import --students 400
+"""
+import argparse
+import io
+import time
+from fastapi import HTTPException
+
+from app.core.hashing import password_hasher
+from app.models.user import UserRole
+from app.schemas.user import UserCreate
+from app.services.student_import_service import student_import_service
+from app.services.user_service import user_service
+from benchmarks.common import QueryCounter, make_engine, make_session_factory, print_report, seed
+
+def students_csv(prefix: str, count: int, existing: int) -> str:
+    # Le prime `existing` righe sono studenti già creati da seed
+    lines = ["email,first_name,last_name,student_id,password"]
+    for n in range(count):
+        if n < existing:
+            lines.append(f"student{n}@example.com,Student,{n},S{n:07d},password")
+        else:
+            lines.append(f"{prefix}{n}@example.com,Bench,{n},{prefix}{n:06d},password")
+    return "\n".join(lines) + "\n"
+
+def per_row(session_factory, engine, text: str):
+    created = rejected = 0
+    with QueryCounter(engine) as counter:
+        start = time.perf_counter()
+        for line in text.splitlines()[1:]:
+            email, first_name, last_name, student_id, password = line.split(",")
+            db = session_factory()
+            try:
+                user_service.create_user(db, UserCreate(
+                    email=email, first_name=first_name, last_name=last_name,
+                    student_id=student_id, password=password, role=UserRole.STUDENT,
+                ))
+                created += 1
+            except HTTPException:
+                rejected += 1
+            finally:
+                db.close()
+        elapsed = time.perf_counter() - start
+    return created, rejected, elapsed, counter
+
+def bulk(session_factory, engine, text: str, batch_size: int):
+    db = session_factory()
+    with QueryCounter(engine) as counter:
+        start = time.perf_counter()
+        try:
+            run = student_import_service.import_csv(db, io.StringIO(text), batch_size=batch_size)
+        finally:
+            db.close()
+        elapsed = time.perf_counter() - start
+    return run.created, run.duplicates + run.invalid, elapsed, counter
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--students", type=int, default=400, help="righe del file")
+    parser.add_argument("--batch-size", type=int, default=200)
+    args = parser.parse_args()
+
+    existing = args.students // 2
+    engine = make_engine(":tmp:")
+    seed(engine, courses=1, exams_per_course=1, students=existing)
+    session_factory = make_session_factory(engine)
+    # Avvia i pool prima di misurare
+    for hasher in (password_hasher, student_import_service.hasher):
+        hasher.hash_many(["warmup"] * max(1, hasher.workers))
+
+    results = {}
+    for mode, prefix in (("per_row", "R"), ("bulk_import", "B")):
+        text = students_csv(prefix, args.students, existing)
+        if mode == "per_row":
+            created, rejected, elapsed, counter = per_row(session_factory, engine, text)
+        else:
+            created, rejected, elapsed, counter = bulk(session_factory, engine, text, args.batch_size)
+        results[mode] = {
+            "hash_workers": (password_hasher if mode == "per_row" else student_import_service.hasher).workers,
+            "rows": args.students,
+            "created": created,
+            "rejected": rejected,
+            "elapsed_s": round(elapsed, 3),
+            "rows_per_s": round(args.students / elapsed, 1),
+            "queries": counter.queries,
+            "commits": counter.commits,
+        }
+    password_hasher.shutdown()
+    student_import_service.shutdown()
+    print_report("Importazione studenti", results)
+
+if __name__ == "__main__":
+    main()
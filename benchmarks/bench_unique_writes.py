@@ -0,0 +1,107 @@
+"""
+Scritture con unicità verificata da SELECT preliminari (come prima) o solo
+dai vincoli univoci del database. Il percorso senza duplicati diventa un
+solo INSERT; `--rtt-ms` aggiunge a ogni statement un ritardo che simula il
+giro di rete verso un database remoto. Le creazioni duplicate devono essere
+rifiutate con lo stesso errore in entrambi i casi.
+
+    python -m benchmarks.bench_unique_writes --courses 2000 --users 20 --rtt-ms 0.5
+"""
+import argparse
+import time
+from typing import Callable, Dict, List
+
+from fastapi import HTTPException
+from sqlalchemy import event
+
+from app.models.user import UserRole
+from app.repositories.course import course_repository
+from app.repositories.user import user_repository
+from app.schemas.course import CourseCreate
+from app.schemas.user import UserCreate
+from app.services.course_service import course_service
+from app.services.user_service import user_service
+from benchmarks.common import QueryCounter, latency_summary, make_engine, make_session_factory, print_report, seed
+
+def create_course_pre_check(db, course_in: CourseCreate):
+    # Il controllo rimosso da create_course
+    if course_repository.get_by_code(db, code=course_in.code):
+        raise HTTPException(status_code=400, detail="Il codice del corso è già registrato nel sistema.")
+    return course_service.create_course(db, course_in)
+
+def create_user_pre_check(db, user_in: UserCreate):
+    # I controlli rimossi da create_user
+    if user_repository.get_by_email(db, email=user_in.email):
+        raise HTTPException(status_code=400, detail="L'email è già registrata nel sistema.")
+    if user_in.student_id and user_repository.get_by_student_id(db, student_id=user_in.student_id):
+        raise HTTPException(status_code=400, detail="L'ID studente è già registrato nel sistema.")
+    return user_service.create_user(db, user_in)
+
+def run(session_factory, engine, create: Callable, items: List) -> Dict:
+    latencies = []
+    errors: Dict[str, int] = {}
+    with QueryCounter(engine) as counter:
+        for item in items:
+            db = session_factory()
+            start = time.perf_counter()
+            try:
+                create(db, item)
+            except HTTPException as exc:
+                errors[exc.detail] = errors.get(exc.detail, 0) + 1
+            finally:
+                db.close()
+            latencies.append(time.perf_counter() - start)
+    return {
+        "queries_per_write": round(counter.queries / len(items), 2),
+        "errors": errors,
+        **latency_summary(latencies),
+    }
+
+def courses(prefix: str, count: int) -> List[CourseCreate]:
+    return [
+        CourseCreate(name=f"Course {prefix}{n}", code=f"{prefix}{n:05d}", credits=6, professor_id=1)
+        for n in range(count)
+    ]
+
+def users(prefix: str, count: int) -> List[UserCreate]:
+    return [
+        UserCreate(
+            email=f"{prefix}{n}@example.com", password="password", first_name="Bench",
+            last_name=str(n), role=UserRole.STUDENT, student_id=f"{prefix}{n:06d}",
+        )
+        for n in range(count)
+    ]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--courses", type=int, default=2000)
+    parser.add_argument("--users", type=int, default=20, help="ogni utente paga anche bcrypt")
+    parser.add_argument("--students", type=int, default=20000, help="utenti già presenti")
+    parser.add_argument("--rtt-ms", type=float, default=0.5, help="ritardo simulato per statement")
+    args = parser.parse_args()
+
+    engine = make_engine(":tmp:")
+    seed(engine, courses=args.students // 10, exams_per_course=1, students=args.students)
+    session_factory = make_session_factory(engine)
+    if args.rtt_ms:
+        @event.listens_for(engine, "before_cursor_execute")
+        def network_delay(*_):
+            time.sleep(args.rtt_ms / 1000)
+
+    results = {}
+    for mode, create_course, create_user in (
+        ("pre_check", create_course_pre_check, create_user_pre_check),
+        ("constraint", course_service.create_course, user_service.create_user),
+    ):
+        prefix = "P" if mode == "pre_check" else "K"
+        new_courses = courses(prefix, args.courses)
+        new_users = users(prefix, args.users)
+        results[f"{mode}_courses"] = run(session_factory, engine, create_course, new_courses)
+        results[f"{mode}_users"] = run(session_factory, engine, create_user, new_users)
+        # Gli stessi dati una seconda volta: tutti duplicati
+        results[f"{mode}_duplicate_courses"] = run(session_factory, engine, create_course, new_courses[:200])
+        results[f"{mode}_duplicate_users"] = run(session_factory, engine, create_user, new_users)
+    print_report("Creazioni: controlli preliminari vs vincoli univoci", results)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+import json
+import os
+import tempfile
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+from sqlalchemy import create_engine, event, insert
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import sessionmaker
+
+import app.repositories  # registra tutti i modelli sulla metadata
+import app.models.indexes  # e gli indici delle query frequenti
+from app.models.base import Base
+from app.models.booking import Booking
+from app.models.course import Course
+from app.models.exam import Exam
+from app.models.user import User, UserRole
+
+# Hash fisso per gli utenti generati: il seeding non deve pagare bcrypt
+SEED_PASSWORD = "password"
+SEED_PASSWORD_HASH = "$2b$12$8u3GkTzHW4XjhFCugkqbE.aVeIVEEbTPmvSzBoMHDa2Rg4Ahn8VZC"
+
+def make_engine(path: Optional[str] = None) -> Engine:
+    """
+    Engine SQLite con lo schema creato: in memoria se path è None,
+    altrimenti su file (":tmp:" crea un file temporaneo, ":shm:" lo crea in
+    /dev/shm quando esiste). Il database in memoria è una sola connessione
+    condivisa: va usato da un thread alla volta.
+    """
+    if path is None:
+        from sqlalchemy.pool import StaticPool
+        engine = create_engine(
+            "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+        )
+    else:
+        if path in (":tmp:", ":shm:"):
+            directory = "/dev/shm" if path == ":shm:" and os.path.isdir("/dev/shm") else None
+            fd, path = tempfile.mkstemp(suffix=".db", prefix="bench-", dir=directory)
+            os.close(fd)
+        engine = create_engine(
+            f"sqlite:///{path}", connect_args={"check_same_thread": False, "timeout": 30}
+        )
+    Base.metadata.create_all(bind=engine)
+    return engine
+
+def make_session_factory(engine: Engine) -> sessionmaker:
+    return sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+def seed(
+    engine: Engine,
+    *,
+    courses: int = 10,
+    exams_per_course: int = 5,
+    students: int = 1000,
+    max_students: int = 100,
+    bookings_per_exam: int = 0,
+) -> Dict[str, List[int]]:
+    now = datetime.now()
+    with engine.begin() as conn:
+        conn.execute(insert(User), [{
+            "id": 1,
+            "email": "professor@example.com",
+            "hashed_password": SEED_PASSWORD_HASH,
+            "first_name": "Prof",
+            "last_name": "Bench",
+            "role": UserRole.PROFESSOR,
+            "student_id": None,
+            "created_at": now,
+            "updated_at": now,
+        }] + [{
+            "id": i + 2,
+            "email": f"student{i}@example.com",
+            "hashed_password": SEED_PASSWORD_HASH,
+            "first_name": "Student",
+            "last_name": str(i),
+            "role": UserRole.STUDENT,
+            "student_id": f"S{i:07d}",
+            "created_at": now,
+            "updated_at": now,
+        } for i in range(students)])
+        conn.execute(insert(Course), [{
+            "id": c + 1,
+            "name": f"Course {c}",
+            "code": f"C{c:04d}",
+            "credits": 6,
+            "professor_id": 1,
+            "created_at": now,
+            "updated_at": now,
+        } for c in range(courses)])
+        exams = []
+        for c in range(courses):
+            for e in range(exams_per_course):
+                exams.append({
+                    "id": len(exams) + 1,
+                    "course_id": c + 1,
+                    "date": now + timedelta(days=7 + e, hours=c),
+                    "location": f"Aula {c % 7}",
+                    "max_students": max_students,
+                    "description": None,
+                    "is_active": True,
+                    "created_at": now,
+                    "updated_at": now,
+                })
+        conn.execute(insert(Exam), exams)
+        if bookings_per_exam:
+            conn.execute(insert(Booking), [{
+                "student_id": 2 + (exam["id"] * bookings_per_exam + b) % students,
+                "exam_id": exam["id"],
+                "confirmed": True,
+                "created_at": now,
+                "updated_at": now,
+            } for exam in exams for b in range(min(bookings_per_exam, students))])
+    return {
+        "student_ids": list(range(2, students + 2)),
+        "course_ids": list(range(1, courses + 1)),
+        "exam_ids": list(range(1, len(exams) + 1)),
+    }
+
+class QueryCounter:
+    """
+    Conta statement e COMMIT effettivi eseguiti da un engine: pysqlite non
+    invia nulla al commit se non c'è una transazione aperta, mentre il
+    RELEASE di un SAVEPOINT aperto fuori da una transazione conferma da solo
+    """
+    def __init__(self, engine: Engine):
+        self.engine = engine
+        self.queries = 0
+        self.commits = 0
+
+    def _on_execute(self, *args):
+        self.queries += 1
+
+    def _after_execute(self, conn, cursor, statement, *args):
+        if statement.startswith("RELEASE SAVEPOINT") and not _in_transaction(conn):
+            self.commits += 1
+
+    def _on_commit(self, conn):
+        if _in_transaction(conn):
+            self.commits += 1
+
+    def __enter__(self) -> "QueryCounter":
+        event.listen(self.engine, "before_cursor_execute", self._on_execute)
+        event.listen(self.engine, "after_cursor_execute", self._after_execute)
+        event.listen(self.engine, "commit", self._on_commit)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(self.engine, "before_cursor_execute", self._on_execute)
+        event.remove(self.engine, "after_cursor_execute", self._after_execute)
+        event.remove(self.engine, "commit", self._on_commit)
+
+def _in_transaction(conn) -> bool:
+    # Stato della transazione secondo il driver (sqlite3 lo espone, gli altri si assumono aperti)
+    return getattr(conn.connection.dbapi_connection, "in_transaction", True)
+
+def percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+def latency_summary(values: List[float]) -> Dict[str, float]:
+    """
+    Latenze in millisecondi a partire da durate in secondi
+    """
+    return {
+        "count": len(values),
+        "p50_ms": round(percentile(values, 50) * 1000, 3),
+        "p95_ms": round(percentile(values, 95) * 1000, 3),
+        "p99_ms": round(percentile(values, 99) * 1000, 3),
+    }
+
+def print_report(title: str, rows: Dict[str, Dict]) -> None:
+    print(title)
+    print(json.dumps(rows, indent=2, default=str))
@@ -0,0 +1,24 @@
+from typing import Dict, List
+
+import pytest
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from benchmarks.common import make_engine, make_session_factory, seed
+
+@pytest.fixture
+def engine(tmp_path) -> Engine:
+    # Database su file: lo condividono l'engine sincrono e quello aiosqlite
+    engine = make_engine(str(tmp_path / "test.db"))
+    yield engine
+    engine.dispose()
+
+@pytest.fixture
+def ids(engine: Engine) -> Dict[str, List[int]]:
+    return seed(engine, courses=2, exams_per_course=3, students=20, max_students=5)
+
+@pytest.fixture
+def db(engine: Engine) -> Session:
+    session = make_session_factory(engine)()
+    yield session
+    session.close()
@@ -0,0 +1,124 @@
+import asyncio
+from typing import Awaitable, Callable, TypeVar
+
+from sqlalchemy import select
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.models.exam_seat import ExamSeat
+from app.repositories.aio import (
+    async_booking_repository,
+    async_course_repository,
+    async_exam_repository,
+    async_user_repository,
+)
+from app.repositories.seat import seat_repository
+from app.schemas.booking import BookingCreate
+
+T = TypeVar("T")
+
+def run_async(engine: Engine, scenario: Callable[[async_sessionmaker], Awaitable[T]]) -> T:
+    # Stesso file del database sincrono, letto con aiosqlite
+    async def main() -> T:
+        async_engine = create_async_engine(
+            engine.url.set(drivername="sqlite+aiosqlite"), connect_args={"timeout": 30}
+        )
+        try:
+            return await scenario(async_sessionmaker(async_engine, expire_on_commit=False))
+        finally:
+            await async_engine.dispose()
+
+    return asyncio.run(main())
+
+def booked(db, exam_id: int) -> int:
+    return db.scalar(select(ExamSeat.booked).where(ExamSeat.exam_id == exam_id))
+
+def test_reserve_claims_seat_and_inserts(engine, ids, db):
+    async def scenario(sessions):
+        async with sessions() as session:
+            return await async_booking_repository.reserve(session, obj_in=BookingCreate(student_id=2, exam_id=1))
+
+    booking = run_async(engine, scenario)
+    assert booking is not None and booking.id is not None
+    assert booked(db, 1) == 1
+
+def test_reserve_rejects_duplicate_and_keeps_counter(engine, ids, db):
+    async def scenario(sessions):
+        results = []
+        for _ in range(2):
+            async with sessions() as session:
+                results.append(await async_booking_repository.reserve(session, obj_in=BookingCreate(student_id=2, exam_id=1)))
+        async with sessions() as session:
+            count = await async_booking_repository.count_by_exam_id(session, exam_id=1)
+        return results, count
+
+    (first, second), count = run_async(engine, scenario)
+    assert first is not None
+    assert second is None
+    assert count == 1
+    assert booked(db, 1) == 1
+
+def test_reserve_stops_at_capacity(engine, ids, db):
+    async def scenario(sessions):
+        results = []
+        for student_id in ids["student_ids"][:6]:
+            async with sessions() as session:
+                results.append(await async_booking_repository.reserve(session, obj_in=BookingCreate(student_id=student_id, exam_id=1)))
+        return results
+
+    results = run_async(engine, scenario)
+    assert [booking is not None for booking in results] == [True] * 5 + [False]
+    assert booked(db, 1) == 5
+
+def test_concurrent_first_bookings(engine, ids, db):
+    # Prime prenotazioni in parallelo su un esame senza contatore
+    async def scenario(sessions):
+        async def book(student_id):
+            async with sessions() as session:
+                return await async_booking_repository.reserve(session, obj_in=BookingCreate(student_id=student_id, exam_id=2))
+        return await asyncio.gather(*(book(student_id) for student_id in ids["student_ids"][:8]))
+
+    results = run_async(engine, scenario)
+    assert sum(booking is not None for booking in results) == 5
+    assert booked(db, 2) == 5
+
+def test_ensure_counter_created_concurrently(engine, ids, db):
+    # Il contatore creato da un'altra richiesta dopo il controllo: l'INSERT
+    # fallisce nel savepoint e la transazione resta utilizzabile
+    seat_repository.ensure(db, exam_id=3)
+    db.commit()
+
+    async def scenario(sessions):
+        async with sessions() as session:
+            async def not_found(*args, **kwargs):
+                return None
+
+            session.scalar = not_found
+            created = await async_booking_repository._ensure_counter(session, exam_id=3)
+            del session.scalar
+            booking = await async_booking_repository.reserve(session, obj_in=BookingCreate(student_id=2, exam_id=3))
+            return created, booking
+
+    created, booking = run_async(engine, scenario)
+    assert created is True
+    assert booking is not None
+    assert booked(db, 3) == 1
+
+def test_lookups_and_pagination(engine, ids):
+    async def scenario(sessions):
+        async with sessions() as session:
+            user = await async_user_repository.get_by_email(session, email="student0@example.com")
+            by_student_id = await async_user_repository.get_by_student_id(session, student_id="S0000000")
+            professors = await async_user_repository.get_professors(session)
+            course = await async_course_repository.get_by_code(session, code="C0001")
+            first = await async_exam_repository.get_by_course_id(session, course_id=1, limit=2)
+            cursor = async_exam_repository.next_cursor(first, limit=2)
+            rest = await async_exam_repository.get_by_course_id(session, course_id=1, limit=2, cursor=cursor)
+            return user, by_student_id, professors, course, first, rest
+
+    user, by_student_id, professors, course, first, rest = run_async(engine, scenario)
+    assert user.id == by_student_id.id == 2
+    assert [professor.id for professor in professors] == [1]
+    assert course.id == 2
+    assert len(first) == 2 and len(rest) == 1
+    assert [exam.date for exam in first + rest] == sorted(exam.date for exam in first + rest)
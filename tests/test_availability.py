@@ -0,0 +1,31 @@
+from sqlalchemy.orm import sessionmaker
+
+from app.api.endpoints.availability import _read_initial
+from app.core.routing import RoutingSession
+from app.repositories.booking import booking_repository
+from app.schemas.booking import BookingCreate
+from app.services.booking_service import booking_service
+from benchmarks.common import make_engine, make_session_factory, seed
+
+def test_stream_initial_state_reads_the_primary(tmp_path):
+    # Prenotazione già sul primario ma non ancora sulla replica
+    primary = make_engine(str(tmp_path / "primary.db"))
+    replica = make_engine(str(tmp_path / "replica.db"))
+    for engine in (primary, replica):
+        ids = seed(engine, courses=1, exams_per_course=1, students=2, max_students=5)
+    exam_id = ids["exam_ids"][0]
+    db = make_session_factory(primary)()
+    assert booking_repository.reserve(db, obj_in=BookingCreate(student_id=ids["student_ids"][0], exam_id=exam_id))
+    db.close()
+
+    routing = sessionmaker(class_=RoutingSession, bind=primary, replica=replica, autocommit=False, autoflush=False)
+    db = routing()
+    try:
+        lagging = booking_service.get_availability(db, exam_ids=[exam_id])
+        initial = _read_initial(db, [exam_id])
+    finally:
+        db.close()
+    assert lagging[0].confirmed_count == 0
+    assert initial[0].confirmed_count == 1
+    primary.dispose()
+    replica.dispose()
@@ -0,0 +1,109 @@
+from typing import Any
+
+import pytest
+from fastapi import APIRouter, Depends, FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import insert
+from sqlalchemy.orm import sessionmaker
+
+from app.api.deps import get_bookings_reader
+from app.core.conditional import conditional_get
+from app.core.database import get_db
+from app.core.principal_cache import principal_cache
+from app.core.routing import RoutingSession
+from app.core.security import create_access_token
+from app.models.booking import Booking
+from app.models.course import Course
+from app.services.course_service import course_service
+from benchmarks.common import make_engine, make_session_factory, seed
+
+def test_version_follows_the_replica_like_the_body(tmp_path):
+    # Il primario ha già un corso che la replica non ha ancora ricevuto
+    primary = make_engine(str(tmp_path / "primary.db"))
+    replica = make_engine(str(tmp_path / "replica.db"))
+    for engine in (primary, replica):
+        seed(engine, courses=2, exams_per_course=1, students=1)
+    course = {"id": 3, "name": "Course 2", "code": "C0002", "credits": 6, "professor_id": 1}
+    with primary.begin() as conn:
+        conn.execute(insert(Course), [course])
+    sessions = sessionmaker(class_=RoutingSession, bind=primary, replica=replica, autocommit=False, autoflush=False)
+
+    def get_routing_db():
+        db = sessions()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app = FastAPI()
+
+    @app.get("/courses/", dependencies=[Depends(conditional_get("courses", Course))])
+    def read_courses(db=Depends(get_db)) -> Any:
+        return [course.code for course in course_service.get_courses(db)]
+
+    app.dependency_overrides[get_db] = get_routing_db
+    client = TestClient(app)
+
+    stale = client.get("/courses/")
+    assert stale.json() == ["C0000", "C0001"]
+    # La replica si allinea: l'ETag del corpo vecchio non deve più valere
+    with replica.begin() as conn:
+        conn.execute(insert(Course), [course])
+    fresh = client.get("/courses/", headers={"If-None-Match": stale.headers["etag"]})
+    assert fresh.status_code == 200
+    assert fresh.json() == ["C0000", "C0001", "C0002"]
+    primary.dispose()
+    replica.dispose()
+
+@pytest.fixture
+def bookings_client(engine, ids):
+    # Come il router sincrono delle prenotazioni: ETag a livello di router
+    router = APIRouter()
+
+    @router.get("/student/{student_id}")
+    def read_bookings_by_student(student_id: int) -> Any:
+        return []
+
+    @router.get("/exam/{exam_id}")
+    def read_bookings_by_exam(exam_id: int) -> Any:
+        return []
+
+    @router.get("/exam/{exam_id}/count")
+    def count_bookings_by_exam(exam_id: int) -> Any:
+        return 0
+
+    sessions = make_session_factory(engine)
+
+    def get_test_db():
+        db = sessions()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app = FastAPI()
+    app.include_router(
+        router, prefix="/api/bookings",
+        dependencies=[Depends(conditional_get("bookings", Booking, principal=get_bookings_reader))],
+    )
+    app.dependency_overrides[get_db] = get_test_db
+    principal_cache.clear()
+    yield TestClient(app)
+    principal_cache.clear()
+
+@pytest.mark.parametrize(
+    "user_id, path, status",
+    [
+        (2, "/api/bookings/student/3", 403),
+        (2, "/api/bookings/exam/1", 403),
+        (2, "/api/bookings/student/2", 304),
+        (2, "/api/bookings/exam/1/count", 304),
+        (1, "/api/bookings/exam/1", 304),
+        (1, "/api/bookings/student/3", 304),
+    ],
+)
+def test_bookings_etag_after_route_access_rules(bookings_client, user_id, path, status):
+    headers = {"Authorization": f"Bearer {create_access_token(user_id)}", "If-None-Match": "*"}
+    response = bookings_client.get(path, headers=headers)
+    assert response.status_code == status
+    assert ("etag" in response.headers) == (status == 304)
@@ -0,0 +1,20 @@
+from fastapi.testclient import TestClient
+
+from app.core.idempotency import idempotency_store
+from app.main import app
+
+ORIGIN = "https://esami.example.com"
+
+def test_idempotent_responses_carry_cors_headers():
+    # Replay e 422 del middleware passano comunque da CORS
+    idempotency_store.clear()
+    client = TestClient(app)
+    headers = {"Origin": ORIGIN, "Idempotency-Key": "cors-test"}
+    first = client.post("/api/bookings/", json={"exam_id": 1}, headers=headers)
+    replay = client.post("/api/bookings/", json={"exam_id": 1}, headers=headers)
+    reused = client.post("/api/bookings/", json={"exam_id": 2}, headers=headers)
+    idempotency_store.clear()
+    assert replay.headers["idempotent-replayed"] == "true"
+    assert reused.status_code == 422
+    for response in (first, replay, reused):
+        assert response.headers["access-control-allow-origin"] == "*"
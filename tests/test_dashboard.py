@@ -0,0 +1,30 @@
+from typing import Tuple
+
+from app.models.user import User
+from app.repositories.booking import booking_repository
+from app.schemas.booking import BookingCreate
+from app.services.booking_service import booking_service
+from benchmarks.common import QueryCounter, make_session_factory
+
+def dashboard_queries(engine, student_id: int) -> Tuple[int, int]:
+    # Sessione nuova: nessun oggetto già caricato nasconde le query lazy
+    db = make_session_factory(engine)()
+    try:
+        student = db.get(User, student_id)
+        with QueryCounter(engine) as counter:
+            dashboard = booking_service.get_student_dashboard(db, student=student)
+            dashboard.model_dump()
+        return counter.queries, len(dashboard.bookings)
+    finally:
+        db.close()
+
+def test_dashboard_query_count_is_constant(engine, ids, db):
+    one, many = ids["student_ids"][:2]
+    booking_repository.reserve(db, obj_in=BookingCreate(student_id=one, exam_id=ids["exam_ids"][0]))
+    for exam_id in ids["exam_ids"]:
+        booking_repository.reserve(db, obj_in=BookingCreate(student_id=many, exam_id=exam_id))
+
+    queries_one, bookings_one = dashboard_queries(engine, one)
+    queries_many, bookings_many = dashboard_queries(engine, many)
+    assert (bookings_one, bookings_many) == (1, len(ids["exam_ids"]))
+    assert queries_one == queries_many == 1
@@ -0,0 +1,53 @@
+from typing import List
+
+import pytest
+from fastapi import FastAPI, Response
+from fastapi.testclient import TestClient
+
+from app.core.idempotency import IdempotencyMiddleware, IdempotencyStore
+
+def make_client(statuses: List[int]) -> TestClient:
+    # Ogni chiamata eseguita consuma il prossimo stato della lista
+    calls = iter(statuses)
+    app = FastAPI()
+
+    @app.post("/bookings")
+    def create_booking():
+        status = next(calls)
+        headers = {"Retry-After": "7"} if status in (202, 429, 503) else {}
+        return Response(status_code=status, headers=headers, content=str(status))
+
+    app.add_middleware(IdempotencyMiddleware, routes=[("POST", r"^/bookings$")], store=IdempotencyStore())
+    return TestClient(app)
+
+def post(client: TestClient):
+    return client.post("/bookings", content=b"{}", headers={"Idempotency-Key": "k1"})
+
+@pytest.mark.parametrize("status", [409, 429, 500, 503])
+def test_temporary_failures_release_the_key(status):
+    client = make_client([status, 201])
+    first = post(client)
+    assert first.status_code == status
+    retry = post(client)
+    assert retry.status_code == 201
+    assert "idempotent-replayed" not in retry.headers
+
+def test_success_is_replayed_with_its_headers():
+    client = make_client([201])
+    first = post(client)
+    replay = post(client)
+    assert replay.status_code == first.status_code == 201
+    assert replay.headers["idempotent-replayed"] == "true"
+    assert replay.content == first.content
+
+def test_client_errors_are_replayed():
+    client = make_client([400])
+    assert post(client).status_code == 400
+    replay = post(client)
+    assert replay.status_code == 400
+    assert replay.headers["idempotent-replayed"] == "true"
+
+def test_retry_after_is_kept_in_replays():
+    client = make_client([202])
+    post(client)
+    assert post(client).headers["retry-after"] == "7"
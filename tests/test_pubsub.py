@@ -0,0 +1,57 @@
+import asyncio
+
+from app.core.pubsub import CoalescingPubSub
+
+def test_change_during_initial_read_is_delivered():
+    # La prenotazione si conclude dopo l'iscrizione ma prima che lo stato
+    # iniziale arrivi al client: l'aggiornamento non va perso
+    seats = {1: 10}
+
+    async def scenario():
+        pubsub = CoalescingPubSub(lambda topics: {topic: seats[topic] for topic in topics}, interval=0.01)
+        subscription = pubsub.subscribe([1])
+        initial = {1: seats[1]}
+        seats[1] = 9
+        pubsub.publish(1)
+        subscription.seed(initial)
+        updates = await subscription.next(1)
+        pubsub.unsubscribe(subscription)
+        return updates
+
+    assert asyncio.run(scenario()) == [9]
+
+def test_new_subscriber_receives_changes_already_seen_by_others():
+    seats = {1: 10}
+
+    async def scenario():
+        pubsub = CoalescingPubSub(lambda topics: {topic: seats[topic] for topic in topics}, interval=0.01)
+        first = pubsub.subscribe([1])
+        first.seed({1: 10})
+        seats[1] = 9
+        pubsub.publish(1)
+        assert await first.next(1) == [9]
+        # Il secondo client ha letto lo stato prima dell'ultima modifica
+        second = pubsub.subscribe([1])
+        second.seed({1: 10})
+        seats[1] = 9
+        pubsub.publish(1)
+        updates = await second.next(1), await first.next(0.05)
+        pubsub.unsubscribe(first)
+        pubsub.unsubscribe(second)
+        return updates
+
+    second_updates, first_updates = asyncio.run(scenario())
+    assert second_updates == [9]
+    assert first_updates == []
+
+def test_unchanged_values_are_not_repeated():
+    async def scenario():
+        pubsub = CoalescingPubSub(lambda topics: {topic: 10 for topic in topics}, interval=0.01)
+        subscription = pubsub.subscribe([1])
+        subscription.seed({1: 10})
+        pubsub.publish(1)
+        updates = await subscription.next(0.05)
+        pubsub.unsubscribe(subscription)
+        return updates
+
+    assert asyncio.run(scenario()) == []
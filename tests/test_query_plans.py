@@ -0,0 +1,90 @@
+"""
+Piani delle query frequenti: ogni metodo dei repository viene eseguito su un
+database popolato e ogni statement emesso passa da EXPLAIN QUERY PLAN. Il
+caso fallisce se una query legge per intero una tabella (SCAN senza indice).
+"""
+import re
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Tuple
+
+import pytest
+from sqlalchemy import event, text
+
+from app.core.pagination import encode_cursor
+from app.repositories.booking import booking_repository
+from app.repositories.course import course_repository
+from app.repositories.exam import exam_repository
+from app.repositories.seat import claim_statement, release_statement
+from app.repositories.user import user_repository
+from benchmarks.common import make_engine, make_session_factory, seed
+
+# "SCAN bookings" è una lettura completa, "SCAN bookings USING INDEX ..." no
+FULL_SCAN = re.compile(r"^SCAN (\w+)$")
+
+HOT_QUERIES: Dict[str, Callable] = {
+    "booking.get_by_student_and_exam": lambda db, ids: booking_repository.get_by_student_and_exam(db, student_id=ids["student_ids"][0], exam_id=ids["exam_ids"][0]),
+    "booking.get_by_student_id": lambda db, ids: booking_repository.get_by_student_id(db, student_id=ids["student_ids"][0]),
+    "booking.get_by_exam_id": lambda db, ids: booking_repository.get_by_exam_id(db, exam_id=ids["exam_ids"][0]),
+    "booking.get_by_exam_id (cursor)": lambda db, ids: booking_repository.get_by_exam_id(db, exam_id=ids["exam_ids"][0], cursor=encode_cursor(1)),
+    "booking.count_by_exam_id": lambda db, ids: booking_repository.count_by_exam_id(db, exam_id=ids["exam_ids"][0]),
+    "booking.get_dashboard_rows": lambda db, ids: booking_repository.get_dashboard_rows(db, student_id=ids["student_ids"][0]),
+    "booking.get_availability (exams)": lambda db, ids: booking_repository.get_availability(db, exam_ids=ids["exam_ids"][:20]),
+    "booking.get_availability (course)": lambda db, ids: booking_repository.get_availability(db, course_id=ids["course_ids"][0]),
+    "exam.get_by_course_id": lambda db, ids: exam_repository.get_by_course_id(db, course_id=ids["course_ids"][0]),
+    "exam.get_active_exams": lambda db, ids: exam_repository.get_active_exams(db),
+    "exam.get_active_exams (cursor)": lambda db, ids: exam_repository.get_active_exams(db, cursor=encode_cursor(datetime.now() + timedelta(days=1), 0)),
+    "exam.get_all_active_exams": lambda db, ids: exam_repository.get_all_active_exams(db),
+    "exam.get_upcoming_exams_by_course": lambda db, ids: exam_repository.get_upcoming_exams_by_course(db, course_id=ids["course_ids"][0]),
+    "course.get_by_code": lambda db, ids: course_repository.get_by_code(db, code="C0000"),
+    "course.get_by_professor_id": lambda db, ids: course_repository.get_by_professor_id(db, professor_id=1),
+    "user.get_by_email": lambda db, ids: user_repository.get_by_email(db, email="student0@example.com"),
+    "user.get_by_student_id": lambda db, ids: user_repository.get_by_student_id(db, student_id="S0000000"),
+    "user.get_professors": lambda db, ids: user_repository.get_professors(db),
+    "seat.claim": lambda db, ids: db.execute(claim_statement(ids["exam_ids"][0], 1, ids["student_ids"][0])),
+    "seat.release": lambda db, ids: db.execute(release_statement(ids["exam_ids"][0], 1)),
+}
+
+@pytest.fixture(scope="module")
+def populated(tmp_path_factory):
+    engine = make_engine(str(tmp_path_factory.mktemp("plans") / "plans.db"))
+    ids = seed(engine, courses=50, exams_per_course=5, students=2000, bookings_per_exam=20)
+    with engine.begin() as conn:
+        # Statistiche aggiornate, come su un database in esercizio
+        conn.execute(text("ANALYZE"))
+    yield engine, ids
+    engine.dispose()
+
+def capture(engine, fn: Callable, ids) -> List[Tuple[str, tuple]]:
+    statements = []
+
+    def on_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", on_execute)
+    db = make_session_factory(engine)()
+    try:
+        fn(db, ids)
+    finally:
+        event.remove(engine, "before_cursor_execute", on_execute)
+        db.rollback()
+        db.close()
+    return statements
+
+def explain(engine, statement: str, parameters) -> List[str]:
+    with engine.connect() as conn:
+        cursor = conn.connection.cursor()
+        try:
+            cursor.execute(f"EXPLAIN QUERY PLAN {statement}", parameters)
+            return [row[3] for row in cursor.fetchall()]
+        finally:
+            cursor.close()
+
+@pytest.mark.parametrize("name", list(HOT_QUERIES))
+def test_hot_query_uses_indexes(populated, name):
+    engine, ids = populated
+    statements = capture(engine, HOT_QUERIES[name], ids)
+    assert statements
+    for statement, parameters in statements:
+        plan = explain(engine, statement, parameters)
+        scans = [step for step in plan if FULL_SCAN.match(step)]
+        assert not scans, f"{' '.join(statement.split())}\n" + "\n".join(plan)
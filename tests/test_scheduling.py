@@ -0,0 +1,50 @@
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import HTTPException
+
+from app.repositories.exam import exam_repository
+from app.schemas.exam import ExamCreate, ExamUpdate
+from app.services.exam_service import exam_service
+from app.services.scheduling import exam_scheduler
+
+@pytest.fixture
+def loads(monkeypatch):
+    # Numero di letture complete dell'indice
+    calls = []
+    get_schedule_rows = exam_repository.get_schedule_rows
+
+    def counting(db, **kwargs):
+        calls.append(kwargs)
+        return get_schedule_rows(db, **kwargs)
+
+    monkeypatch.setattr(exam_repository, "get_schedule_rows", counting)
+    exam_scheduler.invalidate()
+    yield calls
+    exam_scheduler.invalidate()
+
+def new_exam(date: datetime, location: str = "Aula Nuova", course_id: int = 1) -> ExamCreate:
+    return ExamCreate(course_id=course_id, date=date, location=location, max_students=10)
+
+def test_writes_update_the_index_without_reloading(ids, db, loads):
+    start = datetime.now().replace(microsecond=0) + timedelta(days=60)
+    exams = [exam_service.create_exam(db, new_exam(start + timedelta(days=n))) for n in range(5)]
+    assert len(loads) == 1
+
+    # L'esame appena creato occupa già l'aula
+    with pytest.raises(HTTPException) as info:
+        exam_service.create_exam(db, new_exam(start + timedelta(hours=1), course_id=2))
+    assert str(exams[0].id) in info.value.detail
+
+    # Spostato: libera il vecchio orario e occupa il nuovo
+    exam_service.update_exam(db, exams[0].id, ExamUpdate(date=start + timedelta(days=30)))
+    exam_service.create_exam(db, new_exam(start, course_id=2))
+    with pytest.raises(HTTPException):
+        exam_service.create_exam(db, new_exam(start + timedelta(days=30, hours=1), course_id=2))
+
+    # Disattivato e cancellato: l'aula torna libera
+    exam_service.update_exam(db, exams[1].id, ExamUpdate(is_active=False))
+    exam_service.create_exam(db, new_exam(start + timedelta(days=1), course_id=2))
+    exam_service.delete_exam(db, exams[2].id)
+    exam_service.create_exam(db, new_exam(start + timedelta(days=2), course_id=2))
+    assert len(loads) == 1
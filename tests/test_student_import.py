@@ -0,0 +1,34 @@
+import io
+
+import pytest
+
+from app.core.hashing import password_hasher
+from app.services.student_import_service import StudentImportService
+from benchmarks.common import SEED_PASSWORD_HASH
+
+CSV = """email,first_name,last_name,student_id,password
+new0@example.com,New,0,N0000000,password
+student0@example.com,Old,0,N0000001,password
+new1@example.com,New,1,N0000002,password
+new0@example.com,Copy,0,N0000003,password
+"""
+
+@pytest.fixture
+def service(monkeypatch):
+    service = StudentImportService(hash_workers=0)
+    monkeypatch.setattr(service.hasher, "hash_many", lambda passwords: [SEED_PASSWORD_HASH] * len(passwords))
+
+    def shared_pool(*args, **kwargs):
+        raise AssertionError("l'importazione non deve usare il pool dei login")
+
+    monkeypatch.setattr(password_hasher, "hash_many", shared_pool)
+    monkeypatch.setattr(password_hasher, "hash", shared_pool)
+    yield service
+    service.shutdown()
+
+def test_import_uses_its_own_hasher(ids, db, service):
+    assert service.hasher is not password_hasher
+    run = service.import_csv(db, io.StringIO(CSV), batch_size=2)
+    assert run.completed
+    assert (run.created, run.duplicates, run.invalid, run.batches) == (2, 2, 0, 2)
+    assert [error.line for error in run.errors] == [3, 5]
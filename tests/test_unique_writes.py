@@ -0,0 +1,58 @@
+import pytest
+from fastapi import HTTPException
+
+from app.core.hashing import password_hasher
+from app.models.user import UserRole
+from app.repositories.base import UniqueViolation
+from app.repositories.course import course_repository
+from app.schemas.course import CourseCreate, CourseUpdate
+from app.schemas.user import UserCreate
+from app.services.course_service import course_service
+from app.services.user_service import user_service
+from benchmarks.common import SEED_PASSWORD_HASH
+
+@pytest.fixture(autouse=True)
+def fixed_hash(monkeypatch):
+    # bcrypt non serve per controllare i vincoli
+    monkeypatch.setattr(password_hasher, "hash", lambda password: SEED_PASSWORD_HASH)
+
+def new_student(**values) -> UserCreate:
+    data = dict(
+        email="new@example.com", password="password", first_name="New",
+        last_name="Student", role=UserRole.STUDENT, student_id="N0000001",
+    )
+    data.update(values)
+    return UserCreate(**data)
+
+def test_repository_raises_unique_violation(ids, db):
+    with pytest.raises(UniqueViolation) as info:
+        course_repository.create(db, obj_in=CourseCreate(name="Copy", code="C0000", credits=6, professor_id=1))
+    assert info.value.columns == ("code",)
+
+@pytest.mark.parametrize(
+    "values, detail",
+    [
+        ({"email": "student0@example.com"}, "L'email è già registrata nel sistema."),
+        ({"student_id": "S0000000"}, "L'ID studente è già registrato nel sistema."),
+    ],
+)
+def test_create_user_duplicate_is_400(ids, db, values, detail):
+    with pytest.raises(HTTPException) as info:
+        user_service.create_user(db, new_student(**values))
+    assert info.value.status_code == 400
+    assert info.value.detail == detail
+    # La sessione resta utilizzabile dopo il rollback
+    assert user_service.create_user(db, new_student()).id is not None
+
+def test_create_course_duplicate_is_400(ids, db):
+    with pytest.raises(HTTPException) as info:
+        course_service.create_course(db, CourseCreate(name="Copy", code="C0000", credits=6, professor_id=1))
+    assert info.value.status_code == 400
+    assert info.value.detail == "Il codice del corso è già registrato nel sistema."
+
+def test_update_course_race_is_400(ids, db, monkeypatch):
+    # Il codice viene registrato da un'altra richiesta dopo il controllo
+    monkeypatch.setattr(course_repository, "get_by_code", lambda db, code: None)
+    with pytest.raises(HTTPException) as info:
+        course_service.update_course(db, ids["course_ids"][1], CourseUpdate(code="C0000"))
+    assert info.value.status_code == 400